@@ -5,6 +5,37 @@ Encapsulates "is this a browse command?" and "first single command" so the pipel
 
 from __future__ import annotations
 
+import re
+
+# One pattern per command category, applied to the stripped, lowercased utterance.
+_BROWSE_CATEGORY_PATTERNS: dict[str, str] = {
+    # Relaxed: "search" with no space (e.g. "Search...topic"), and "searched for" (e.g. "I searched for X").
+    "search": r"^search|search(?:ing)? for | searched for | searching | search ",
+    "store": r"save page|^save the page|store (?:this|the) page|^store page|^store this",
+    "go_back": r"^back(?: |$)| back$|go back|previous page",
+    # Require command at start to avoid mishears (e.g. "one here two click your free feedback")
+    # matching; allow "open 1".."open N" and explicit open/click/select/link-for prefixes.
+    "click": r"^(?:open |click|select |(?:the )?link for )",
+    "scroll": r"^scroll(?: |$)| scroll (?:up|down|left|right)",
+    "mode_toggle": r"st(?:art|op) browsing|^browse(?:$| on| off)",
+    "close_tab": r"^close(?: |$)",
+}
+
+_CATEGORY_RES: dict[str, re.Pattern[str]] = {
+    name: re.compile(pattern) for name, pattern in _BROWSE_CATEGORY_PATTERNS.items()
+}
+
+# All categories as one alternation of named groups: a single scan tells whether (and which) command matched.
+_BROWSE_RE = re.compile(
+    "|".join(
+        f"(?P<{name}>{pattern})" for name, pattern in _BROWSE_CATEGORY_PATTERNS.items()
+    )
+)
+
+
+def _norm(s: str) -> str:
+    return (s or "").strip().lower()
+
 
 class BrowseCommandMatcher:
     """
@@ -12,119 +43,37 @@ class BrowseCommandMatcher:
     and extracts the first single command from compound utterances.
     """
 
+    def classify(self, s: str) -> str | None:
+        """
+        Return the category of the first browse command found in s (search, store, go_back,
+        click, scroll, mode_toggle, close_tab), or None if it is not a browse command.
+        """
+        m = _BROWSE_RE.search(_norm(s))
+        return m.lastgroup if m else None
+
     def _looks_like_search(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        # Relaxed: "search" with no space (e.g. "Search...topic"), and "searched for" (e.g. "I searched for X").
-        if (
-            u.startswith("search")
-            or " searched for " in u
-            or u.startswith("searched for ")
-        ):
-            return True
-        return (
-            "searching for " in u
-            or "search for " in u
-            or u.startswith("searching ")
-            or " searching " in u
-            or " search " in u
-        )
+        return _CATEGORY_RES["search"].search(_norm(s)) is not None
 
     def _looks_like_store(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        return (
-            "save page" in u
-            or u == "save page"
-            or u.startswith("save the page")
-            or "store this page" in u
-            or "store the page" in u
-            or u.startswith("store page")
-            or u == "store page"
-            or u.startswith("store this")
-        )
+        return _CATEGORY_RES["store"].search(_norm(s)) is not None
 
     def _looks_like_go_back(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        return (
-            u == "back"
-            or u.startswith("back ")
-            or u.endswith(" back")
-            or "go back" in u
-            or u == "go back"
-            or "previous page" in u
-        )
+        return _CATEGORY_RES["go_back"].search(_norm(s)) is not None
 
     def _looks_like_click_or_select(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        # Require command at start to avoid mishears (e.g. "one here two click your free feedback")
-        # matching; allow "open 1".."open N" and explicit open/click/select/link-for prefixes.
-        if (
-            u.startswith("open ")
-            or u.startswith("open the ")
-            or u.startswith("click")
-            or u.startswith("select ")
-            or u == "click"
-            or u.startswith("the link for ")
-            or u.startswith("link for ")
-        ):
-            return True
-        return False
+        return _CATEGORY_RES["click"].search(_norm(s)) is not None
 
     def _looks_like_scroll(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        if u.startswith("scroll ") or u == "scroll":
-            return True
-        return (
-            " scroll up" in u
-            or " scroll down" in u
-            or " scroll left" in u
-            or " scroll right" in u
-        )
+        return _CATEGORY_RES["scroll"].search(_norm(s)) is not None
 
     def _looks_like_mode_toggle(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        return (
-            "start browsing" in u
-            or "stop browsing" in u
-            or u == "browse on"
-            or u == "browse off"
-            or u == "browse"
-            or u.startswith("browse on")
-            or u.startswith("browse off")
-        )
+        return _CATEGORY_RES["mode_toggle"].search(_norm(s)) is not None
 
     def _looks_like_close_tab(self, s: str) -> bool:
-        u = (s or "").strip().lower()
-        if not u:
-            return False
-        return (
-            u == "close tab"
-            or u == "close"
-            or u.startswith("close tab ")
-            or u.startswith("close ")
-        )
+        return _CATEGORY_RES["close_tab"].search(_norm(s)) is not None
 
     def _is_browse_command_single(self, s: str) -> bool:
-        return (
-            self._looks_like_search(s)
-            or self._looks_like_store(s)
-            or self._looks_like_go_back(s)
-            or self._looks_like_click_or_select(s)
-            or self._looks_like_scroll(s)
-            or self._looks_like_mode_toggle(s)
-            or self._looks_like_close_tab(s)
-        )
+        return self.classify(s) is not None
 
     def is_browse_command(self, *candidates: str) -> bool:
         """Return True if any candidate (e.g. intent_sentence, text) matches a browse command."""
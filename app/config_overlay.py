@@ -10,21 +10,55 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# User settings read by each overlay; an overlay fetches its own keys in one settings query.
+AUDIO_CALIBRATION_KEYS = (
+    "calibration_sensitivity",
+    "calibration_chunk_duration_sec",
+)
+LLM_CALIBRATION_KEYS = ("calibration_min_transcription_length",)
+CALIBRATION_KEYS = AUDIO_CALIBRATION_KEYS + LLM_CALIBRATION_KEYS
 
-def _overlay_audio_calibration(audio_cfg: dict, settings_repo: Any) -> dict:
-    """Overlay calibration_* from settings_repo onto audio config. Returns new dict."""
-    out = dict(audio_cfg)
+
+def load_calibration_settings(
+    settings_repo: Any, keys: tuple[str, ...] = CALIBRATION_KEYS
+) -> dict[str, str | None]:
+    """
+    Read keys from settings_repo in one get_many() call (per-key get() if unavailable).
+    Callers applying more than one overlay fetch once and pass the result to each. Never raises.
+    """
     if settings_repo is None:
-        return out
+        return {}
+    try:
+        values = settings_repo.get_many(list(keys))
+        if isinstance(values, dict):
+            return values
+    except Exception as e:
+        logger.debug("Calibration settings get_many failed: %s", e)
+    try:
+        return {key: settings_repo.get(key) for key in keys}
+    except Exception as e:
+        logger.debug("Calibration settings read failed: %s", e)
+        return {}
+
+
+def _overlay_audio_calibration(
+    audio_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
+    """Overlay calibration_* from settings (pre-fetched values, or settings_repo) onto audio config. Returns new dict."""
+    out = dict(audio_cfg)
+    if values is None:
+        if settings_repo is None:
+            return out
+        values = load_calibration_settings(settings_repo, AUDIO_CALIBRATION_KEYS)
     try:
-        sens_s = settings_repo.get("calibration_sensitivity")
+        sens_s = values.get("calibration_sensitivity")
         if sens_s is not None and sens_s.strip():
             try:
                 s = float(sens_s)
                 out["sensitivity"] = max(0.5, min(10.0, s))
             except (TypeError, ValueError):
                 logger.debug("Invalid calibration_sensitivity, using config")
-        chunk_s = settings_repo.get("calibration_chunk_duration_sec")
+        chunk_s = values.get("calibration_chunk_duration_sec")
         if chunk_s is not None and chunk_s.strip():
             try:
                 c = float(chunk_s)
@@ -36,13 +70,17 @@ def _overlay_audio_calibration(audio_cfg: dict, settings_repo: Any) -> dict:
     return out
 
 
-def _overlay_llm_calibration(llm_cfg: dict, settings_repo: Any) -> dict:
-    """Overlay calibration_min_transcription_length from settings_repo onto llm config. Returns new dict."""
+def _overlay_llm_calibration(
+    llm_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
+    """Overlay calibration_min_transcription_length (pre-fetched values, or settings_repo) onto llm config. Returns new dict."""
     out = dict(llm_cfg)
-    if settings_repo is None:
-        return out
+    if values is None:
+        if settings_repo is None:
+            return out
+        values = load_calibration_settings(settings_repo, LLM_CALIBRATION_KEYS)
     try:
-        min_len_s = settings_repo.get("calibration_min_transcription_length")
+        min_len_s = values.get("calibration_min_transcription_length")
         if min_len_s is not None and min_len_s.strip():
             try:
                 n = int(min_len_s)
@@ -56,11 +94,15 @@ def _overlay_llm_calibration(llm_cfg: dict, settings_repo: Any) -> dict:
     return out
 
 
-def apply_calibration_overlay(audio_cfg: dict, settings_repo: Any) -> dict:
+def apply_calibration_overlay(
+    audio_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
     """Overlay calibration_* from settings_repo onto audio config. Returns a new dict."""
-    return _overlay_audio_calibration(audio_cfg, settings_repo)
+    return _overlay_audio_calibration(audio_cfg, settings_repo, values)
 
 
-def apply_llm_calibration_overlay(llm_cfg: dict, settings_repo: Any) -> dict:
+def apply_llm_calibration_overlay(
+    llm_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
     """Overlay calibration_min_transcription_length onto llm config. Returns a new dict."""
-    return _overlay_llm_calibration(llm_cfg, settings_repo)
+    return _overlay_llm_calibration(llm_cfg, settings_repo, values)
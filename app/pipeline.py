@@ -6,11 +6,16 @@ Runs the capture/transcribe/respond loop in a background thread.
 from __future__ import annotations
 
 import logging
+import queue
 import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from datetime import datetime
+from collections import deque
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+)
 from typing import Callable
 
 from sdk import (
@@ -31,19 +36,44 @@ from llm.client import FALLBACK_MESSAGE, MEMORY_ERROR_MESSAGE, OllamaClient
 from llm.prompts import (
     build_document_qa_system_prompt,
     build_document_qa_user_prompt,
-    build_regeneration_prompts,
     build_system_prompt,
     build_user_prompt,
+    fill_transcription_template,
     parse_regeneration_response,
+    regeneration_prompt_parts,
     strip_certainty_from_response,
 )
+from llm.regen_cache import (
+    DEFAULT_REGEN_CACHE_SIZE,
+    RegenerationCache,
+    regeneration_cache_key,
+)
 from persistence.history_repo import HistoryRepo, InteractionRecord
+from persistence.qa_cache_repo import QACacheRepo
 from persistence.settings_repo import SettingsRepo
 from persistence.training_repo import TrainingRepo
 from profile.store import LanguageProfile
 
 logger = logging.getLogger(__name__)
 
+# Chunks with RMS below this never reach STT when vad_min_level is unset and auto sensitivity is off.
+DEFAULT_SILENCE_FLOOR = 0.001
+
+# (epoch second, "HH:MM:SS") of the last debug line; strftime runs at most once per second.
+_debug_ts_cache: tuple[int, str] = (-1, "")
+
+
+def _debug_timestamp() -> str:
+    """Local time as HH:MM:SS.mmm for debug lines."""
+    global _debug_ts_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, hms = _debug_ts_cache
+    if sec != cached_sec:
+        hms = time.strftime("%H:%M:%S", time.localtime(sec))
+        _debug_ts_cache = (sec, hms)
+    return "%s.%03d" % (hms, int((now - sec) * 1000))
+
 
 def _only_search_instruction_if_list(text: str) -> str:
     """If text looks like a numbered list of search results (1. X 2. Y), return only the instruction sentence."""
@@ -64,6 +94,99 @@ def _only_search_instruction_if_list(text: str) -> str:
     return t
 
 
+def _no_debug(_msg: str) -> None:
+    """Default on_debug: no subscriber, so _debug() skips formatting entirely."""
+
+
+def _normalize_for_repeat(s: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing sentence punctuation (repeat comparison form)."""
+    return " ".join((s or "").lower().split()).rstrip(".!? ")
+
+
+def _looks_like_request(u: str) -> bool:
+    """True if the utterance asks for an action (take me / go to / open / turn on ...), not a statement to echo."""
+    u = (u or "").strip().lower()
+    if not u or len(u) < 6:
+        return False
+    return (
+        u.startswith("please take me")
+        or u.startswith("take me ")
+        or u.startswith("take me to")
+        or u.startswith("go to ")
+        or u.startswith("go to the ")
+        or u.startswith("open ")
+        or u.startswith("open the ")
+        or u.startswith("turn on ")
+        or u.startswith("turn off ")
+        or u.startswith("i need ")
+        or u.startswith("i want to ")
+        or " take me " in u
+        or " take me to " in u
+    )
+
+
+def _norm_echo(s: str) -> str:
+    """Lowercase, replace non-alphanumerics with spaces and collapse whitespace (echo comparison form)."""
+    return " ".join(
+        "".join(c if c.isalnum() else " " for c in (s or "").lower()).split()
+    )
+
+
+# Sentence boundary in streamed text: terminal punctuation followed by whitespace.
+_SENTENCE_BOUNDARY_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _split_complete_sentences(buffer: str) -> tuple[list[str], str]:
+    """Split streamed text into complete sentences and the unfinished remainder."""
+    pieces = _SENTENCE_BOUNDARY_RE.split(buffer)
+    return [p.strip() for p in pieces[:-1] if p.strip()], pieces[-1]
+
+
+class _SentenceSpeaker:
+    """
+    Speaks sentences in order on a background thread (speak, then wait_until_done)
+    so TTS of the first sentence overlaps LLM decoding of the rest.
+    Only usable with engines that override wait_until_done (see supports); otherwise
+    each speak() would cut off or race the previous sentence.
+    """
+
+    @staticmethod
+    def supports(tts: TTSEngine) -> bool:
+        """True if tts can report when playback ends, so sentences can be queued one by one."""
+        return type(tts).wait_until_done is not TTSEngine.wait_until_done
+
+    def __init__(self, tts: TTSEngine) -> None:
+        self._tts = tts
+        self._queue: queue.Queue[str | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self.spoke = False
+
+    def put(self, sentence: str) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self.spoke = True
+        self._queue.put(sentence)
+
+    def close(self) -> None:
+        """Let queued sentences finish, then return once the last one has been spoken."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            sentence = self._queue.get()
+            if sentence is None:
+                return
+            try:
+                self._tts.speak(sentence)
+                self._tts.wait_until_done()
+            except Exception as e:
+                logger.exception("TTS speak (streamed) failed: %s", e)
+
+
 def _looks_like_malformed_regeneration(s: str) -> bool:
     """True if regeneration returned a list, meta format, or multiple sentences (e.g. echoed context + current)."""
     if not s or not s.strip():
@@ -93,6 +216,7 @@ def create_pipeline(
     speaker_filter: SpeakerFilter | None = None,
     auto_sensitivity: dict | None = None,
     llm_prompt_config: dict | None = None,
+    qa_cache_repo: QACacheRepo | None = None,
 ) -> Pipeline:
     """
     Build pipeline from config and optional injected speech components.
@@ -129,18 +253,32 @@ def create_pipeline(
         raw_config = getattr(config, "_raw", config)
         llm_base = dict(config.get("llm", {}) or {})
         speech_cfg = get_speech_section(raw_config)
-        prompt_cfg = speech_cfg.get("prompt") if isinstance(speech_cfg.get("prompt"), dict) else None
+        prompt_cfg = (
+            speech_cfg.get("prompt")
+            if isinstance(speech_cfg.get("prompt"), dict)
+            else None
+        )
         if prompt_cfg:
             if prompt_cfg.get("system"):
                 llm_base["system_prompt"] = prompt_cfg["system"]
                 llm_base["regeneration_system_prompt"] = prompt_cfg["system"]
             if prompt_cfg.get("user_template"):
                 llm_base["user_prompt_template"] = prompt_cfg["user_template"]
-                llm_base["regeneration_user_prompt_template"] = prompt_cfg["user_template"]
+                llm_base["regeneration_user_prompt_template"] = prompt_cfg[
+                    "user_template"
+                ]
         try:
-            from app.config_overlay import apply_llm_calibration_overlay
+            from app.config_overlay import (
+                LLM_CALIBRATION_KEYS,
+                apply_llm_calibration_overlay,
+                load_calibration_settings,
+            )
 
-            llm_prompt_config = apply_llm_calibration_overlay(llm_base, settings_repo)
+            # Only the LLM overlay is applied here, so only its keys are fetched.
+            calibration = load_calibration_settings(settings_repo, LLM_CALIBRATION_KEYS)
+            llm_prompt_config = apply_llm_calibration_overlay(
+                llm_base, settings_repo, calibration
+            )
         except ImportError:
             llm_prompt_config = llm_base
 
@@ -153,12 +291,31 @@ def create_pipeline(
         "Ollama model from config: %s (change config.yaml and restart Web UI to switch)",
         ollama_model,
     )
-    client = OllamaClient(
+    client_kwargs = dict(
         base_url=base_url,
         model_name=ollama_model,
         timeout_sec=float(ollama_cfg.get("timeout_sec", 45)),
         options=ollama_cfg.get("options"),
     )
+    batch_window_ms: float | None = None
+    try:
+        bw = ollama_cfg.get("batch_window_ms")
+        if bw is not None and float(bw) >= 0:
+            batch_window_ms = float(bw)
+    except (TypeError, ValueError):
+        pass
+    if batch_window_ms is not None:
+        from llm.batcher import DEFAULT_MAX_BATCH, BatchedOllamaClient
+
+        try:
+            max_batch = int(ollama_cfg.get("max_batch", DEFAULT_MAX_BATCH))
+        except (TypeError, ValueError):
+            max_batch = DEFAULT_MAX_BATCH
+        client = BatchedOllamaClient(
+            batch_window_ms=batch_window_ms, max_batch=max_batch, **client_kwargs
+        )
+    else:
+        client = OllamaClient(**client_kwargs)
     profile_cfg = config.get("profile", {})
     correction_limit = int(profile_cfg.get("correction_limit", 200))
     accepted_limit = int(profile_cfg.get("accepted_limit", 50))
@@ -216,6 +373,7 @@ def create_pipeline(
         wait_until_done_before_listen=wait_until_done_before_listen,
         stt_min_confidence=stt_min_confidence,
         vad_min_level=vad_min_level,
+        qa_cache_repo=qa_cache_repo,
     )
 
 
@@ -239,6 +397,7 @@ class Pipeline:
         wait_until_done_before_listen: bool = False,
         stt_min_confidence: float | None = None,
         vad_min_level: float | None = None,
+        qa_cache_repo: QACacheRepo | None = None,
     ) -> None:
         self._capture = capture
         self._stt = stt
@@ -248,18 +407,49 @@ class Pipeline:
         self._profile = language_profile
         self._tts = tts
         self._llm_prompt_config = llm_prompt_config or {}
+        # Regeneration prompts depend only on config: resolve the system prompt and template once.
+        self._reg_request_certainty = bool(
+            self._llm_prompt_config.get("regeneration_request_certainty", True)
+        )
+        self._reg_system, self._reg_user_template = regeneration_prompt_parts(
+            system_prompt=self._llm_prompt_config.get("system_prompt")
+            or self._llm_prompt_config.get("regeneration_system_prompt"),
+            user_prompt_template=self._llm_prompt_config.get(
+                "regeneration_user_prompt_template"
+            ),
+            request_certainty=self._reg_request_certainty,
+        )
         self._auto_sensitivity = auto_sensitivity or {"enabled": False}
+        # Hard silence floor for skipping STT: half the auto-sensitivity band floor (so skipped chunks
+        # could never trigger a boost), or DEFAULT_SILENCE_FLOOR when auto sensitivity is off.
+        if self._auto_sensitivity.get("enabled"):
+            try:
+                self._silence_floor = (
+                    float(self._auto_sensitivity.get("min_level", 0.002)) * 0.5
+                )
+            except (TypeError, ValueError):
+                self._silence_floor = DEFAULT_SILENCE_FLOOR
+        else:
+            self._silence_floor = DEFAULT_SILENCE_FLOOR
         self._browse_cooldown_after_tts_sec = max(
             0.0, min(60.0, browse_cooldown_after_tts_sec)
         )
         self._wait_until_done_before_listen = bool(wait_until_done_before_listen)
         self._stt_min_confidence = stt_min_confidence
         self._vad_min_level = vad_min_level
+        self._qa_cache = qa_cache_repo
+        # Document QA: stream the answer and speak each sentence as soon as it is complete.
+        self._stream_document_qa = bool(
+            self._llm_prompt_config.get("stream_document_qa", False)
+        )
+        # Send a throwaway generate at start so the first utterance does not pay the model load.
+        self._warmup_llm_enabled = bool(self._llm_prompt_config.get("warmup_llm", True))
 
         self._on_status: Callable[[str], None] = lambda _: None
         self._on_response: Callable[[str, int], None] = lambda _t, _i: None
+        self._on_interaction_saved: Callable[[int], None] = lambda _: None
         self._on_error: Callable[[str], None] = lambda _: None
-        self._on_debug: Callable[[str], None] = lambda _: None
+        self._on_debug: Callable[[str], None] = _no_debug
         self._on_volume: Callable[[float], None] = lambda _: None
         self._on_sensitivity_adjusted: Callable[[float], None] = lambda _: None
         self._on_training_transcription: Callable[[str], None] | None = None
@@ -267,6 +457,12 @@ class Pipeline:
         self._running = False
         self._thread: threading.Thread | None = None
         self._auto_sensitivity_cooldown = 0
+        # RMS of recent chunks that reached STT; auto sensitivity decides on their mean, not one noisy chunk.
+        try:
+            level_window = int(self._auto_sensitivity.get("level_window", 4))
+        except (TypeError, ValueError):
+            level_window = 4
+        self._recent_levels: deque[float] = deque(maxlen=max(1, level_window))
         self._training_mode = False
         # Optional RAG: callable(query, top_k=None) -> retrieved context string; only called when document_qa_mode
         self._rag_retriever: Callable[..., str] | None = None
@@ -282,10 +478,14 @@ class Pipeline:
         self._previous_chunk_transcription: str | None = None
         # Do not listen to yourself: filter out our own TTS from being treated as user input.
         self._last_spoken_response: str | None = None
-        self._recent_spoken_responses: list[
-            str
-        ] = []  # last N spoken (echo filter against all)
+        # Lowercased, whitespace-collapsed form of _last_spoken_response (repeat comparisons).
+        self._last_spoken_norm = ""
+        self._recent_spoken_responses: list[str] = (
+            []
+        )  # last N spoken (echo filter against all)
         self._recent_spoken_max = 3
+        # Comparison forms of _recent_spoken_responses (lowercased, _norm_echo), built once in _push_spoken.
+        self._recent_spoken_forms: list[tuple[str, str]] = []
         # Skip browse commands for N seconds after we spoke (avoid TTS echo / mishear triggering actions).
         self._last_tts_time: float = 0.0
         # Quit confirmation modal: when True, next "yes"/"no" is handled as quit confirm/cancel.
@@ -295,15 +495,114 @@ class Pipeline:
         # Executor for parallel work (prefetch profile + recent during regeneration). Created in start(), shut down in stop().
         self._executor: ThreadPoolExecutor | None = None
         self._browse_matcher = BrowseCommandMatcher()
+        # Regeneration replies by prompt hash: a repeated phrase skips the Ollama round-trip. 0 disables.
+        try:
+            regen_cache_size = int(
+                self._llm_prompt_config.get(
+                    "regeneration_cache_size", DEFAULT_REGEN_CACHE_SIZE
+                )
+            )
+        except (TypeError, ValueError):
+            regen_cache_size = DEFAULT_REGEN_CACHE_SIZE
+        self._regen_cache: RegenerationCache | None = (
+            RegenerationCache(regen_cache_size) if regen_cache_size > 0 else None
+        )
+
+    def _regenerate(self, reg_user: str, reg_system: str) -> str:
+        """Regeneration call with the LRU cache in front; error fallbacks are not cached."""
+        if self._regen_cache is None:
+            return self._llm.generate(reg_user, reg_system)
+        key = regeneration_cache_key(self._llm.model_name, reg_system, reg_user)
+        cached = self._regen_cache.get(key)
+        if cached is not None:
+            self._debug("Regeneration cache hit; skipping Ollama call")
+            return cached
+        regenerated = self._llm.generate(reg_user, reg_system)
+        if regenerated and regenerated.strip() not in (
+            MEMORY_ERROR_MESSAGE.strip(),
+            FALLBACK_MESSAGE.strip(),
+        ):
+            self._regen_cache.put(key, regenerated)
+        return regenerated
+
+    def _generate_streaming(
+        self, user_prompt: str, system: str, on_sentence: Callable[[str], None]
+    ) -> tuple[str, bool]:
+        """
+        Stream the reply, passing each complete sentence to on_sentence.
+        Returns (reply, complete); complete is False when the stream broke off part way,
+        in which case reply is only what arrived (FALLBACK_MESSAGE if nothing did).
+        """
+        parts: list[str] = []
+        pending = ""
+        complete = True
+        try:
+            for fragment in self._llm.generate_stream(user_prompt, system):
+                parts.append(fragment)
+                sentences, pending = _split_complete_sentences(pending + fragment)
+                for sentence in sentences:
+                    on_sentence(sentence)
+        except Exception as e:
+            logger.warning("Document QA stream broke off: %s", e)
+            self._debug("Error (Ollama stream): %s", e)
+            complete = False
+        if pending.strip():
+            on_sentence(pending.strip())
+        return ("".join(parts).strip() or FALLBACK_MESSAGE, complete)
+
+    def _document_qa_generate(
+        self,
+        user_prompt: str,
+        system: str,
+        on_sentence: Callable[[str], None] | None = None,
+    ) -> str:
+        """
+        Document-QA call with the persistent answer cache in front (when configured).
+        With on_sentence, a cache miss streams the answer and hands over each sentence as it completes.
+        """
+
+        def _generate() -> tuple[str, bool]:
+            if on_sentence is not None:
+                return self._generate_streaming(user_prompt, system, on_sentence)
+            return (self._llm.generate(user_prompt, system), True)
+
+        if self._qa_cache is None:
+            return _generate()[0]
+        key = regeneration_cache_key(self._llm.model_name, system, user_prompt)
+        try:
+            cached = self._qa_cache.get(key)
+        except Exception as e:
+            logger.debug("QA cache lookup failed: %s", e)
+            cached = None
+        if cached is not None:
+            self._debug("Document QA: answer cache hit; skipping Ollama call")
+            return cached
+        response, complete = _generate()
+        if not complete:
+            # A stream that broke off part way is spoken but never cached.
+            return response
+        if response and response.strip() not in (
+            MEMORY_ERROR_MESSAGE.strip(),
+            FALLBACK_MESSAGE.strip(),
+        ):
+            try:
+                self._qa_cache.put(key, response)
+            except Exception as e:
+                logger.debug("QA cache store failed: %s", e)
+        return response
 
     def _push_spoken(self, text: str) -> None:
         """Record spoken TTS so we can filter it out from STT (do not listen to yourself)."""
         s = (text or "").strip()
         self._last_spoken_response = s or self._last_spoken_response
         if s:
+            self._last_spoken_norm = " ".join(s.lower().split())
             self._recent_spoken_responses = [s] + [
                 x for x in self._recent_spoken_responses if x != s
             ][: self._recent_spoken_max - 1]
+            self._recent_spoken_forms = [
+                (x.lower(), _norm_echo(x)) for x in self._recent_spoken_responses
+            ]
             self._last_tts_time = time.monotonic()
 
     def _should_skip_tts(
@@ -330,23 +629,32 @@ class Pipeline:
         on_debug: Callable[[str], None] | None = None,
         on_volume: Callable[[float], None] | None = None,
         on_sensitivity_adjusted: Callable[[float], None] | None = None,
+        on_interaction_saved: Callable[[int], None] | None = None,
     ) -> None:
+        """
+        on_response gets the reply as soon as it is ready, with interaction id 0: the row is
+        written in the background, and on_interaction_saved gets its id once it is committed.
+        """
         self._on_status = on_status
         self._on_response = on_response
         self._on_error = on_error
         if on_debug is not None:
             self._on_debug = on_debug
-            self._llm.set_debug_log(lambda m: self._debug(m))
+            # No subscriber: leave the client without a hook so it skips building its debug lines.
+            self._llm.set_debug_log(self._debug if on_debug is not _no_debug else None)
         if on_volume is not None:
             self._on_volume = on_volume
         if on_sensitivity_adjusted is not None:
             self._on_sensitivity_adjusted = on_sensitivity_adjusted
+        if on_interaction_saved is not None:
+            self._on_interaction_saved = on_interaction_saved
 
     def get_sensitivity(self) -> float:
         return self._capture.get_sensitivity()
 
     def set_sensitivity(self, value: float) -> None:
         self._capture.set_sensitivity(value)
+        self._recent_levels.clear()
 
     def set_training_mode(self, enabled: bool) -> None:
         """When True, transcriptions are passed to on_training_transcription and not sent to the LLM."""
@@ -368,6 +676,8 @@ class Pipeline:
 
     def set_document_qa_mode(self, on: bool) -> None:
         """When True, next utterance is treated as a document question: retrieve and use document-QA prompts. Clears web mode."""
+        if on != self._document_qa_mode and self._regen_cache is not None:
+            self._regen_cache.clear()
         self._document_qa_mode = on
         if on:
             self._web_mode = False
@@ -428,9 +738,16 @@ class Pipeline:
         except Exception as e:
             logger.debug("TTS speak failed: %s", e)
 
-    def _debug(self, msg: str) -> None:
-        ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        self._on_debug(f"[{ts}] {msg}")
+    def _debug_enabled(self) -> bool:
+        return self._on_debug is not _no_debug
+
+    def _debug(self, msg: str, *args: object) -> None:
+        """Timestamped line to the debug UI; msg % args is only built when a subscriber is set."""
+        if self._on_debug is _no_debug:
+            return
+        if args:
+            msg = msg % args
+        self._on_debug(f"[{_debug_timestamp()}] {msg}")
 
     def _prefetch_profile_and_recent(
         self, turns: int
@@ -449,6 +766,72 @@ class Pipeline:
                 logger.debug("Prefetch list_recent failed: %s", e)
         return (profile_ctx, recent)
 
+    def _completion_prompts(self, phrase: str, profile_context: str) -> tuple[str, str]:
+        """Build (system, user_prompt) for the completion call on phrase."""
+        system = build_system_prompt(
+            profile_context,
+            system_base=self._llm_prompt_config.get("system_prompt"),
+            retrieved_context=None,
+            conversation_context=None,
+        )
+        user_prompt = build_user_prompt(
+            phrase,
+            user_prompt_template=self._llm_prompt_config.get("user_prompt_template"),
+        )
+        return (system, user_prompt)
+
+    def _speculative_completion(
+        self, text: str, cancel: threading.Event | None = None
+    ) -> tuple[str, str, str | None]:
+        """
+        Run the completion call on the raw transcription while regeneration is in flight.
+        Returns (system, user_prompt, response) so the caller can check the prompts still match.
+        With cancel, the reply is streamed so setting the event drops the Ollama connection
+        (Ollama stops decoding); response is None when cancelled or the stream failed.
+        """
+        try:
+            profile_context = self._profile.get_context_for_llm()
+        except Exception as e:
+            logger.debug("Speculative completion: profile failed: %s", e)
+            profile_context = ""
+        system, user_prompt = self._completion_prompts(text, profile_context)
+        generate_stream = getattr(self._llm, "generate_stream", None)
+        if cancel is None or generate_stream is None:
+            return (system, user_prompt, self._llm.generate(user_prompt, system))
+        reply = "".join(generate_stream(user_prompt, system, cancel=cancel)).strip()
+        if cancel.is_set() or not reply:
+            return (system, user_prompt, None)
+        return (system, user_prompt, reply)
+
+    def _take_speculative_completion(
+        self, future: Future, system: str, user_prompt: str
+    ) -> str | None:
+        """
+        Return the speculative completion's response if it was built from the same prompts
+        as the completion we are about to run; otherwise return None.
+        """
+        try:
+            spec_system, spec_user, spec_response = future.result(
+                timeout=self._llm.timeout_sec + 10
+            )
+        except Exception as e:
+            logger.debug("Speculative completion failed: %s", e)
+            return None
+        if spec_response and spec_system == system and spec_user == user_prompt:
+            self._debug("Using speculative completion (started with regeneration)")
+            return spec_response
+        return None
+
+    def _warmup_llm(self) -> None:
+        """Load the model in Ollama with a one-word generate; the reply is discarded."""
+        started = time.monotonic()
+        try:
+            self._llm.generate("hi", "Reply with one word.")
+        except Exception as e:
+            logger.debug("LLM warmup failed: %s", e)
+            return
+        self._debug("LLM warmup done in %.2fs", time.monotonic() - started)
+
     def invalidate_profile_cache(self) -> None:
         """Invalidate the language profile cache so the next LLM request uses fresh corrections/accepted."""
         self._profile.invalidate_cache()
@@ -457,8 +840,9 @@ class Pipeline:
         if self._running:
             return
         # New executor each start; the previous one may have been shut down in stop().
+        # Three workers: regeneration, profile/recent prefetch, and the optional speculative completion.
         self._executor = ThreadPoolExecutor(
-            max_workers=2, thread_name_prefix="talkie-core-pipeline"
+            max_workers=3, thread_name_prefix="talkie-core-pipeline"
         )
         self._running = True
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
@@ -480,8 +864,82 @@ class Pipeline:
             self._executor.shutdown(wait=True)
             self._executor = None
         self._stt.stop()
+        try:
+            self._history.flush()
+        except Exception as e:
+            logger.debug("History flush on stop failed: %s", e)
         self._on_status("Stopped")
 
+    def _interaction_written(self, pending: Future[int]) -> None:
+        """Done callback for a queued interaction; runs on the history writer thread."""
+        try:
+            interaction_id = pending.result()
+        except Exception as e:
+            self._interaction_save_failed(e)
+            return
+        self._profile.invalidate_accepted()
+        self._debug("Saved interaction id=%s", interaction_id)
+        self._on_interaction_saved(interaction_id)
+
+    def _interaction_save_failed(self, e: Exception) -> None:
+        """Log a failed history write and tell the UI; the reply was already shown."""
+        logger.error("Failed to save interaction: %s", e, exc_info=e)
+        self._debug("Error (save interaction): %s", e)
+        self._on_error("Could not save to history")
+
+    def _finalize_response(
+        self,
+        text: str,
+        response: str,
+        from_browse: bool = False,
+        already_spoken: bool = False,
+    ) -> None:
+        """
+        Shared tail of every response path: queue the interaction for saving, show the reply,
+        speak it unless it repeats the last spoken line or is an error fallback,
+        then return to listening. from_browse condenses numbered search results
+        to the spoken instruction; already_spoken skips TTS for a streamed reply.
+        The reply does not wait for the save: _interaction_written reports its id.
+        """
+        try:
+            self._history.enqueue_interaction(
+                original_transcription=text,
+                llm_response=response,
+            ).add_done_callback(self._interaction_written)
+        except Exception as e:
+            self._interaction_save_failed(e)
+
+        spoken_text = strip_certainty_from_response(response or "")
+        if from_browse:
+            spoken_text = _only_search_instruction_if_list(spoken_text)
+        self._on_response(spoken_text, 0)
+        prev_spoken_norm = self._last_spoken_norm
+        self._push_spoken(spoken_text)
+        is_error_fallback = (spoken_text or "").strip() in (
+            FALLBACK_MESSAGE.strip(),
+            MEMORY_ERROR_MESSAGE.strip(),
+        )
+        if already_spoken:
+            self._debug("TTS: already spoken while streaming")
+        elif self._should_skip_tts(spoken_text, is_error_fallback, prev_spoken_norm):
+            if is_error_fallback:
+                self._debug("Skipping TTS: error fallback (show in UI only)")
+            else:
+                self._debug("Skipping TTS: same as last spoken (avoid repeating)")
+        else:
+            try:
+                self._tts.speak(spoken_text)
+                self._debug("TTS: started speaking (speak again to abort and retry)")
+            except Exception as e:
+                logger.exception("TTS speak failed: %s", e)
+                self._debug("Error (TTS): %s", e)
+        if self._wait_until_done_before_listen:
+            try:
+                self._tts.wait_until_done()
+            except Exception as e:
+                logger.debug("TTS wait_until_done: %s", e)
+        self._on_status("Listening...")
+
     def _run_loop(self) -> None:
         self._debug("Pipeline thread started")
         self._on_status("Starting...")
@@ -491,7 +949,7 @@ class Pipeline:
             self._stt.start()
             self._debug("STT started")
         except MicrophoneError as e:
-            self._debug(f"Pipeline start failed: {e}")
+            self._debug("Pipeline start failed: %s", e)
             self._on_error("Microphone disconnected or unavailable")
             logger.exception("Pipeline start failed: %s", e)
             self._running = False
@@ -499,7 +957,7 @@ class Pipeline:
             self._on_status("Stopped")
             return
         except Exception as e:
-            self._debug(f"Pipeline start failed: {e}")
+            self._debug("Pipeline start failed: %s", e)
             self._on_error(str(e))
             logger.exception("Pipeline start failed: %s", e)
             self._running = False
@@ -516,6 +974,9 @@ class Pipeline:
             self._stt.stop()
             self._on_status("Stopped")
             return
+        if self._warmup_llm_enabled and self._executor is not None:
+            # In the background: the loop starts listening while the model loads.
+            self._executor.submit(self._warmup_llm)
 
         while self._running:
             try:
@@ -535,7 +996,7 @@ class Pipeline:
                 self._on_volume(level)
             except Exception as e:
                 logger.debug("Volume callback failed: %s", e)
-                self._debug("Error (volume callback): %s" % e)
+                self._debug("Error (volume callback): %s", e)
 
             if (
                 self._vad_min_level is not None
@@ -543,13 +1004,25 @@ class Pipeline:
                 and level < self._vad_min_level
             ):
                 self._debug(
-                    "VAD: chunk RMS %.4f below threshold %.4f; skipping STT"
-                    % (level, self._vad_min_level)
+                    "VAD: chunk RMS %.4f below threshold %.4f; skipping STT",
+                    level,
+                    self._vad_min_level,
                 )
                 continue
+            if self._vad_min_level is None and level < self._silence_floor:
+                # Clearly silent: STT would return nothing and auto sensitivity would not react.
+                self._debug(
+                    "Silence: chunk RMS %.4f below floor %.4f; skipping STT",
+                    level,
+                    self._silence_floor,
+                )
+                if self._auto_sensitivity_cooldown > 0:
+                    self._auto_sensitivity_cooldown -= 1
+                continue
 
-            self._debug("Audio level (chunk RMS, waveform): %.4f" % level)
-            self._debug("Audio chunk received (%d bytes), transcribing..." % len(chunk))
+            self._debug("Audio level (chunk RMS, waveform): %.4f", level)
+            self._recent_levels.append(level)
+            self._debug("Audio chunk received (%d bytes), transcribing...", len(chunk))
             self._on_status("Transcribing...")
             try:
                 if self._stt_min_confidence is not None and hasattr(
@@ -559,63 +1032,68 @@ class Pipeline:
                     text = (text or "").strip()
                     if confidence is not None and confidence < self._stt_min_confidence:
                         self._debug(
-                            "STT confidence %.2f below threshold %.2f; treating as empty"
-                            % (confidence, self._stt_min_confidence)
+                            "STT confidence %.2f below threshold %.2f; treating as empty",
+                            confidence,
+                            self._stt_min_confidence,
                         )
                         text = ""
                 else:
                     text = self._stt.transcribe(chunk).strip()
             except Exception as e:
                 logger.exception("STT transcribe failed: %s", e)
-                self._debug("Error (STT transcribe): %s" % e)
+                self._debug("Error (STT transcribe): %s", e)
                 self._on_error("Speech recognition failed")
                 continue
             if not text:
                 min_l = self._auto_sensitivity.get("min_level", 0.002)
                 max_l = self._auto_sensitivity.get("max_level", 0.08)
                 self._debug(
-                    "STT: (empty) level=%.4f (auto sens: %s, band %.4f–%.4f)"
-                    % (
-                        level,
-                        "on" if self._auto_sensitivity.get("enabled") else "off",
-                        min_l,
-                        max_l,
-                    )
+                    "STT: (empty) level=%.4f (auto sens: %s, band %.4f–%.4f)",
+                    level,
+                    "on" if self._auto_sensitivity.get("enabled") else "off",
+                    min_l,
+                    max_l,
                 )
                 if level > max_l:
                     self._debug(
                         "High level but no transcription – check mic is 16000 Hz and STT engine (e.g. Whisper model loaded)."
                     )
-                # Auto sensitivity: only when level is in "quiet" band; above max_l we don't assume too quiet
+                # Auto sensitivity: only when the mean level of recent chunks is in the "quiet" band;
+                # above max_l we don't assume too quiet.
                 if (
                     self._auto_sensitivity.get("enabled")
                     and self._auto_sensitivity_cooldown <= 0
                 ):
-                    if min_l <= level <= max_l:
+                    recent = list(self._recent_levels)
+                    avg_level = sum(recent) / len(recent) if recent else level
+                    if min_l <= avg_level <= max_l:
                         step = self._auto_sensitivity.get("step", 0.25)
                         current = self._capture.get_sensitivity()
                         new_sens = min(10.0, current + step)
                         if new_sens > current:
                             self._capture.set_sensitivity(new_sens)
+                            # Levels measured at the old gain no longer describe the input.
+                            self._recent_levels.clear()
                             self._auto_sensitivity_cooldown = (
                                 self._auto_sensitivity.get("cooldown_chunks", 3)
                             )
                             self._debug(
-                                "Auto sensitivity: raised to %.1f (level=%.4f, no speech)"
-                                % (new_sens, level)
+                                "Auto sensitivity: raised to %.1f (mean level=%.4f, no speech)",
+                                new_sens,
+                                avg_level,
                             )
                             try:
                                 self._on_sensitivity_adjusted(new_sens)
                             except Exception as e:
                                 logger.debug("on_sensitivity_adjusted failed: %s", e)
                                 self._debug(
-                                    "Error (sensitivity adjusted callback): %s" % e
+                                    "Error (sensitivity adjusted callback): %s", e
                                 )
                 if self._auto_sensitivity_cooldown > 0:
                     self._auto_sensitivity_cooldown -= 1
                 continue
 
-            self._debug("Transcription: " + text)
+            self._debug("Transcription: %s", text)
 
             try:
                 min_level = self._llm_prompt_config.get("min_audio_level")
@@ -624,8 +1102,9 @@ class Pipeline:
                 min_level = 0.0
             if min_level > 0 and level < min_level:
                 self._debug(
-                    "Audio level below threshold (%.4f < %.4f); skipping to avoid false triggers"
-                    % (level, min_level)
+                    "Audio level below threshold (%.4f < %.4f); skipping to avoid false triggers",
+                    level,
+                    min_level,
                 )
                 continue
 
@@ -646,56 +1125,41 @@ class Pipeline:
             )
             if min_len > 0 and len(text) < min_len and not is_short_browse:
                 self._debug(
-                    "Transcription too short (%d < %d), skipping LLM to avoid spurious responses"
-                    % (len(text), min_len)
+                    "Transcription too short (%d < %d), skipping LLM to avoid spurious responses",
+                    len(text),
+                    min_len,
                 )
                 continue
             if is_short_browse:
-                self._debug("Short transcription allowed (browse command): %s" % text)
+                self._debug("Short transcription allowed (browse command): %s", text)
 
             if not self._speaker_filter.accept(text, chunk):
                 reason = None
                 if hasattr(self._speaker_filter, "get_last_reject_reason"):
                     reason = self._speaker_filter.get_last_reject_reason()
                 self._debug(
-                    "Speaker filter: rejected"
-                    + (
-                        f" ({reason})"
-                        if reason
-                        else " (voice did not match enrolled profile)"
-                    )
+                    "Speaker filter: rejected (%s)",
+                    reason or "voice did not match enrolled profile",
                 )
                 continue
 
             # Skip only when same text as immediately previous chunk (consecutive duplicate); respond every time they talk otherwise
             text_normalized = text.strip()
             if text_normalized and self._previous_chunk_transcription is not None:
-                if text_normalized == self._previous_chunk_transcription.strip():
+                if text_normalized == self._previous_chunk_transcription:
                     self._debug("Same transcription as previous chunk; skipping")
                     continue
             self._previous_chunk_transcription = text_normalized
 
             # Do not listen to yourself: skip when transcription matches any recent TTS (mic picking up our own voice).
-            if text_normalized and self._recent_spoken_responses:
+            if text_normalized and self._recent_spoken_forms:
                 trans_lower = text_normalized.lower()
-
-                def _norm_echo(s: str) -> str:
-                    return " ".join(
-                        "".join(
-                            c if c.isalnum() else " " for c in (s or "").lower()
-                        ).split()
-                    )
-
                 nt = _norm_echo(text_normalized)
                 is_echo = False
-                for last in self._recent_spoken_responses:
-                    if not last:
-                        continue
-                    last_lower = last.strip().lower()
+                for last_lower, ns in self._recent_spoken_forms:
                     if trans_lower == last_lower:
                         is_echo = True
                         break
-                    ns = _norm_echo(last)
                     if nt and ns:
                         # Substring match: only treat as echo when transcription isn't meaningfully longer (user adding words = new input).
                         if len(nt) >= 20 and (nt in ns or ns in nt):
@@ -748,6 +1212,9 @@ class Pipeline:
                 regeneration_certainty: int | None = None
                 profile_context_prefetch: str | None = None
                 recent_list_prefetch: list[InteractionRecord] | None = None
+                speculative_future: Future | None = None
+                speculative_cancel = threading.Event()
+                streamed_tts = False
                 try:
                     turns = int(
                         self._llm_prompt_config.get("conversation_context_turns", 0)
@@ -767,26 +1234,16 @@ class Pipeline:
                     intent_sentence = text
                     used_regeneration = False
                 elif self._llm_prompt_config.get("regeneration_enabled", True):
-                    request_certainty = self._llm_prompt_config.get(
-                        "regeneration_request_certainty", True
-                    )
-                    reg_system, reg_user = build_regeneration_prompts(
-                        text,
-                        system_prompt=self._llm_prompt_config.get("system_prompt")
-                        or self._llm_prompt_config.get(
-                            "regeneration_system_prompt"
-                        ),
-                        user_prompt_template=self._llm_prompt_config.get(
-                            "regeneration_user_prompt_template"
-                        ),
-                        request_certainty=request_certainty,
+                    reg_system = self._reg_system
+                    reg_user = fill_transcription_template(
+                        self._reg_user_template, text.strip()
                     )
                     self._debug(
-                        "Ollama regeneration: raw -> intent sentence"
-                        + (" (with certainty)" if request_certainty else "")
+                        "Ollama regeneration: raw -> intent sentence%s",
+                        " (with certainty)" if self._reg_request_certainty else "",
                     )
                     if not self._running or self._executor is None:
-                        regenerated = self._llm.generate(reg_user, reg_system)
+                        regenerated = self._regenerate(reg_user, reg_system)
                         profile_context_prefetch, recent_list_prefetch = (
                             self._prefetch_profile_and_recent(turns)
                         )
@@ -794,18 +1251,26 @@ class Pipeline:
                         submitted = False
                         try:
                             future_regen = self._executor.submit(
-                                self._llm.generate, reg_user, reg_system
+                                self._regenerate, reg_user, reg_system
                             )
                             future_ctx = self._executor.submit(
                                 self._prefetch_profile_and_recent, turns
                             )
                             submitted = True
+                            if not self._training_mode and self._llm_prompt_config.get(
+                                "speculative_completion", False
+                            ):
+                                speculative_future = self._executor.submit(
+                                    self._speculative_completion,
+                                    text,
+                                    speculative_cancel,
+                                )
                         except RuntimeError as e:
                             if (
                                 "shutdown" in str(e).lower()
                                 or "futures" in str(e).lower()
                             ):
-                                regenerated = self._llm.generate(reg_user, reg_system)
+                                regenerated = self._regenerate(reg_user, reg_system)
                                 profile_context_prefetch, recent_list_prefetch = (
                                     self._prefetch_profile_and_recent(turns)
                                 )
@@ -820,7 +1285,7 @@ class Pipeline:
                                 profile_context_prefetch = profile_ctx
                                 recent_list_prefetch = recent_list
                             except FuturesTimeoutError:
-                                regenerated = self._llm.generate(reg_user, reg_system)
+                                regenerated = self._regenerate(reg_user, reg_system)
                                 profile_context_prefetch, recent_list_prefetch = (
                                     self._prefetch_profile_and_recent(turns)
                                 )
@@ -829,7 +1294,7 @@ class Pipeline:
                                     "Parallel prefetch or regen failed, falling back to sequential: %s",
                                     e,
                                 )
-                                regenerated = self._llm.generate(reg_user, reg_system)
+                                regenerated = self._regenerate(reg_user, reg_system)
                                 profile_context_prefetch, recent_list_prefetch = (
                                     self._prefetch_profile_and_recent(turns)
                                 )
@@ -872,11 +1337,12 @@ class Pipeline:
                                 )
                         if used_regeneration and regeneration_certainty is not None:
                             self._debug(
-                                "Regenerated intent: %s (certainty %d%%)"
-                                % (intent_sentence, regeneration_certainty)
+                                "Regenerated intent: %s (certainty %d%%)",
+                                intent_sentence,
+                                regeneration_certainty,
                             )
                         elif used_regeneration:
-                            self._debug("Regenerated intent: " + intent_sentence)
+                            self._debug("Regenerated intent: %s", intent_sentence)
                     else:
                         self._debug(
                             "Regeneration empty or fallback; using raw transcription"
@@ -891,7 +1357,7 @@ class Pipeline:
                         logger.exception(
                             "Training transcription callback failed: %s", e
                         )
-                        self._debug("Error (training callback): %s" % e)
+                        self._debug("Error (training callback): %s", e)
                     self._on_status("Listening...")
                     continue
 
@@ -921,8 +1387,8 @@ class Pipeline:
                         )
                     ):
                         self._debug(
-                            "Browse: skipping (cooldown %.0fs after TTS)"
-                            % self._browse_cooldown_after_tts_sec
+                            "Browse: skipping (cooldown %.0fs after TTS)",
+                            self._browse_cooldown_after_tts_sec,
                         )
                         self._on_status("Listening...")
                         continue
@@ -937,17 +1403,17 @@ class Pipeline:
                         continue
                     self._on_status("Responding... (browse)")
                     self._debug(
-                        "Browse: using raw transcription: '%s'"
-                        % (
+                        "Browse: using raw transcription: '%s'",
+                        (
                             browse_utterance[:80] + "..."
                             if len(browse_utterance) > 80
                             else browse_utterance
-                        )
+                        ),
                     )
                     intent_preview = (browse_utterance or "").strip()
                     if len(intent_preview) > 80:
                         intent_preview = intent_preview[:80] + "..."
-                    self._debug("Browse: handling '%s'" % intent_preview)
+                    self._debug("Browse: handling '%s'", intent_preview)
                     web_response = None
                     try:
                         web_response = self._web_handler(
@@ -969,55 +1435,14 @@ class Pipeline:
                             )
                     except Exception as e:
                         logger.exception("Web handler failed: %s", e)
-                        self._debug("[ERROR] Web handler failed: %s" % e)
+                        self._debug("[ERROR] Web handler failed: %s", e)
                         web_response = "Could not complete that action."
                     if web_response is not None:
                         resp_preview = (web_response or "").strip()
                         if len(resp_preview) > 100:
                             resp_preview = resp_preview[:100] + "..."
-                        self._debug("Browse result: %s" % resp_preview)
-                        try:
-                            interaction_id = self._history.insert_interaction(
-                                original_transcription=text,
-                                llm_response=web_response,
-                            )
-                            self._profile.invalidate_cache()
-                        except Exception as e:
-                            logger.exception("Failed to save interaction: %s", e)
-                            interaction_id = 0
-                        spoken_text = strip_certainty_from_response(web_response or "")
-                        spoken_text = _only_search_instruction_if_list(spoken_text)
-                        self._on_response(spoken_text, interaction_id)
-                        prev_spoken_norm = (
-                            " ".join(
-                                (self._last_spoken_response or "")
-                                .strip()
-                                .lower()
-                                .split()
-                            )
-                            if self._last_spoken_response
-                            else ""
-                        )
-                        self._push_spoken(spoken_text)
-                        if self._should_skip_tts(spoken_text, False, prev_spoken_norm):
-                            self._debug(
-                                "Skipping TTS: same as last spoken (avoid repeating)"
-                            )
-                        else:
-                            try:
-                                self._tts.speak(spoken_text)
-                                self._debug(
-                                    "TTS: started speaking (speak again to abort and retry)"
-                                )
-                            except Exception as e:
-                                logger.exception("TTS speak failed: %s", e)
-                                self._debug("Error (TTS): %s" % e)
-                        if self._wait_until_done_before_listen:
-                            try:
-                                self._tts.wait_until_done()
-                            except Exception as e:
-                                logger.debug("TTS wait_until_done: %s", e)
-                        self._on_status("Listening...")
+                        self._debug("Browse result: %s", resp_preview)
+                        self._finalize_response(text, web_response, from_browse=True)
                         continue
 
                     # Web mode: no output when no command was executed (handler returned None).
@@ -1066,8 +1491,8 @@ class Pipeline:
                                 recent_user_phrase_norms.add(_norm(user))
                         if lines:
                             self._debug(
-                                "Included %d recent turn(s) for context / repeat check"
-                                % len(lines)
+                                "Included %d recent turn(s) for context / repeat check",
+                                len(lines),
                             )
                     except Exception as e:
                         logger.debug("Failed to build recent context: %s", e)
@@ -1089,15 +1514,32 @@ class Pipeline:
                                 )
                             except Exception as e:
                                 logger.exception("RAG retriever failed: %s", e)
-                                self._debug("Error (RAG retriever): %s" % e)
+                                self._debug("Error (RAG retriever): %s", e)
                         system = build_document_qa_system_prompt(retrieved_context)
                         user_prompt = build_document_qa_user_prompt(intent_sentence)
                         self._debug(
-                            "Document QA: Ollama with retrieved context (%d chars)"
-                            % len(retrieved_context)
+                            "Document QA: Ollama with retrieved context (%d chars)",
+                            len(retrieved_context),
+                        )
+                        speaker = (
+                            _SentenceSpeaker(self._tts)
+                            if self._stream_document_qa
+                            and _SentenceSpeaker.supports(self._tts)
+                            else None
                         )
-                        response = self._llm.generate(user_prompt, system)
-                        self._debug("Ollama API response (%d chars):" % len(response))
+                        try:
+                            response = self._document_qa_generate(
+                                user_prompt,
+                                system,
+                                on_sentence=(
+                                    speaker.put if speaker is not None else None
+                                ),
+                            )
+                        finally:
+                            if speaker is not None:
+                                speaker.close()
+                        streamed_tts = speaker is not None and speaker.spoke
+                        self._debug("Ollama API response (%d chars):", len(response))
                 else:
                     use_regeneration_as_response = self._llm_prompt_config.get(
                         "use_regeneration_as_response", True
@@ -1111,31 +1553,6 @@ class Pipeline:
 
                     # If we heard the full sentence and the LLM effectively agrees (same or nearly same), just repeat it —
                     # unless the utterance looks like a request/command (user wants an action or completed reply, not an echo).
-                    def _normalize_for_repeat(s: str) -> str:
-                        s = (s or "").strip().lower()
-                        s = " ".join(s.split())
-                        return s.rstrip(".!? ")
-
-                    def _looks_like_request(u: str) -> bool:
-                        u = (u or "").strip().lower()
-                        if not u or len(u) < 6:
-                            return False
-                        return (
-                            u.startswith("please take me")
-                            or u.startswith("take me ")
-                            or u.startswith("take me to")
-                            or u.startswith("go to ")
-                            or u.startswith("go to the ")
-                            or u.startswith("open ")
-                            or u.startswith("open the ")
-                            or u.startswith("turn on ")
-                            or u.startswith("turn off ")
-                            or u.startswith("i need ")
-                            or u.startswith("i want to ")
-                            or " take me " in u
-                            or " take me to " in u
-                        )
-
                     transcript_norm = _normalize_for_repeat(text_normalized)
                     intent_norm = _normalize_for_repeat(intent_sentence)
                     llm_agrees_repeat = (
@@ -1162,15 +1579,17 @@ class Pipeline:
                         )
                         if skip_completion:
                             response = intent_sentence
-                            self._debug(
-                                "Using regenerated intent as response (skipping completion)"
-                                + (
-                                    " (certainty %d%% >= %d%%)"
-                                    % (regeneration_certainty, certainty_threshold)
-                                    if regeneration_certainty is not None
-                                    else ""
+                            if regeneration_certainty is not None:
+                                self._debug(
+                                    "Using regenerated intent as response (skipping completion)"
+                                    " (certainty %d%% >= %d%%)",
+                                    regeneration_certainty,
+                                    certainty_threshold,
+                                )
+                            else:
+                                self._debug(
+                                    "Using regenerated intent as response (skipping completion)"
                                 )
-                            )
                         else:
                             if _looks_like_malformed_regeneration(intent_sentence):
                                 self._debug(
@@ -1178,8 +1597,9 @@ class Pipeline:
                                 )
                             if used_regeneration and regeneration_certainty is not None:
                                 self._debug(
-                                    "Certainty %d%% < %d%%, running completion call"
-                                    % (regeneration_certainty, certainty_threshold)
+                                    "Certainty %d%% < %d%%, running completion call",
+                                    regeneration_certainty,
+                                    certainty_threshold,
                                 )
                             if profile_context_prefetch is not None:
                                 profile_context = profile_context_prefetch
@@ -1193,10 +1613,9 @@ class Pipeline:
                                         "Profile get_context_for_llm failed: %s", e
                                     )
                                     self._debug(
-                                        "Error (profile get_context_for_llm): %s" % e
+                                        "Error (profile get_context_for_llm): %s", e
                                     )
                                     profile_context = ""
-                            retrieved_context = ""
                             # Use raw transcription when regeneration was malformed (e.g. list format) so LLM formulates one sentence.
                             phrase_for_completion = (
                                 text
@@ -1204,53 +1623,54 @@ class Pipeline:
                                 else intent_sentence
                             )
                             # Use only current sentence in prompt; history is used only for repeat check, not in the prompt.
-                            system = build_system_prompt(
-                                profile_context,
-                                system_base=self._llm_prompt_config.get(
-                                    "system_prompt"
-                                ),
-                                retrieved_context=retrieved_context or None,
-                                conversation_context=None,
-                            )
-                            user_prompt = build_user_prompt(
-                                phrase_for_completion,
-                                user_prompt_template=self._llm_prompt_config.get(
-                                    "user_prompt_template"
-                                ),
+                            system, user_prompt = self._completion_prompts(
+                                phrase_for_completion, profile_context
                             )
                             model_name = self._llm.model_name
                             self._debug(
-                                "Ollama API call: POST %s/api/generate model=%s"
-                                % (self._llm.base_url, model_name)
-                            )
-                            self._debug(
-                                "Ollama system prompt (%d chars):" % len(system)
-                            )
-                            self._debug(
-                                (system[:2000] + "...")
-                                if len(system) > 2000
-                                else (system or "(empty)")
+                                "Ollama API call: POST %s/api/generate model=%s",
+                                self._llm.base_url,
+                                model_name,
                             )
+                            self._debug("Ollama system prompt (%d chars):", len(system))
+                            if self._debug_enabled():
+                                self._debug(
+                                    (system[:2000] + "...")
+                                    if len(system) > 2000
+                                    else (system or "(empty)")
+                                )
                             self._debug("Ollama user prompt:")
                             self._debug(user_prompt)
-                            response = self._llm.generate(user_prompt, system)
+                            response = None
+                            # The speculative call was built from the raw transcription; only reusable for the same phrase.
+                            if (
+                                speculative_future is not None
+                                and phrase_for_completion == text
+                            ):
+                                response = self._take_speculative_completion(
+                                    speculative_future, system, user_prompt
+                                )
+                            if response is None:
+                                response = self._llm.generate(user_prompt, system)
                             self._debug(
-                                "Ollama API response (%d chars):" % len(response)
+                                "Ollama API response (%d chars):", len(response)
                             )
                             self._debug(response)
 
                 # One repeat check for every response path: never repeat a recent assistant or user phrase or last spoken.
                 # Don't replace error messages with intent/raw so the user sees the error once instead of their words echoed.
-                if response and response.strip() not in (
-                    MEMORY_ERROR_MESSAGE.strip(),
-                    FALLBACK_MESSAGE.strip(),
+                # A streamed answer has already been spoken, so it is kept as is.
+                if (
+                    not streamed_tts
+                    and response
+                    and response.strip()
+                    not in (
+                        MEMORY_ERROR_MESSAGE.strip(),
+                        FALLBACK_MESSAGE.strip(),
+                    )
                 ):
                     rn = _norm(response)
-                    last_spoken_norm = (
-                        _norm(self._last_spoken_response)
-                        if self._last_spoken_response
-                        else ""
-                    )
+                    last_spoken_norm = self._last_spoken_norm
                     is_repeat = (
                         rn in recent_reply_norms
                         or rn in recent_user_phrase_norms
@@ -1273,10 +1693,7 @@ class Pipeline:
                         if (
                             rn2 in recent_reply_norms
                             or rn2 in recent_user_phrase_norms
-                            or (
-                                self._last_spoken_response
-                                and rn2 == _norm(self._last_spoken_response)
-                            )
+                            or (last_spoken_norm and rn2 == last_spoken_norm)
                         ):
                             self._debug(
                                 "Intent was also a repeat; formulating raw transcription via LLM"
@@ -1287,29 +1704,24 @@ class Pipeline:
                                     if profile_context_prefetch is not None
                                     else self._profile.get_context_for_llm()
                                 )
-                                system = build_system_prompt(
-                                    profile_context,
-                                    system_base=self._llm_prompt_config.get(
-                                        "system_prompt"
-                                    ),
-                                    retrieved_context=None,
-                                    conversation_context=None,
-                                )
-                                user_prompt = build_user_prompt(
-                                    text,
-                                    user_prompt_template=self._llm_prompt_config.get(
-                                        "user_prompt_template"
-                                    ),
+                                system, user_prompt = self._completion_prompts(
+                                    text, profile_context
                                 )
-                                response = self._llm.generate(user_prompt, system)
+                                response = None
+                                if speculative_future is not None:
+                                    response = self._take_speculative_completion(
+                                        speculative_future, system, user_prompt
+                                    )
+                                if response is None:
+                                    response = self._llm.generate(user_prompt, system)
                                 if response and response.strip():
                                     self._debug(
-                                        "LLM formulated raw transcription: %s"
-                                        % (
+                                        "LLM formulated raw transcription: %s",
+                                        (
                                             (response[:60] + "...")
                                             if len(response) > 60
                                             else response
-                                        )
+                                        ),
                                     )
                                 else:
                                     response = text
@@ -1320,67 +1732,25 @@ class Pipeline:
                                 )
                                 response = text
 
+                if speculative_future is not None:
+                    # Drop the speculative call when it was not used (regeneration accepted, or a different phrase):
+                    # cancel it if still queued, otherwise abort its stream so Ollama stops decoding.
+                    speculative_future.cancel()
+                    speculative_cancel.set()
+
                 if not (response or "").strip():
                     response = (
                         intent_sentence or text or ""
                     ).strip() or FALLBACK_MESSAGE
                     self._debug(
-                        "Response empty; using intent/transcription/fallback: %s"
-                        % (response[:50] + "..." if len(response) > 50 else response)
+                        "Response empty; using intent/transcription/fallback: %s",
+                        response[:50] + "..." if len(response) > 50 else response,
                     )
 
-                try:
-                    interaction_id = self._history.insert_interaction(
-                        original_transcription=text,
-                        llm_response=response,
-                    )
-                    self._profile.invalidate_cache()
-                    self._debug(f"Saved interaction id={interaction_id}")
-                except Exception as e:
-                    logger.exception("Failed to save interaction: %s", e)
-                    self._debug("Error (save interaction): %s" % e)
-                    self._on_error("Could not save to history")
-                    interaction_id = 0
-
-                spoken_text = strip_certainty_from_response(response or "")
-                self._on_response(spoken_text, interaction_id)
-                prev_spoken_norm = (
-                    _norm(self._last_spoken_response)
-                    if self._last_spoken_response
-                    else ""
-                )
-                self._push_spoken(spoken_text)
-                is_error_fallback = (spoken_text or "").strip() in (
-                    FALLBACK_MESSAGE.strip(),
-                    MEMORY_ERROR_MESSAGE.strip(),
-                )
-                if self._should_skip_tts(
-                    spoken_text, is_error_fallback, prev_spoken_norm
-                ):
-                    if is_error_fallback:
-                        self._debug("Skipping TTS: error fallback (show in UI only)")
-                    else:
-                        self._debug(
-                            "Skipping TTS: same as last spoken (avoid repeating)"
-                        )
-                else:
-                    try:
-                        self._tts.speak(spoken_text)
-                        self._debug(
-                            "TTS: started speaking (speak again to abort and retry)"
-                        )
-                    except Exception as e:
-                        logger.exception("TTS speak failed: %s", e)
-                        self._debug("Error (TTS): %s" % e)
-                if self._wait_until_done_before_listen:
-                    try:
-                        self._tts.wait_until_done()
-                    except Exception as e:
-                        logger.debug("TTS wait_until_done: %s", e)
-                self._on_status("Listening...")
+                self._finalize_response(text, response, already_spoken=streamed_tts)
             except Exception as e:
                 logger.exception("Respond block failed: %s", e)
-                self._debug("Error (respond): %s" % e)
+                self._debug("Error (respond): %s", e)
                 self._on_error("Response failed; check Ollama and log.")
                 self._on_status("Listening...")
 
@@ -6,37 +6,44 @@ When client_sample_rate != 16000, resamples to 16 kHz before buffering.
 
 from __future__ import annotations
 
+import functools
 import threading
-from collections import deque
+from typing import Callable
 
 from sdk import AudioCapture
 from app.audio_utils import resample_int16
 
 TARGET_SAMPLE_RATE = 16000
+# Initial ring size in chunks (at least 64 KiB); it doubles if the reader falls further behind.
+RING_CHUNKS = 4
 
 
 class WebSocketAudioCapture(AudioCapture):
     """
     Capture that buffers bytes from put_chunk() and returns chunk_size bytes from read_chunk().
     If client_sample_rate is set and != 16000, incoming bytes are resampled to 16 kHz before buffering.
+    Bytes are kept in one preallocated ring buffer; no audio is dropped when it fills (it grows).
     """
 
     def __init__(self, chunk_size_bytes: int, sample_rate: int = 16000) -> None:
         self._chunk_size = chunk_size_bytes
         self._sample_rate = sample_rate
-        self._buffer: deque[bytes] = deque()
-        self._buffer_len = 0
+        self._ring = bytearray(max(RING_CHUNKS * chunk_size_bytes, 1 << 16))
+        self._head = 0  # offset of the oldest buffered byte
+        self._count = 0  # buffered bytes
         self._lock = threading.Lock()
         self._condition = threading.Condition(self._lock)
         self._started = False
         self._sensitivity = 1.0
         self._client_sample_rate: int | None = None
+        # Bound resampler for the client's rate; None when it already sends 16 kHz.
+        self._resample: Callable[[bytes], bytes] | None = None
 
     def start(self) -> None:
         with self._lock:
             self._started = True
-            self._buffer.clear()
-            self._buffer_len = 0
+            self._head = 0
+            self._count = 0
 
     def stop(self) -> None:
         with self._lock:
@@ -46,44 +53,71 @@ class WebSocketAudioCapture(AudioCapture):
     def set_client_sample_rate(self, rate: int | None) -> None:
         """Set the browser's actual sample rate (e.g. 48000). When != 16000, put_chunk resamples."""
         self._client_sample_rate = rate
+        if not rate or rate == TARGET_SAMPLE_RATE:
+            self._resample = None
+        else:
+            self._resample = functools.partial(
+                resample_int16, rate_in=rate, rate_out=TARGET_SAMPLE_RATE
+            )
 
     def put_chunk(self, data: bytes) -> None:
         """Called from WebSocket handler when browser sends audio bytes."""
         if not data:
             return
-        rate_in = self._client_sample_rate or TARGET_SAMPLE_RATE
-        if rate_in != TARGET_SAMPLE_RATE:
-            data = resample_int16(data, rate_in, TARGET_SAMPLE_RATE)
+        resample = self._resample
+        if resample is not None:
+            data = resample(data)
         if not data:
             return
         with self._lock:
             if not self._started:
                 return
-            self._buffer.append(data)
-            self._buffer_len += len(data)
-            self._condition.notify_all()
+            n = len(data)
+            if self._count + n > len(self._ring):
+                self._grow(self._count + n)
+            cap = len(self._ring)
+            tail = (self._head + self._count) % cap
+            first = min(n, cap - tail)
+            with memoryview(self._ring) as ring, memoryview(data) as src:
+                ring[tail : tail + first] = src[:first]
+                if first < n:
+                    ring[: n - first] = src[first:]
+            self._count += n
+            # Wake the reader only once a full chunk is buffered; it would go back to sleep otherwise.
+            if self._count >= self._chunk_size:
+                self._condition.notify()
+
+    def _peek(self, n: int) -> bytes:
+        """Copy of the next n buffered bytes (caller holds the lock and n <= _count)."""
+        cap = len(self._ring)
+        end = self._head + n
+        with memoryview(self._ring) as ring:
+            if end <= cap:
+                return bytes(ring[self._head : end])
+            return b"".join((ring[self._head :], ring[: end - cap]))
+
+    def _grow(self, needed: int) -> None:
+        """Reallocate the ring to hold at least needed bytes, with the buffered bytes unwrapped at 0."""
+        cap = len(self._ring)
+        while cap < needed:
+            cap *= 2
+        ring = bytearray(cap)
+        ring[: self._count] = self._peek(self._count)
+        self._ring = ring
+        self._head = 0
 
     def read_chunk(self, on_level=None):
         """Block until we have chunk_size bytes, then return them. Returns None when stopped."""
+        # No wait timeout: put_chunk notifies once a chunk is complete and stop() wakes the reader.
         with self._condition:
-            while self._started and self._buffer_len < self._chunk_size:
-                self._condition.wait(timeout=0.3)
+            while self._started and self._count < self._chunk_size:
+                self._condition.wait()
             if not self._started:
                 return None
-            if self._buffer_len < self._chunk_size:
-                return None
-            out = bytearray()
-            while len(out) < self._chunk_size and self._buffer:
-                b = self._buffer.popleft()
-                self._buffer_len -= len(b)
-                take = min(len(b), self._chunk_size - len(out))
-                out.extend(b[:take])
-                if len(b) > take:
-                    remainder = b[take:]
-                    self._buffer.appendleft(remainder)
-                    self._buffer_len += len(remainder)
-                    break
-            return bytes(out) if out else None
+            out = self._peek(self._chunk_size)
+            self._head = (self._head + self._chunk_size) % len(self._ring)
+            self._count -= self._chunk_size
+            return out
 
     def get_sensitivity(self) -> float:
         return self._sensitivity
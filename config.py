@@ -5,33 +5,48 @@ Config is merged from module configs, root config.yaml, and optional config.user
 
 from __future__ import annotations
 
+import copy
+import json
 import os
 from pathlib import Path
 
-import yaml
-
 _CONFIG_ROOT = Path(__file__).resolve().parent
 _MODULES_ROOT = _CONFIG_ROOT / "modules"
 
+# (source signature, merged config) from the last load_config(); any changed file is a miss.
+_config_cache: tuple[tuple, dict] | None = None
+
+# Merged config written next to the root config.yaml; reused by later processes while its signature matches.
+_SIDECAR_NAME = ".config.merged.json"
+
 
 def _deep_merge(base: dict, override: dict) -> dict:
     """Recursively merge override into base. override wins for conflicts. Returns new dict."""
     out = dict(base)
-    for k, v in override.items():
-        if k in out and isinstance(out[k], dict) and isinstance(v, dict):
-            out[k] = _deep_merge(out[k], v)
-        else:
-            out[k] = v
+    # Iterative: only dicts present on both sides are copied, each exactly once.
+    stack = [(out, override)]
+    while stack:
+        dst, src = stack.pop()
+        for k, v in src.items():
+            cur = dst.get(k)
+            if isinstance(cur, dict) and isinstance(v, dict):
+                merged = dict(cur)
+                dst[k] = merged
+                stack.append((merged, v))
+            else:
+                dst[k] = v
     return out
 
 
 def load_yaml_file(path: Path) -> dict:
     """Load a YAML file; return {} if missing or invalid. Single place for safe YAML loading."""
-    if not path.exists():
-        return {}
     try:
+        import yaml
+
+        # libyaml's C loader when PyYAML was built with it (several times faster).
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
@@ -72,34 +87,97 @@ def get_modules_enabled(raw_config: dict | None) -> list[str]:
     return []
 
 
+def _file_signature(path: Path) -> tuple[str, int | None, int | None]:
+    """(path, mtime_ns, size) for cache keys; (path, None, None) if the file is missing."""
+    try:
+        st = path.stat()
+    except OSError:
+        return (str(path), None, None)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def clear_config_cache() -> None:
+    """Drop the cached merged config so the next load_config() re-reads every file."""
+    global _config_cache
+    _config_cache = None
+
+
+def _read_sidecar(path: Path, signature: list) -> dict | None:
+    """Return the merged config stored in the JSON sidecar if it was built from the same files."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("signature") != signature:
+        return None
+    merged = data.get("config")
+    return merged if isinstance(merged, dict) else None
+
+
+def _write_sidecar(path: Path, signature: list, merged: dict) -> None:
+    """Write the JSON sidecar atomically; skipped on a read-only directory or non-JSON values."""
+    try:
+        payload = json.dumps({"signature": signature, "config": merged})
+        if json.loads(payload)["config"] != merged:
+            return
+    except (TypeError, ValueError):
+        return
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(payload)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
 def load_config() -> dict:
     """
     Load merged config: module configs under config['modules'][module_id] -> root config.yaml -> config.user.yaml.
     Module configs are discovered from modules/ (each subdir with config.yaml or MODULE.yaml) and merged into
     config['modules'][module_id]. Root and user can override via top-level or modules.<id>.
     For backward compatibility, audio/stt/tts from modules.speech are also merged to top level.
+    The result is cached until one of the source files changes; each call returns its own copy.
+    Across processes, the merged result is reused from .config.merged.json next to the root config.
     """
+    global _config_cache
     config_path = os.environ.get("TALKIE_CONFIG", str(_CONFIG_ROOT / "config.yaml"))
     root_path = Path(config_path)
     config_dir = root_path.parent
+    user_path = config_dir / "config.user.yaml"
+    module_configs = _get_module_configs_by_id()
+    # One stat per file: the signatures also say whether root and user configs exist.
+    root_sig = _file_signature(root_path)
+    user_sig = _file_signature(user_path)
+    if root_sig[1] is None:
+        raise FileNotFoundError(f"Config not found: {root_path}")
+    signature = (
+        tuple((module_id, _file_signature(p)) for module_id, p in module_configs),
+        root_sig,
+        user_sig,
+    )
+    cached = _config_cache
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+    sidecar_path = config_dir / _SIDECAR_NAME
+    sidecar_signature = json.loads(json.dumps(signature))
+    from_sidecar = _read_sidecar(sidecar_path, sidecar_signature)
+    if from_sidecar is not None:
+        _config_cache = (signature, from_sidecar)
+        return copy.deepcopy(from_sidecar)
 
     merged = {}
-    for module_id, mod_path in _get_module_configs_by_id():
+    for module_id, mod_path in module_configs:
         data = _load_yaml(mod_path)
         if data:
             merged.setdefault("modules", {})[module_id] = _deep_merge(
                 merged.get("modules", {}).get(module_id, {}), data
             )
 
-    if root_path.exists():
-        root_data = _load_yaml(root_path)
-        if root_data:
-            merged = _deep_merge(merged, root_data)
-    else:
-        raise FileNotFoundError(f"Config not found: {root_path}")
+    root_data = _load_yaml(root_path)
+    if root_data:
+        merged = _deep_merge(merged, root_data)
 
-    user_path = config_dir / "config.user.yaml"
-    if user_path.exists():
+    if user_sig[1] is not None:
         user_data = _load_yaml(user_path)
         if user_data:
             merged = _deep_merge(merged, user_data)
@@ -111,7 +189,9 @@ def load_config() -> dict:
             if key in speech_cfg:
                 merged[key] = _deep_merge(merged.get(key, {}), speech_cfg[key])
 
-    return merged
+    _config_cache = (signature, merged)
+    _write_sidecar(sidecar_path, sidecar_signature, merged)
+    return copy.deepcopy(merged)
 
 
 def resolve_internal_service_url(url: str, consul_config: dict) -> str:
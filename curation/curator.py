@@ -7,27 +7,26 @@ prioritized in the language profile and can be used for fine-tuning.
 from __future__ import annotations
 
 import logging
-import re
 from collections import defaultdict
 from persistence.history_repo import HistoryRepo
 
 logger = logging.getLogger(__name__)
 
+# Trailing characters dropped from pattern keys.
+_TRAILING_PUNCT = ".,!?;:"
+
 
 # Normalize text for grouping similar phrases: lowercase, collapse whitespace, strip
 def _normalize_phrase(text: str) -> str:
     if not text or not isinstance(text, str):
         return ""
-    t = text.strip().lower()
-    t = re.sub(r"\s+", " ", t)
-    return t
+    # str.split() drops leading/trailing whitespace and splits on the same characters as \s+.
+    return " ".join(text.lower().split())
 
 
 def _normalize_for_pattern(s: str) -> str:
     """Stricter normalization for pattern key: remove trailing punctuation for grouping."""
-    t = _normalize_phrase(s)
-    t = re.sub(r"[.,!?;:]+$", "", t)
-    return t
+    return _normalize_phrase(s).rstrip(_TRAILING_PUNCT)
 
 
 class CuratorConfig:
@@ -75,22 +74,25 @@ def run_curation(
     # Use the text we care about for the profile: corrected_response when present, else llm_response; and original_transcription
     response_key_count: dict[str, int] = defaultdict(int)
     transcription_key_count: dict[str, int] = defaultdict(int)
+    # (row, original transcription, response key, transcription key): normalized once, reused for weights
+    normalized: list[tuple[dict, str, str, str]] = []
     for r in rows:
         resp = (r.get("corrected_response") or r.get("llm_response") or "").strip()
-        if resp:
-            response_key_count[_normalize_for_pattern(resp)] += 1
         orig = (r.get("original_transcription") or "").strip()
+        resp_key = _normalize_for_pattern(resp)
+        trans_key = _normalize_for_pattern(orig)
+        if resp:
+            response_key_count[resp_key] += 1
         if orig:
-            transcription_key_count[_normalize_for_pattern(orig)] += 1
+            transcription_key_count[trans_key] += 1
+        normalized.append((r, orig, resp_key, trans_key))
 
     # Assign weight per interaction: base 1.0, bump for corrections, bump for recurring phrases
     weight_updates: list[tuple[int, float]] = []
     to_exclude: list[int] = []
 
-    for r in rows:
+    for r, orig, resp_key, trans_key in normalized:
         iid = r["id"]
-        orig = (r.get("original_transcription") or "").strip()
-        resp = (r.get("corrected_response") or r.get("llm_response") or "").strip()
 
         if cfg.exclude_empty_transcription and not orig:
             to_exclude.append(iid)
@@ -99,8 +101,6 @@ def run_curation(
         weight = 1.0
         if r.get("corrected_response"):
             weight += cfg.correction_weight_bump
-        resp_key = _normalize_for_pattern(resp)
-        trans_key = _normalize_for_pattern(orig)
         count_resp = response_key_count.get(resp_key, 0)
         count_trans = transcription_key_count.get(trans_key, 0)
         weight += (count_resp - 1) * cfg.pattern_count_weight_scale
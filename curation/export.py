@@ -13,8 +13,16 @@ from llm.prompts import DEFAULT_EXPORT_INSTRUCTION
 from persistence.database import get_connection, init_database
 from persistence.history_repo import HistoryRepo
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Encoded JSONL lines are written to the file in blocks of about this size.
+WRITE_BLOCK_BYTES = 1 << 16
+
 
 # Format expected by many instruction-tuning tools: instruction, input, output
 def _row_to_instruction_json(
@@ -32,6 +40,14 @@ def _row_to_instruction_json(
     }
 
 
+def _encode_line(rec: dict) -> bytes:
+    """One compact UTF-8 JSON line; orjson when installed, same output from stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(rec, option=orjson.OPT_APPEND_NEWLINE)
+    line = json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+    return line.encode("utf-8")
+
+
 def export_for_finetuning(
     db_path: str,
     out_path: str,
@@ -51,27 +67,14 @@ def export_for_finetuning(
         return get_connection(db_path)
 
     repo = HistoryRepo(connector)
-    rows = repo.list_for_curation(limit=limit)
-
-    # Prefer higher weight and corrected; sort so best examples first
-    def sort_key(r: dict) -> tuple:
-        w = r.get("weight") or 0
-        has_corr = 1 if (r.get("corrected_response") or "").strip() else 0
-        return (-has_corr, -w, r.get("created_at") or "")
-
-    rows.sort(key=sort_key)
-    if min_weight is not None:
-        rows = [r for r in rows if (r.get("weight") or 0) >= min_weight]
+    # Best examples first (corrected, then higher weight); ordered and filtered in SQL.
+    rows = repo.list_for_export(limit=limit, min_weight=min_weight)
     system_base = system_instruction or DEFAULT_EXPORT_INSTRUCTION
     written = 0
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
-    with open(out_path, "w") as f:
+    with open(out_path, "wb") as f:
+        buf = bytearray()
         for r in rows:
-            out_text = (
-                r.get("corrected_response") or r.get("llm_response") or ""
-            ).strip()
-            if not out_text:
-                continue
             rec = _row_to_instruction_json(
                 r.get("original_transcription") or "",
                 r.get("llm_response") or "",
@@ -80,7 +83,12 @@ def export_for_finetuning(
             )
             if not rec["output"]:
                 continue
-            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            buf += _encode_line(rec)
             written += 1
+            if len(buf) >= WRITE_BLOCK_BYTES:
+                f.write(buf)
+                buf.clear()
+        if buf:
+            f.write(buf)
     logger.info("Exported %d records to %s", written, out_path)
     return written
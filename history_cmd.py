@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """
-CLI for interaction history: clear, list (numbered), view #, edit #.
-Usage: pipenv run python history_cmd.py clear | list | view <N> | edit <N>
+CLI for interaction history: clear, list (numbered), view #, edit #, replay [N].
+Usage: pipenv run python history_cmd.py clear | list | view <N> | edit <N> | replay [N]
 Uses TALKIE_CONFIG or config.yaml for db_path. List is newest-first (1 = most recent).
+replay re-runs regeneration on the N newest transcriptions with the current model and prompts.
 """
 
 from __future__ import annotations
@@ -12,26 +13,39 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Project root on path
 _ROOT = Path(__file__).resolve().parent
 if str(_ROOT) not in sys.path:
     sys.path.insert(0, str(_ROOT))
 
-from config import load_config  # noqa: E402
-from persistence.database import get_connection, init_database  # noqa: E402
+from config import load_config, resolve_internal_service_url  # noqa: E402
+from persistence.database import get_shared_connector, init_database  # noqa: E402
 from persistence.history_repo import HistoryRepo  # noqa: E402
 
+if TYPE_CHECKING:
+    from llm.client import OllamaClient
+
 LIST_DEFAULT_LIMIT = 2000
 LIST_PREVIEW_LEN = 60
+# cmd_list writes this many rows per stdout write.
+LIST_WRITE_ROWS = 100
+REPLAY_DEFAULT_LIMIT = 10
+# cmd_replay packs this many transcriptions into one LLM request.
+REPLAY_BATCH_SIZE = 8
 
 
-def _resolve_db_path() -> Path:
+def _load_config_or_exit() -> dict:
     try:
-        raw = load_config()
+        return load_config()
     except FileNotFoundError as e:
         print(e, file=sys.stderr)
         sys.exit(1)
+
+
+def _resolve_db_path() -> Path:
+    raw = _load_config_or_exit()
     db_path = Path(raw.get("persistence", {}).get("db_path", "data/talkie-core.db"))
     if not db_path.is_absolute():
         db_path = Path.cwd() / db_path
@@ -41,42 +55,55 @@ def _resolve_db_path() -> Path:
 def _repo(db_path: Path) -> HistoryRepo:
     db_path.parent.mkdir(parents=True, exist_ok=True)
     init_database(str(db_path))
-
-    def conn_factory():
-        return get_connection(str(db_path))
-
-    return HistoryRepo(conn_factory)
+    # One connection for the whole command (view + edit make several calls).
+    connector = get_shared_connector(str(db_path))
+    conn = connector()
+    # WAL makes NORMAL safe against crashes; only the last commit can be lost on power failure.
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return HistoryRepo(connector)
 
 
 def _item_at_index(repo: HistoryRepo, one_based_index: int) -> tuple[dict, int] | None:
     """Return (InteractionRecord, db_id) for 1-based index, or None if out of range."""
     if one_based_index < 1:
         return None
-    limit = max(one_based_index, 1)
-    items = repo.list_recent(limit=limit)
-    if one_based_index > len(items):
+    rec = repo.get_by_recent_index(one_based_index - 1)
+    if rec is None:
         return None
-    rec = items[one_based_index - 1]
     return (rec, rec["id"])
 
 
+def _run_editor(editor: str, path: str) -> None:
+    """Run editor on path and wait; raises CalledProcessError on a non-zero exit like subprocess.run(check=True)."""
+    if not hasattr(os, "posix_spawnp"):
+        subprocess.run([editor, path], check=True)
+        return
+    # posix_spawn skips Popen's fork/exec error pipe and child-side setup.
+    pid = os.posix_spawnp(editor, [editor, path], os.environ)
+    _, status = os.waitpid(pid, 0)
+    code = os.waitstatus_to_exitcode(status)
+    if code != 0:
+        raise subprocess.CalledProcessError(code, [editor, path])
+
+
 def cmd_clear(repo: HistoryRepo) -> None:
     n = repo.delete_all()
     print(f"Cleared {n} interaction(s).")
 
 
 def cmd_list(repo: HistoryRepo, limit: int = LIST_DEFAULT_LIMIT) -> None:
-    items = repo.list_recent(limit=limit)
-    for i, r in enumerate(items, start=1):
-        created = (r.get("created_at") or "")[:19]
-        orig = (r.get("original_transcription") or "").strip()
-        resp = (r.get("llm_response") or "").strip()
-        if len(orig) > LIST_PREVIEW_LEN:
-            orig = orig[: LIST_PREVIEW_LEN - 1] + "\u2026"
-        if len(resp) > LIST_PREVIEW_LEN:
-            resp = resp[: LIST_PREVIEW_LEN - 1] + "\u2026"
-        print(f"{i:5}  {created}  {orig}")
-        print(f"       {resp}")
+    # Rows are written in blocks as the cursor yields them: output starts at once,
+    # without two print() calls per row.
+    previews = repo.iter_recent_previews(limit=limit, preview_len=LIST_PREVIEW_LEN)
+    block: list[str] = []
+    for i, (_id, created, orig, resp) in enumerate(previews, start=1):
+        block.append(f"{i:5}  {created}  {orig}\n       {resp}\n")
+        if len(block) >= LIST_WRITE_ROWS:
+            sys.stdout.write("".join(block))
+            block.clear()
+    if block:
+        sys.stdout.write("".join(block))
 
 
 def cmd_view(repo: HistoryRepo, one_based_index: int) -> None:
@@ -101,28 +128,78 @@ def cmd_edit(repo: HistoryRepo, one_based_index: int) -> None:
     rec, interaction_id = out
     current = (rec.get("corrected_response") or rec.get("llm_response") or "").strip()
     editor = os.environ.get("EDITOR", "vi")
-    with tempfile.NamedTemporaryFile(
-        mode="w", suffix=".txt", delete=False, encoding="utf-8"
-    ) as f:
-        f.write(current)
-        tmp_path = f.name
-    try:
-        subprocess.run([editor, tmp_path], check=True)
-        with open(tmp_path, encoding="utf-8") as f:
-            new_content = f.read().strip()
-        repo.update_correction(interaction_id, new_content)
-        print(f"Updated correction for interaction id={interaction_id}.")
-    finally:
-        try:
-            os.unlink(tmp_path)
-        except OSError:
-            pass
+    # The directory (and the file in it) is removed on exit, whatever the editor did.
+    with tempfile.TemporaryDirectory(prefix="talkie-edit-") as tmp_dir:
+        tmp_path = Path(tmp_dir) / "edit.txt"
+        tmp_path.write_text(current, encoding="utf-8")
+        _run_editor(editor, str(tmp_path))
+        new_content = tmp_path.read_text(encoding="utf-8").strip()
+    if new_content == current:
+        # Editor closed without changes: no UPDATE, no write lock.
+        print("No changes.")
+        return
+    repo.update_correction(interaction_id, new_content)
+    print(f"Updated correction for interaction id={interaction_id}.")
+
+
+def _llm_client(raw: dict) -> OllamaClient:
+    """OllamaClient for the configured base URL (resolved via Consul if needed) and model."""
+    from llm.client import OllamaClient
+
+    ollama = raw.get("ollama") or {}
+    consul = (raw.get("infrastructure") or {}).get("consul") or {}
+    return OllamaClient(
+        base_url=resolve_internal_service_url(
+            ollama.get("base_url", "http://localhost:11434"), consul
+        ),
+        model_name=str(ollama.get("model_name", "mistral")).strip(),
+        timeout_sec=float(ollama.get("timeout_sec", 45)),
+        options=ollama.get("options"),
+    )
+
+
+def cmd_replay(
+    repo: HistoryRepo,
+    client: OllamaClient,
+    llm_cfg: dict,
+    limit: int = REPLAY_DEFAULT_LIMIT,
+) -> None:
+    """
+    Regenerate the newest `limit` transcriptions, REPLAY_BATCH_SIZE per LLM request,
+    and print each next to the stored response. Nothing is written to history.
+    """
+    from llm.prompts import (
+        build_batched_regeneration_prompts,
+        parse_batched_regeneration_response,
+    )
+
+    records = repo.list_recent(limit=limit)
+    request_certainty = bool(llm_cfg.get("regeneration_request_certainty", True))
+    for start in range(0, len(records), REPLAY_BATCH_SIZE):
+        batch = records[start : start + REPLAY_BATCH_SIZE]
+        system, user = build_batched_regeneration_prompts(
+            [r["original_transcription"] or "" for r in batch],
+            system_prompt=llm_cfg.get("system_prompt")
+            or llm_cfg.get("regeneration_system_prompt"),
+            user_prompt_template=llm_cfg.get("regeneration_user_prompt_template"),
+            request_certainty=request_certainty,
+        )
+        results = parse_batched_regeneration_response(
+            client.generate(user, system), len(batch)
+        )
+        for i, (rec, (sentence, certainty)) in enumerate(
+            zip(batch, results), start=start + 1
+        ):
+            suffix = f" ({certainty}%)" if certainty is not None else ""
+            print(f"{i:5}  {rec['original_transcription'] or ''}")
+            print(f"       was: {rec['llm_response'] or ''}")
+            print(f"       now: {sentence or '(no reply)'}{suffix}")
 
 
 def main() -> None:
     if len(sys.argv) < 2:
         print(
-            "Usage: history_cmd.py clear | list | view <N> | edit <N>",
+            "Usage: history_cmd.py clear | list | view <N> | edit <N> | replay [N]",
             file=sys.stderr,
         )
         sys.exit(1)
@@ -158,9 +235,20 @@ def main() -> None:
             sys.exit(1)
         cmd_edit(repo, n)
         return
+    if subcommand == "replay":
+        limit = REPLAY_DEFAULT_LIMIT
+        if len(sys.argv) >= 3:
+            try:
+                limit = int(sys.argv[2])
+            except ValueError:
+                print("N must be an integer.", file=sys.stderr)
+                sys.exit(1)
+        raw = _load_config_or_exit()
+        cmd_replay(repo, _llm_client(raw), raw.get("llm") or {}, limit)
+        return
 
     print(
-        f"Unknown subcommand: {subcommand}. Use clear, list, view, or edit.",
+        f"Unknown subcommand: {subcommand}. Use clear, list, view, edit, or replay.",
         file=sys.stderr,
     )
     sys.exit(1)
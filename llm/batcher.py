@@ -0,0 +1,188 @@
+"""
+Shared request queue in front of Ollama /api/generate.
+Requests from every pipeline in the process go through one dispatcher per Ollama base URL:
+a lone request is sent at once, a burst is gathered within a short window, and at most
+max_batch requests run concurrently, so Ollama can serve them together (set OLLAMA_NUM_PARALLEL >= max_batch).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator
+
+from llm.client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_WINDOW_MS = 5.0
+DEFAULT_MAX_BATCH = 4
+
+
+class RequestBatcher:
+    """
+    Queue of pending LLM calls drained by one dispatcher thread.
+    submit() returns a Future. A request that arrives while the queue is otherwise empty is
+    dispatched at once; when others are already waiting, the dispatcher gathers up to max_batch
+    of them within batch_window_ms. At most max_batch calls (and streams, see slot()) run at once.
+    close() stops the dispatcher and the worker threads.
+    """
+
+    def __init__(
+        self,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self.batch_window_ms = max(0.0, batch_window_ms)
+        self.max_batch = max(1, int(max_batch))
+        self._window_sec = self.batch_window_ms / 1000.0
+        self._queue: queue.Queue[tuple[Callable[[], str], Future] | None] = (
+            queue.Queue()
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_batch, thread_name_prefix="talkie-core-llm-batch"
+        )
+        self._slots = threading.Semaphore(self.max_batch)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._dispatch_loop, daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, call: Callable[[], str]) -> Future:
+        """Queue a zero-argument call (e.g. a bound generate); returns a Future with its result."""
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("RequestBatcher is closed")
+            self._queue.put((call, future))
+        return future
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the max_batch in-flight slots, e.g. for the life of a streamed reply."""
+        self._slots.acquire()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Run what is already queued, then stop the dispatcher and shut down the workers."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, call: Callable[[], str], future: Future) -> None:
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(call())
+        except Exception as e:
+            future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Alone in the queue: nothing to gather, so do not wait out the window.
+            if batch[-1] is not None and not self._queue.empty():
+                deadline = time.monotonic() + self._window_sec
+                while batch[-1] is not None and len(batch) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        if remaining > 0:
+                            batch.append(self._queue.get(timeout=remaining))
+                        else:
+                            batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+            stop = batch[-1] is None
+            pending = [item for item in batch if item is not None]
+            if len(pending) > 1:
+                logger.debug("LLM batcher: dispatching %d requests", len(pending))
+            for call, future in pending:
+                # Bound in-flight requests to max_batch across all callers.
+                self._slots.acquire()
+                self._executor.submit(self._run, call, future)
+            if stop:
+                return
+
+
+_batchers: dict[str, RequestBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_shared_batcher(
+    base_url: str,
+    batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+    max_batch: int = DEFAULT_MAX_BATCH,
+) -> RequestBatcher:
+    """
+    Return the process-wide batcher for this Ollama base URL, creating it on first use
+    (or after it was closed). Raises ValueError if the live batcher for the URL was
+    created with a different batch_window_ms or max_batch.
+    """
+    key = base_url.rstrip("/")
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None or batcher.closed:
+            batcher = RequestBatcher(
+                batch_window_ms=batch_window_ms, max_batch=max_batch
+            )
+            _batchers[key] = batcher
+        elif (batcher.batch_window_ms, batcher.max_batch) != (
+            max(0.0, batch_window_ms),
+            max(1, int(max_batch)),
+        ):
+            raise ValueError(
+                f"Shared LLM batcher for {key} already uses batch_window_ms="
+                f"{batcher.batch_window_ms}, max_batch={batcher.max_batch}; "
+                f"got batch_window_ms={batch_window_ms}, max_batch={max_batch}"
+            )
+        return batcher
+
+
+class BatchedOllamaClient(OllamaClient):
+    """
+    OllamaClient whose generate() goes through the shared RequestBatcher for its base URL.
+    Drop-in for the pipeline: same interface, same fallback behaviour.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        batch_window_ms: float = DEFAULT_BATCH_WINDOW_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._batcher = get_shared_batcher(
+            self.base_url, batch_window_ms=batch_window_ms, max_batch=max_batch
+        )
+
+    def generate(self, prompt: str, system: str | None = None) -> str:
+        call = functools.partial(OllamaClient.generate, self, prompt, system)
+        return self._batcher.submit(call).result()
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[str]:
+        """Like OllamaClient.generate_stream, holding a batcher slot until the stream ends."""
+        with self._batcher.slot():
+            yield from super().generate_stream(prompt, system, cancel)
@@ -6,13 +6,33 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
 import time
-from typing import Any
+from typing import Any, Iterator
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Parser for /api/generate bodies and stream lines (bytes in); orjson when installed.
+if orjson is not None:
+
+    def _loads(data: str | bytes) -> object:
+        """orjson.loads, retried with json.loads for input only json accepts (NaN, Infinity)."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+else:
+    _loads = json.loads
+
 FALLBACK_MESSAGE = (
     "I'm sorry, I couldn't generate a response right now. Please try again."
 )
@@ -22,6 +42,12 @@ MEMORY_ERROR_MESSAGE = "The model needs more memory than is available. Try a sma
 # Default generation options: enough length for full sentences, lower temperature for instruction-following.
 DEFAULT_OPTIONS: dict[str, Any] = {"num_predict": 256, "temperature": 0.4}
 
+# How long one /api/tags listing answers check_connection, check_model_available and model resolution.
+TAGS_CACHE_TTL_SEC = 30.0
+
+# Kept-alive connections per client: generate, speculative/regeneration calls and batched requests overlap.
+POOL_MAXSIZE = 4
+
 
 class OllamaClient:
     """
@@ -39,6 +65,8 @@ class OllamaClient:
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.model_name = model_name
+        # Name without tag (mistral:7b -> mistral), for matching /api/tags entries.
+        self._model_base = model_name.partition(":")[0]
         self.timeout_sec = timeout_sec
         self.max_retries = max_retries
         self._options: dict[str, Any] = {**DEFAULT_OPTIONS}
@@ -48,35 +76,65 @@ class OllamaClient:
         self._resolved_model: str | None = (
             None  # full tag from /api/tags, e.g. mistral:latest
         )
+        # (model names from the last successful /api/tags, time.monotonic() when fetched)
+        self._tags_cache: tuple[tuple[str, ...], float] | None = None
+        # Session for connection pooling: calls and retries reuse warm sockets.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self._session.close()
 
     def set_debug_log(self, callback: object) -> None:
         """Optional: set a callable(str) to log debug lines (e.g. HTTP request/response)."""
         self._debug_log = callback
 
-    def _debug(self, msg: str) -> None:
+    def _debug(self, msg: str, *args: object) -> None:
+        """Send msg % args to the debug log; the line is only built when a callback is set."""
         if callable(self._debug_log):
-            self._debug_log(msg)
-
-    def check_connection(self, timeout_sec: float = 5.0) -> bool:
-        """Return True if Ollama is reachable (e.g. GET /api/tags)."""
-        try:
-            r = requests.get(f"{self.base_url}/api/tags", timeout=timeout_sec)
-            return r.status_code == 200
-        except requests.RequestException:
-            return False
+            self._debug_log(msg % args if args else msg)
 
-    def check_model_available(self, timeout_sec: float = 5.0) -> bool:
-        """Return True if the configured model is available (from /api/tags)."""
+    def _fetch_tags(
+        self, timeout_sec: float = 5.0, ttl: float = TAGS_CACHE_TTL_SEC
+    ) -> tuple[str, ...] | None:
+        """
+        Return model names from GET /api/tags, reusing a listing younger than ttl seconds.
+        None if Ollama is unreachable or answers with a non-200 status (never cached).
+        """
+        cached = self._tags_cache
+        if cached is not None and time.monotonic() - cached[1] < ttl:
+            return cached[0]
         try:
-            r = requests.get(f"{self.base_url}/api/tags", timeout=timeout_sec)
+            r = self._session.get(f"{self.base_url}/api/tags", timeout=timeout_sec)
             if r.status_code != 200:
-                return False
+                return None
             data = r.json()
-            models = data.get("models") or []
-            names = {m.get("name", "").split(":")[0] for m in models if m.get("name")}
-            return self.model_name.split(":")[0] in names
         except requests.RequestException:
+            return None
+        models = (data.get("models") if isinstance(data, dict) else None) or []
+        names = tuple(m["name"] for m in models if m.get("name"))
+        self._tags_cache = (names, time.monotonic())
+        return names
+
+    def check_connection(self, timeout_sec: float = 5.0) -> bool:
+        """Return True if Ollama is reachable (e.g. GET /api/tags)."""
+        return self._fetch_tags(timeout_sec) is not None
+
+    def check_model_available(self, timeout_sec: float = 5.0) -> bool:
+        """
+        Return True if the configured model is available (from /api/tags).
+        A miss drops the cached listing, so the next check sees a model pulled in the meantime.
+        """
+        names = self._fetch_tags(timeout_sec)
+        if names is None:
             return False
+        if any(n.partition(":")[0] == self._model_base for n in names):
+            return True
+        self._tags_cache = None
+        return False
 
     def _get_model_for_api(self) -> str:
         """
@@ -85,21 +143,15 @@ class OllamaClient:
         """
         if self._resolved_model is not None:
             return self._resolved_model
-        try:
-            r = requests.get(f"{self.base_url}/api/tags", timeout=5.0)
-            if r.status_code != 200:
-                return self.model_name
-            data = r.json()
-            models = data.get("models") or []
-            base = self.model_name.split(":")[0]
-            for m in models:
-                name = m.get("name") or ""
-                if name == self.model_name or name.startswith(base + ":"):
-                    self._resolved_model = name
-                    return name
-            return self.model_name
-        except requests.RequestException:
+        names = self._fetch_tags()
+        if names is None:
             return self.model_name
+        prefix = self._model_base + ":"
+        for name in names:
+            if name == self.model_name or name.startswith(prefix):
+                self._resolved_model = name
+                return name
+        return self.model_name
 
     def generate(self, prompt: str, system: str | None = None) -> str:
         """
@@ -117,45 +169,45 @@ class OllamaClient:
         if system:
             payload["system"] = system
 
-        self._debug(f"Ollama POST {url} model={model_for_api}")
+        self._debug("Ollama POST %s model=%s", url, model_for_api)
 
         for attempt in range(self.max_retries + 1):
             start = time.perf_counter()
             try:
-                r = requests.post(url, json=payload, timeout=self.timeout_sec)
+                r = self._session.post(url, json=payload, timeout=self.timeout_sec)
                 elapsed = time.perf_counter() - start
-                self._debug(f"Ollama HTTP {r.status_code} ({elapsed:.2f}s)")
+                self._debug("Ollama HTTP %s (%.2fs)", r.status_code, elapsed)
                 r.raise_for_status()
-                data = r.json()
+                data = _loads(r.content)
                 reply = data.get("response")
                 if isinstance(reply, str) and reply.strip():
-                    self._debug("Ollama response OK (%d chars)" % len(reply.strip()))
+                    self._debug("Ollama response OK (%d chars)", len(reply.strip()))
                     return reply.strip()
                 self._debug("Ollama response empty or invalid; returning fallback")
                 return FALLBACK_MESSAGE
-            except requests.RequestException as e:
+            except (requests.RequestException, ValueError) as e:
+                # ValueError: a 200 whose body is not JSON is retried like a failed request.
                 elapsed = time.perf_counter() - start
                 if (
                     hasattr(e, "response")
                     and e.response is not None
                     and e.response.status_code == 500
                 ):
-                    try:
-                        body = e.response.text
-                        if body:
-                            logger.warning("Ollama 500 response body: %s", body[:500])
-                            self._debug(f"Ollama 500 body: {body[:200]}...")
-                            try:
-                                data = json.loads(body)
-                                err = (data.get("error") or "").lower()
-                                if "memory" in err or "system memory" in err:
-                                    return MEMORY_ERROR_MESSAGE
-                            except (json.JSONDecodeError, TypeError):
-                                pass
-                    except Exception:
-                        pass
+                    body = e.response.content or b""
+                    if body:
+                        preview = body[:500].decode("utf-8", "replace")
+                        logger.warning("Ollama 500 response body: %s", preview)
+                        self._debug("Ollama 500 body: %s...", preview[:200])
+                    # Only parse bodies that can be a memory error.
+                    if b"memory" in body.lower():
+                        try:
+                            err = str(_loads(body).get("error") or "").lower()
+                        except (ValueError, AttributeError):
+                            err = ""
+                        if "memory" in err:
+                            return MEMORY_ERROR_MESSAGE
                 self._debug(
-                    f"Ollama error (attempt {attempt + 1}) after {elapsed:.2f}s: {e}"
+                    "Ollama error (attempt %d) after %.2fs: %s", attempt + 1, elapsed, e
                 )
                 logger.warning(
                     "Ollama request attempt %d failed after %.2fs: %s",
@@ -171,8 +223,73 @@ class OllamaClient:
                     return FALLBACK_MESSAGE
             except Exception as e:
                 elapsed = time.perf_counter() - start
-                self._debug("Ollama error after %.2fs: %s" % (elapsed, e))
+                self._debug("Ollama error after %.2fs: %s", elapsed, e)
                 logger.exception("Ollama generate error after %.2fs: %s", elapsed, e)
                 return FALLBACK_MESSAGE
         self._debug("Ollama returning fallback (no successful attempt)")
         return FALLBACK_MESSAGE
+
+    def generate_stream(
+        self,
+        prompt: str,
+        system: str | None = None,
+        cancel: threading.Event | None = None,
+    ) -> Iterator[str]:
+        """
+        Like generate() but with "stream": true: yield reply fragments as Ollama decodes them.
+        No retries (fragments may already have been consumed). An error before the first
+        fragment is logged and the stream is empty, so the caller should use FALLBACK_MESSAGE;
+        an error after fragments were yielded is logged and re-raised, so a partial reply
+        is never mistaken for a complete one.
+        When cancel is set the stream stops and the connection is closed, which aborts generation in Ollama.
+        """
+        if cancel is not None and cancel.is_set():
+            return
+        url = f"{self.base_url}/api/generate"
+        model_for_api = self._get_model_for_api()
+        payload: dict[str, Any] = {
+            "model": model_for_api,
+            "prompt": prompt,
+            "stream": True,
+            "options": self._options,
+        }
+        if system:
+            payload["system"] = system
+
+        self._debug("Ollama POST %s model=%s (stream)", url, model_for_api)
+        start = time.perf_counter()
+        chars = 0
+        try:
+            with self._session.post(
+                url, json=payload, timeout=self.timeout_sec, stream=True
+            ) as r:
+                self._debug(
+                    "Ollama HTTP %s (%.2fs to headers)",
+                    r.status_code,
+                    time.perf_counter() - start,
+                )
+                r.raise_for_status()
+                for line in r.iter_lines():
+                    if cancel is not None and cancel.is_set():
+                        self._debug("Ollama stream cancelled; closing connection")
+                        return
+                    if not line:
+                        continue
+                    data = _loads(line)
+                    fragment = data.get("response")
+                    if isinstance(fragment, str) and fragment:
+                        chars += len(fragment)
+                        yield fragment
+                    if data.get("done"):
+                        break
+            self._debug(
+                "Ollama stream done (%d chars, %.2fs)",
+                chars,
+                time.perf_counter() - start,
+            )
+        except (requests.RequestException, ValueError) as e:
+            elapsed = time.perf_counter() - start
+            self._debug("Ollama stream error after %.2fs: %s", elapsed, e)
+            logger.warning("Ollama stream failed after %.2fs: %s", elapsed, e)
+            if chars:
+                raise
@@ -5,8 +5,28 @@ Prompt text is configured in config.yaml under llm; these are fallback defaults.
 
 from __future__ import annotations
 
+import functools
 import json
 import re
+import types
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parser for model JSON replies; orjson when installed. Its JSONDecodeError subclasses json's.
+if orjson is not None:
+
+    def _loads(data: str | bytes) -> object:
+        """orjson.loads, retried with json.loads for input only json accepts (NaN, Infinity)."""
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+else:
+    _loads = json.loads
 
 DEFAULT_SYSTEM_BASE = """You assist a speech-impaired user in conversation. You will receive a partial or fragmented sentence from their speech recognition (e.g. a few words, a phrase, or an incomplete thought). Your job is to turn that into one clear, complete, natural sentence that conveys what they mean. The sentence is the user speaking for themselves: it must always be in first person (e.g. "I want water", "I'm cold", "I need to rest"). It will be shown and spoken to the person they are talking to (e.g. a caregiver or family member), so it should sound like what the user would say in normal conversation—never third person or "the user wants...". Keep it concise. Do not explain or add meta-commentary; output only the completed first-person sentence. Output only the single completed sentence, no preamble or suffix."""
 
@@ -18,6 +38,11 @@ DEFAULT_REGENERATION_SYSTEM = """You complete a speech-impaired user's partial u
 # When requesting certainty, we append this to the system prompt so the model returns JSON.
 REGENERATION_JSON_SUFFIX = """ Output your reply as a single JSON object with exactly two keys: "sentence" (the one sentence as above, or "I didn't catch that." if unintelligible) and "certainty" (0-100). No other text, no markdown."""
 
+# Default regeneration system prompts in both modes, built once so every call sends the same string.
+_REGEN_SYS_PLAIN = DEFAULT_REGENERATION_SYSTEM.strip()
+_REGEN_JSON_SUFFIX_S = "\n\n" + REGENERATION_JSON_SUFFIX.strip()
+_REGEN_SYS_JSON = _REGEN_SYS_PLAIN + _REGEN_JSON_SUFFIX_S
+
 # User prompt must clearly ask to complete the phrase, not describe "raw speech recognition" (which triggers meta-explanations).
 DEFAULT_REGENERATION_USER_TEMPLATE = (
     "Complete this phrase into one sentence the user meant to say: {transcription}"
@@ -26,6 +51,57 @@ DEFAULT_REGENERATION_USER_TEMPLATE = (
 DEFAULT_EXPORT_INSTRUCTION = "You assist a speech-impaired user. Turn their partial speech into one clear, complete sentence in first person (as the user speaking: I want..., I need...). Output only that sentence."
 
 
+@functools.lru_cache(maxsize=16)
+def _stripped_or(text: str | None, default: str) -> str:
+    """(text or "").strip() or default, memoized: callers pass config strings that rarely change."""
+    return (text or "").strip() or default
+
+
+def build_static_system_prefix(
+    profile_context: str | None, system_base: str | None = None
+) -> str:
+    """
+    Stable head of the system prompt: system_base (or the default) plus profile_context.
+    Kept free of per-request content so Ollama's prompt cache can reuse it across calls.
+    """
+    base = _stripped_or(system_base, DEFAULT_SYSTEM_BASE)
+    profile = (profile_context or "").strip()
+    if profile:
+        return base + "\n\n" + profile
+    return base
+
+
+# Fixed text around the per-request sections of the system prompt.
+_CONVERSATION_HEADER = (
+    "Recent conversation (topic context only; do not echo any of it):\n"
+)
+_CONVERSATION_RULE = '\n\nYou must output one NEW sentence for the CURRENT phrase only. Do not output the same or nearly the same sentence as any "Assistant:" or "User:" line above. Use the conversation only to keep topic and pronouns consistent; your reply must be a new formulation from the current phrase in the user message.'
+_RETRIEVED_HEADER = (
+    "Relevant background (from the user's documents/publications when applicable):\n"
+)
+
+
+def build_dynamic_system_suffix(
+    conversation_context: str | None = None, retrieved_context: str | None = None
+) -> str:
+    """
+    Per-request tail of the system prompt: retrieved context, then recent conversation
+    (it changes every turn, so it goes last). Empty string when there is neither.
+    """
+    conversation = (conversation_context or "").strip()
+    retrieved = (retrieved_context or "").strip()
+    # At most two sections: concatenate directly instead of collecting a list to join.
+    recent = (
+        _CONVERSATION_HEADER + conversation + _CONVERSATION_RULE if conversation else ""
+    )
+    if not retrieved:
+        return recent
+    background = _RETRIEVED_HEADER + retrieved
+    if not recent:
+        return background
+    return background + "\n\n" + recent
+
+
 def build_system_prompt(
     profile_context: str | None,
     system_base: str | None = None,
@@ -38,25 +114,39 @@ def build_system_prompt(
     (e.g. from RAG over the user's publications), append it as relevant background.
     If conversation_context is provided (recent user/assistant turns), append it so
     the model can keep its reply in context.
+    Static prefix first, dynamic suffix last, so consecutive prompts share the longest prefix.
     """
-    base = (system_base or "").strip() or DEFAULT_SYSTEM_BASE
-    parts = [base]
-    if profile_context and profile_context.strip():
-        parts.append(profile_context.strip())
-    if conversation_context and conversation_context.strip():
-        parts.append(
-            "Recent conversation (topic context only; do not echo any of it):\n"
-            + conversation_context.strip()
-            + '\n\nYou must output one NEW sentence for the CURRENT phrase only. Do not output the same or nearly the same sentence as any "Assistant:" or "User:" line above. Use the conversation only to keep topic and pronouns consistent; your reply must be a new formulation from the current phrase in the user message.'
-        )
-    if retrieved_context and retrieved_context.strip():
-        parts.append(
-            "Relevant background (from the user's documents/publications when applicable):\n"
-            + retrieved_context.strip()
-        )
-    if len(parts) == 1:
-        return base
-    return "\n\n".join(parts)
+    if not (
+        profile_context or system_base or retrieved_context or conversation_context
+    ):
+        # No config or context: the default base itself, the same object every call.
+        return DEFAULT_SYSTEM_BASE
+    prefix = build_static_system_prefix(profile_context, system_base)
+    suffix = build_dynamic_system_suffix(conversation_context, retrieved_context)
+    if not suffix:
+        return prefix
+    return prefix + "\n\n" + suffix
+
+
+@functools.lru_cache(maxsize=32)
+def _template_parts(template: str) -> tuple[str, str] | None:
+    """(prefix, suffix) around a template's only placeholder, {transcription}; None if it needs str.format."""
+    prefix, sep, suffix = template.partition("{transcription}")
+    rest = prefix + suffix
+    if not sep or "{" in rest or "}" in rest:
+        return None
+    return prefix, suffix
+
+
+def fill_transcription_template(template: str, transcription: str) -> str:
+    """template.format(transcription=transcription), by concatenation for the usual one-placeholder template."""
+    parts = _template_parts(template)
+    if parts is not None:
+        return parts[0] + transcription + parts[1]
+    if "{" not in template and "}" not in template:
+        # No placeholder at all: format would return the template unchanged.
+        return template
+    return template.format(transcription=transcription)
 
 
 def build_user_prompt(
@@ -64,8 +154,27 @@ def build_user_prompt(
     user_prompt_template: str | None = None,
 ) -> str:
     """Build the user prompt from the transcribed (possibly partial) speech."""
-    template = (user_prompt_template or "").strip() or DEFAULT_USER_PROMPT_TEMPLATE
-    return template.format(transcription=transcription.strip())
+    template = _stripped_or(user_prompt_template, DEFAULT_USER_PROMPT_TEMPLATE)
+    return fill_transcription_template(template, transcription.strip())
+
+
+@functools.lru_cache(maxsize=8)
+def regeneration_prompt_parts(
+    system_prompt: str | None = None,
+    user_prompt_template: str | None = None,
+    request_certainty: bool = False,
+) -> tuple[str, str]:
+    """
+    Resolve the static parts of the regeneration prompts once (they depend only on config).
+    Returns (system_prompt, user_prompt_template); the template still contains {transcription}.
+    """
+    system = (system_prompt or "").strip()
+    if not system:
+        system = _REGEN_SYS_JSON if request_certainty else _REGEN_SYS_PLAIN
+    elif request_certainty:
+        system = system + _REGEN_JSON_SUFFIX_S
+    template = _stripped_or(user_prompt_template, DEFAULT_REGENERATION_USER_TEMPLATE)
+    return system, template
 
 
 def build_regeneration_prompts(
@@ -80,25 +189,66 @@ def build_regeneration_prompts(
     If request_certainty is True, appends instruction to output JSON with sentence and certainty (0-100).
     Returns (system_prompt, user_prompt).
     """
-    system = (system_prompt or "").strip() or DEFAULT_REGENERATION_SYSTEM
-    if request_certainty:
-        system = system.rstrip() + "\n\n" + REGENERATION_JSON_SUFFIX.strip()
-    template = (
-        user_prompt_template or ""
-    ).strip() or DEFAULT_REGENERATION_USER_TEMPLATE
-    user = template.format(transcription=transcription.strip())
+    system, template = regeneration_prompt_parts(
+        system_prompt, user_prompt_template, request_certainty
+    )
+    user = fill_transcription_template(template, transcription.strip())
     return system, user
 
 
+# Appended to the regeneration system prompt when several phrases go in one request.
+REGENERATION_BATCH_SUFFIX = """ You will receive several numbered phrases ("[1] ...", "[2] ...", ...). Complete each one independently, as above. Output a single JSON array with one object per phrase, in the same order, each with exactly two keys: "sentence" (the one sentence, or "I didn't catch that." if unintelligible) and "certainty" (0-100). No other text, no markdown."""
+# Same, without certainty: the array holds one sentence string per phrase.
+REGENERATION_BATCH_PLAIN_SUFFIX = """ You will receive several numbered phrases ("[1] ...", "[2] ...", ...). Complete each one independently, as above. Output a single JSON array with one string per phrase, in the same order: the one sentence, or "I didn't catch that." if unintelligible. No other text, no markdown."""
+_REGEN_BATCH_SUFFIX_S = "\n\n" + REGENERATION_BATCH_SUFFIX.strip()
+_REGEN_BATCH_PLAIN_SUFFIX_S = "\n\n" + REGENERATION_BATCH_PLAIN_SUFFIX.strip()
+
+# "[3] I want water." lines when a batched reply is not a JSON array.
+_BATCH_LINE_PATTERN = re.compile(r"^\s*\[(\d+)\]\s*(.+?)\s*$", re.MULTILINE)
+
+
+def build_batched_regeneration_prompts(
+    transcriptions: list[str],
+    system_prompt: str | None = None,
+    user_prompt_template: str | None = None,
+    request_certainty: bool = False,
+) -> tuple[str, str]:
+    """
+    Build one request that regenerates several transcriptions at once: the regeneration
+    system prompt plus instructions for a JSON array reply (with certainty per phrase if
+    request_certainty), and a user prompt with one "[i] ..." line per input, each filled
+    into the regeneration user template. Parse the reply with parse_batched_regeneration_response.
+    """
+    system, template = regeneration_prompt_parts(system_prompt, user_prompt_template)
+    suffix = _REGEN_BATCH_SUFFIX_S if request_certainty else _REGEN_BATCH_PLAIN_SUFFIX_S
+    lines = []
+    for i, t in enumerate(transcriptions, 1):
+        filled = fill_transcription_template(template, t.strip())
+        lines.append(f"[{i}] " + " ".join(filled.splitlines()))
+    return system + suffix, "\n".join(lines)
+
+
 DOCUMENT_QA_SYSTEM_BASE = """Answer the following question using only the provided context from the user's documents. If the context does not contain enough information, say so. Do not make up information. Output only the answer, no preamble."""
+_DOCUMENT_QA_SYSTEM_BASE_S = DOCUMENT_QA_SYSTEM_BASE.strip()
+
+
+def build_document_qa_system_prompt_parts(retrieved_context: str) -> tuple[str, str]:
+    """
+    Document Q&A system prompt as (static_instructions, dynamic_context): the instructions are
+    the same object on every call; the context block is "" when nothing was retrieved.
+    """
+    retrieved = (retrieved_context or "").strip()
+    if not retrieved:
+        return _DOCUMENT_QA_SYSTEM_BASE_S, ""
+    return _DOCUMENT_QA_SYSTEM_BASE_S, "Relevant context:\n" + retrieved
 
 
 def build_document_qa_system_prompt(retrieved_context: str) -> str:
     """Build system prompt for document Q&A: instructions plus retrieved context."""
-    parts = [DOCUMENT_QA_SYSTEM_BASE.strip()]
-    if retrieved_context and retrieved_context.strip():
-        parts.append("Relevant context:\n" + retrieved_context.strip())
-    return "\n\n".join(parts)
+    static, dynamic = build_document_qa_system_prompt_parts(retrieved_context)
+    if not dynamic:
+        return static
+    return static + "\n\n" + dynamic
 
 
 def build_document_qa_user_prompt(question: str) -> str:
@@ -130,13 +280,9 @@ Examples:
 - User said: open example dot com -> {"action": "open_url", "url": "https://example.com"}
 - User said: stop browsing -> {"action": "browse_off"}
 - User said: go back -> {"action": "go_back"}
-- User said: previous page -> {"action": "go_back"}
 - User said: run demo one -> {"action": "demo", "demo_index": 0}
 - User said: store this page -> {"action": "store_page"}
 - User said: click the third link -> {"action": "click_link", "link_index": 3}
-- User said: click 3rd link down -> {"action": "click_link", "link_index": 3}
-- User said: click the first link -> {"action": "click_link", "link_index": 1}
-- User said: click link number 2 -> {"action": "click_link", "link_index": 2}
 - User said: click -> {"action": "click_link"}
 - User said: click trump tariffs today -> {"action": "click_link", "link_text": "trump tariffs today"}
 - User said: click the link that says all about dogs -> {"action": "click_link", "link_text": "all about dogs"}
@@ -145,16 +291,78 @@ Examples:
 - User said: select the link that says weather -> {"action": "select_link", "link_text": "weather"}
 - User said: scroll up -> {"action": "scroll_up"}
 - User said: scroll down -> {"action": "scroll_down"}
-- User said: scroll left -> {"action": "scroll_left"}
-- User said: scroll right -> {"action": "scroll_right"}
-- User said: scroll the page up -> {"action": "scroll_up"}
-- User said: scroll the page down -> {"action": "scroll_down"}
-- User said: close -> {"action": "close_tab"}
 - User said: close tab -> {"action": "close_tab"}
 
 Rule for scroll: "scroll up/down/left/right" (with or without "the page") -> scroll_up, scroll_down, scroll_left, or scroll_right. No other keys needed.
 
 If the phrase is not a browser command (e.g. "I want water"), use {"action": "unknown"}. Output only the JSON object, no markdown or explanation."""
+_BROWSE_INTENT_SYSTEM_S = BROWSE_INTENT_SYSTEM.strip()
+
+
+# "open sir" / "open, sir" / "open sir." at the start of an utterance (STT mishear of "open 1").
+_OPEN_SIR_RE = re.compile(r"^(\s*open)\s*,?\s*sir\.?\s*", re.I)
+# Web-mode "open <target>" forms that select a link by position.
+_SIR_RE = re.compile(r"^sir\.?$", re.I)
+_RESULT_ORDINAL_RE = re.compile(r"result\s+(one|two|three|four|five|\d+)\s*$", re.I)
+_BARE_DIGIT_RE = re.compile(r"^\d+$")
+# Web-mode commands matched whole (lowercased) -> intent action; None keeps "unknown".
+_EXACT_WEB_COMMANDS: dict[str, str | None] = {
+    "no_command": None,
+    "browse on": "browse_on",
+    "browse off": "browse_off",
+    "save page": "store_page",
+    "back": "go_back",
+    "scroll up": "scroll_up",
+    "scroll down": "scroll_down",
+    "close": "close_tab",
+    "close tab": "close_tab",
+}
+# Actions parse_browse_intent accepts from the model's JSON.
+_BROWSE_ACTIONS = frozenset(
+    (
+        "search",
+        "open_url",
+        "demo",
+        "browse_on",
+        "browse_off",
+        "store_page",
+        "click_link",
+        "select_link",
+        "go_back",
+        "scroll_up",
+        "scroll_down",
+        "scroll_left",
+        "scroll_right",
+        "close_tab",
+        "unknown",
+    )
+)
+# Optional intent fields copied from the model's JSON, in output order, with their type.
+_BROWSE_INTENT_FIELDS = (
+    ("query", str),
+    ("url", str),
+    ("demo_index", int),
+    ("demo_name", str),
+    ("link_index", int),
+    ("link_text", str),
+)
+# Fenced ```json ... ``` block around a model's JSON reply.
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```")
+# Spoken link positions; read-only so no caller can change it for everyone else.
+_ORDINALS = types.MappingProxyType(
+    {
+        "one": 1,
+        "two": 2,
+        "three": 3,
+        "four": 4,
+        "five": 5,
+        "six": 6,
+        "seven": 7,
+        "eight": 8,
+        "nine": 9,
+        "ten": 10,
+    }
+)
 
 
 def normalize_browse_utterance(utterance: str) -> str:
@@ -166,7 +374,8 @@ def normalize_browse_utterance(utterance: str) -> str:
         return utterance
     u = utterance.strip()
     # "open sir" / "open, sir" / "open sir." -> "open 1" (STT often hears "open 1" as "open sir")
-    m = re.match(r"^(\s*open)\s*,?\s*sir\.?\s*", u, re.I)
+    # Cheap prefix check first: almost no utterance starts with "open".
+    m = _OPEN_SIR_RE.match(u) if u[:4].lower() == "open" else None
     if m:
         prefix = m.group(1)
         rest = u[m.end() :].strip()
@@ -177,7 +386,7 @@ def normalize_browse_utterance(utterance: str) -> str:
 def build_browse_intent_prompts(utterance: str) -> tuple[str, str]:
     """Build system and user prompts for browse intent extraction. Returns (system_prompt, user_prompt)."""
     user = f"User said: {normalize_browse_utterance(utterance).strip()}"
-    return BROWSE_INTENT_SYSTEM.strip(), user
+    return _BROWSE_INTENT_SYSTEM_S, user
 
 
 def build_web_mode_prompts(
@@ -189,7 +398,7 @@ def build_web_mode_prompts(
     Returns (system_prompt, user_prompt). If system_prompt is None, falls back
     to BROWSE_INTENT_SYSTEM (JSON output).
     """
-    system = (system_prompt or "").strip() or BROWSE_INTENT_SYSTEM.strip()
+    system = _stripped_or(system_prompt, _BROWSE_INTENT_SYSTEM_S)
     user = f"User said: {normalize_browse_utterance(utterance or '').strip()}"
     return system, user
 
@@ -208,28 +417,10 @@ def parse_web_mode_command(raw: str) -> dict:
     if not line:
         return out
     lower = line.lower()
-    if lower == "no_command":
-        return out
-    if lower == "browse on":
-        out["action"] = "browse_on"
-        return out
-    if lower == "browse off":
-        out["action"] = "browse_off"
-        return out
-    if lower == "save page":
-        out["action"] = "store_page"
-        return out
-    if lower == "back":
-        out["action"] = "go_back"
-        return out
-    if lower == "scroll up":
-        out["action"] = "scroll_up"
-        return out
-    if lower == "scroll down":
-        out["action"] = "scroll_down"
-        return out
-    if lower == "close" or lower == "close tab":
-        out["action"] = "close_tab"
+    if lower in _EXACT_WEB_COMMANDS:
+        action = _EXACT_WEB_COMMANDS[lower]
+        if action:
+            out["action"] = action
         return out
     if lower.startswith("search "):
         out["action"] = "search"
@@ -241,126 +432,165 @@ def parse_web_mode_command(raw: str) -> dict:
             out["action"] = "click_link"
             out["link_text"] = target
             # "sir" is a common STT mishear for "1"; treat as link_index 1
-            if re.match(r"^sir\.?$", target, re.I):
+            if _SIR_RE.match(target):
                 out["link_index"] = 1
                 out.pop("link_text", None)
                 return out
             # Optional: "result 3" or "result three" -> link_index
-            result_match = re.match(
-                r"result\s+(one|two|three|four|five|\d+)\s*$", target, re.I
-            )
+            result_match = _RESULT_ORDINAL_RE.match(target)
             if result_match:
                 word = result_match.group(1).lower()
-                ordinals = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5}
-                if word in ordinals:
-                    out["link_index"] = ordinals[word]
+                index = _ORDINALS.get(word)
+                if index is not None:
+                    out["link_index"] = index
                     out.pop("link_text", None)
                 elif word.isdigit():
                     out["link_index"] = int(word)
                     out.pop("link_text", None)
             # Bare digit or "one"/"two"/... -> link_index
-            elif re.match(r"^\d+$", target):
+            elif _BARE_DIGIT_RE.match(target):
                 out["link_index"] = int(target)
                 out.pop("link_text", None)
-            else:
-                ordinals = {
-                    "one": 1,
-                    "two": 2,
-                    "three": 3,
-                    "four": 4,
-                    "five": 5,
-                    "six": 6,
-                    "seven": 7,
-                    "eight": 8,
-                    "nine": 9,
-                    "ten": 10,
-                }
-                if target.lower() in ordinals:
-                    out["link_index"] = ordinals[target.lower()]
-                    out.pop("link_text", None)
+            elif (index := _ORDINALS.get(target.lower())) is not None:
+                out["link_index"] = index
+                out.pop("link_text", None)
         return out
     return out
 
 
+# Replies up to this size are memoized by the parsers below (the same reply is often parsed
+# for display, TTS and logging); longer ones are parsed every time to bound cache memory.
+PARSE_CACHE_MAX_CHARS = 8192
+
+
+def clear_parse_caches() -> None:
+    """Drop memoized parse_browse_intent / parse_regeneration_response results."""
+    _parse_browse_intent_cached.cache_clear()
+    _parse_regeneration_response_cached.cache_clear()
+
+
+def _strip_code_fence(text: str) -> str:
+    """Return the contents of a ```json ... ``` fence in text, or text unchanged when there is none."""
+    # Most replies have no fence: a substring check skips the regex.
+    if "```" not in text:
+        return text
+    code_match = _CODE_BLOCK_RE.search(text)
+    return code_match.group(1).strip() if code_match else text
+
+
+# Browse commands common and unambiguous enough to resolve without asking the model.
+_LOCAL_BROWSE_RE = re.compile(
+    r"^\s*(?:please\s+)?(?:"
+    r"scroll\s+(?:the\s+page\s+)?(?P<scroll>up|down|left|right)"
+    r"|(?P<go_back>go\s+back|previous\s+page)"
+    r"|(?P<browse_off>stop\s+browsing)"
+    r"|(?P<browse_on>start\s+browsing)"
+    r"|(?P<store_page>store\s+(?:this\s+|the\s+)?page|save\s+(?:the\s+)?page)"
+    r"|(?P<click>click)(?:\s+(?:the\s+)?(?P<pos>first|second|third|fourth|fifth|\d+)(?:st|nd|rd|th)?\s+link)?"
+    r")\s*[.!?]*\s*$",
+    re.IGNORECASE,
+)
+_LINK_POSITIONS = types.MappingProxyType(
+    {"first": 1, "second": 2, "third": 3, "fourth": 4, "fifth": 5}
+)
+
+
+def try_local_browse_intent(utterance: str) -> dict | None:
+    """
+    Intent dict (as from parse_browse_intent) for a handful of fixed browse commands:
+    "scroll down", "go back", "stop browsing", "store this page", "click",
+    "click the third link", ... None for anything else, which still needs the LLM.
+    """
+    m = _LOCAL_BROWSE_RE.match(utterance or "")
+    if m is None:
+        return None
+    # The group that closed last names the command; "pos" only when a link position was said.
+    kind = m.lastgroup
+    if kind == "scroll":
+        return {"action": "scroll_" + m.group("scroll").lower()}
+    if kind == "click":
+        return {"action": "click_link"}
+    if kind == "pos":
+        pos = m.group("pos")
+        index = int(pos) if pos.isdecimal() else _LINK_POSITIONS[pos.lower()]
+        return {"action": "click_link", "link_index": index} if index >= 1 else None
+    return {"action": kind}
+
+
 def parse_browse_intent(raw: str) -> dict:
     """
     Parse LLM response for browse intent. Returns dict with at least "action";
     may include "query", "url", "demo_index", "demo_name". action defaults to "unknown" if parse fails.
     """
+    if raw and len(raw) <= PARSE_CACHE_MAX_CHARS:
+        # Callers may modify the intent: hand out a copy of the cached dict.
+        return dict(_parse_browse_intent_cached(raw))
+    return _parse_browse_intent(raw)
+
+
+# Browse replies are short and recur ("scroll down", "go back"): keep more of them.
+@functools.lru_cache(maxsize=256)
+def _parse_browse_intent_cached(raw: str) -> dict:
+    return _parse_browse_intent(raw)
+
+
+def _parse_browse_intent(raw: str) -> dict:
     out: dict = {"action": "unknown"}
     if not raw or not raw.strip():
         return out
-    text = raw.strip()
-    code_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text)
-    if code_match:
-        text = code_match.group(1).strip()
+    text = _strip_code_fence(raw.strip())
+    # Only a JSON object yields an intent: skip the decode (and its exception) for anything else.
+    if text[:1] != "{" or text[-1:] != "}":
+        return out
     try:
-        data = json.loads(text)
+        data = _loads(text)
         if not isinstance(data, dict):
             return out
         action = (data.get("action") or "").strip().lower()
-        if action in (
-            "search",
-            "open_url",
-            "demo",
-            "browse_on",
-            "browse_off",
-            "store_page",
-            "click_link",
-            "select_link",
-            "go_back",
-            "scroll_up",
-            "scroll_down",
-            "scroll_left",
-            "scroll_right",
-            "close_tab",
-            "unknown",
-        ):
+        if action in _BROWSE_ACTIONS:
             out["action"] = action
-        if "query" in data and data["query"] is not None:
-            out["query"] = str(data["query"]).strip()
-        if "url" in data and data["url"] is not None:
-            out["url"] = str(data["url"]).strip()
-        if "demo_index" in data and data["demo_index"] is not None:
-            try:
-                out["demo_index"] = int(data["demo_index"])
-            except (TypeError, ValueError):
-                pass
-        if "demo_name" in data and data["demo_name"] is not None:
-            out["demo_name"] = str(data["demo_name"]).strip()
-        if "link_index" in data and data["link_index"] is not None:
-            try:
-                out["link_index"] = int(data["link_index"])
-            except (TypeError, ValueError):
-                pass
-        if "link_text" in data and data["link_text"] is not None:
-            out["link_text"] = str(data["link_text"]).strip()
+        for key, kind in _BROWSE_INTENT_FIELDS:
+            value = data.get(key)
+            if value is None:
+                continue
+            if kind is int:
+                try:
+                    out[key] = int(value)
+                except (TypeError, ValueError):
+                    pass
+            else:
+                out[key] = str(value).strip()
     except json.JSONDecodeError:
         pass
     return out
 
 
 # Trailing phrases to strip from spoken/display response so certainty is not spoken.
-CERTAINTY_STRIP_PATTERNS = [
-    re.compile(
-        r"\s*[.,;:]?\s*\(?\s*certainty\s*[:\s]?\s*\d+\s*%?\s*\)?\s*$",
-        re.IGNORECASE,
-    ),
-    re.compile(
-        r"\s*[.,;:]?\s*\(?\s*\d+\s*%\s*certainty\s*\)?\s*$",
-        re.IGNORECASE,
-    ),
-]
+CERTAINTY_STRIP_PATTERN = re.compile(
+    r"\s*[.,;:]?\s*\(?\s*(?:certainty\s*[:\s]?\s*\d+\s*%?|\d+\s*%\s*certainty)\s*\)?\s*$",
+    re.IGNORECASE,
+)
 
 
 def strip_certainty_from_response(text: str) -> str:
     """Remove trailing certainty phrases so they are not spoken or shown."""
-    if not text or not text.strip():
+    out = text.strip() if text else ""
+    if not out:
         return text
-    out = text.strip()
-    for pat in CERTAINTY_STRIP_PATTERNS:
-        out = pat.sub("", out).strip()
-    return out.strip() or text.strip()
+    # A match ends the stripped text with a digit, "%", ")" or the "y" of "certainty";
+    # most sentences end otherwise or never mention certainty, so the regex is skipped.
+    last = out[-1]
+    if last not in "%)yY" and not last.isdecimal():
+        return out
+    if "certainty" not in out.lower():
+        return out
+    # Repeat until stable: a reply can end in both forms, e.g. "(85% certainty) Certainty: 85%".
+    # A strip that would leave nothing is not applied.
+    while True:
+        stripped = CERTAINTY_STRIP_PATTERN.sub("", out).strip()
+        if not stripped or stripped == out:
+            return out
+        out = stripped
 
 
 def parse_regeneration_response(raw: str) -> tuple[str, int | None]:
@@ -370,33 +600,91 @@ def parse_regeneration_response(raw: str) -> tuple[str, int | None]:
     When JSON is missing, if raw contains "Sentence: X" (model echoing field name),
     use X as the sentence so we don't speak "I didn't catch that" plus the real sentence.
     """
-    if not raw or not raw.strip():
+    if raw and len(raw) <= PARSE_CACHE_MAX_CHARS:
+        return _parse_regeneration_response_cached(raw)
+    return _parse_regeneration_response(raw)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_regeneration_response_cached(raw: str) -> tuple[str, int | None]:
+    return _parse_regeneration_response(raw)
+
+
+def _parse_regeneration_response(raw: str) -> tuple[str, int | None]:
+    if not raw:
         return ("", None)
-    text = raw.strip()
-    # Strip markdown code block if present
-    code_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", text)
-    if code_match:
-        text = code_match.group(1).strip()
-    try:
-        data = json.loads(text)
-        if not isinstance(data, dict):
-            return (_fallback_sentence_from_raw(raw), None)
-        sentence = data.get("sentence")
-        if sentence is None:
+    data = None
+    # Well-behaved JSON-suffix replies parse as-is: skip the strip and fence work.
+    if raw[0] == "{" and raw[-1] == "}":
+        try:
+            data = _loads(raw)
+        except json.JSONDecodeError:
+            data = None
+    if data is None:
+        text = raw.strip()
+        if not text:
+            return ("", None)
+        text = _strip_code_fence(text)
+        # Only a JSON object carries a sentence; plain-text replies ("I didn't catch that.")
+        # go straight to the fallback without raising a decode error.
+        if text[:1] != "{" or text[-1:] != "}":
             return (_fallback_sentence_from_raw(raw), None)
-        sentence = strip_certainty_from_response(str(sentence).strip() or raw.strip())
-        sentence = _strip_meta_commentary_from_sentence(sentence)
-        certainty = data.get("certainty")
-        if certainty is None:
-            return (sentence, None)
         try:
-            c = int(certainty)
-            c = max(0, min(100, c))
-            return (sentence, c)
-        except (TypeError, ValueError):
-            return (sentence, None)
-    except json.JSONDecodeError:
+            data = _loads(text)
+        except json.JSONDecodeError:
+            return (_fallback_sentence_from_raw(raw), None)
+    return _regeneration_from_data(data, raw)
+
+
+def _regeneration_from_data(data: object, raw: str) -> tuple[str, int | None]:
+    """(sentence, certainty) from one decoded reply object; raw is the text to fall back on."""
+    if not isinstance(data, dict):
         return (_fallback_sentence_from_raw(raw), None)
+    sentence = data.get("sentence")
+    if sentence is None:
+        return (_fallback_sentence_from_raw(raw), None)
+    sentence = strip_certainty_from_response(str(sentence).strip() or raw.strip())
+    sentence = _strip_meta_commentary_from_sentence(sentence)
+    certainty = data.get("certainty")
+    if certainty is None:
+        return (sentence, None)
+    try:
+        c = int(certainty)
+        c = max(0, min(100, c))
+        return (sentence, c)
+    except (TypeError, ValueError, OverflowError):
+        return (sentence, None)
+
+
+def parse_batched_regeneration_response(
+    raw: str, n: int
+) -> list[tuple[str, int | None]]:
+    """
+    Parse the reply to build_batched_regeneration_prompts: a JSON array with one
+    {"sentence", "certainty"} object per input. Returns exactly n (sentence, certainty)
+    pairs in input order; ("", None) for inputs the model skipped. Without a JSON array,
+    falls back to "[i] sentence" lines.
+    """
+    out: list[tuple[str, int | None]] = [("", None)] * n
+    text = (raw or "").strip()
+    if not text or n <= 0:
+        return out
+    try:
+        data = _loads(_strip_code_fence(text))
+    except json.JSONDecodeError:
+        data = None
+    if isinstance(data, list):
+        for i, item in enumerate(data[:n]):
+            if isinstance(item, str):
+                out[i] = (_fallback_sentence_from_raw(item), None)
+            else:
+                out[i] = _regeneration_from_data(item, "")
+        return out
+    for m in _BATCH_LINE_PATTERN.finditer(text):
+        i = int(m.group(1)) - 1
+        if 0 <= i < n:
+            out[i] = _parse_regeneration_response(m.group(2))
+    return out
 
 
 # Model sometimes echoes system-prompt rules; strip so we never speak "Never use... Output your reply as: ...".
@@ -431,6 +719,12 @@ _REQUEST_VERB_START = re.compile(
 )
 
 
+# "Sentence: X" echoed in plain text; X is the sentence.
+_SENTENCE_LABEL_PATTERN = re.compile(r"\bSentence:\s*(.+)$", re.IGNORECASE | re.DOTALL)
+
+_DIDNT_CATCH_PATTERN = re.compile(r"^I didn't catch that\.?\s*", re.IGNORECASE)
+
+
 def _strip_surrounding_quotes(text: str) -> str:
     """Remove surrounding double quotes so we don't speak \"That's a room.\"."""
     if not text or not text.strip():
@@ -463,11 +757,18 @@ def _strip_meta_commentary_from_sentence(text: str) -> str:
     if not text or not text.strip():
         return text
     t = text.strip()
-    m = _META_MEANT_TO_SAY_PATTERN.search(t)
-    if m:
-        t = m.group(1).strip()
-    else:
-        t = _USER_SAID_PREFIX.sub("", t).strip()
+    # Every meta form ends its marker with a colon; plain sentences skip the regexes.
+    if ":" in t:
+        lower = t.lower()
+        m = (
+            _META_MEANT_TO_SAY_PATTERN.search(t)
+            if "meant to say" in lower or "into a single sentence" in lower
+            else None
+        )
+        if m:
+            t = m.group(1).strip()
+        else:
+            t = _USER_SAID_PREFIX.sub("", t).strip()
     t = _strip_surrounding_quotes(t)
     return _ensure_first_person(t) if t else t
 
@@ -477,19 +778,19 @@ def _fallback_sentence_from_raw(raw: str) -> str:
     text = strip_certainty_from_response(raw.strip())
     if not text:
         return text
+    lower = text.lower()
     # Model sometimes echoes "Output your reply as: \"Test 123.\"" (meta-instruction); use the quoted sentence.
-    out_match = _OUTPUT_REPLY_AS_PATTERN.search(text)
-    if out_match:
-        return out_match.group(1).strip()
+    if "output your reply as" in lower:
+        out_match = _OUTPUT_REPLY_AS_PATTERN.search(text)
+        if out_match:
+            return out_match.group(1).strip()
     # Model sometimes echoes "Sentence: X" in plain text; use X so we don't speak "I didn't catch that. Sentence: X".
-    match = re.search(r"\bSentence:\s*(.+)$", text, re.IGNORECASE | re.DOTALL)
+    match = _SENTENCE_LABEL_PATTERN.search(text) if "sentence:" in lower else None
     if match:
         return match.group(1).strip()
     # If the reply is "I didn't catch that." followed by meta-instruction, strip the meta part so we don't speak it.
-    if re.match(r"^I didn't catch that\.?\s*", text, re.IGNORECASE):
-        rest = re.sub(
-            r"^I didn't catch that\.?\s*", "", text, flags=re.IGNORECASE
-        ).strip()
-        if "never use" in rest.lower() or "output your reply as" in rest.lower():
+    if lower.startswith("i didn't catch that"):
+        rest = text[_DIDNT_CATCH_PATTERN.match(text).end() :].lower()
+        if "never use" in rest or "output your reply as" in rest:
             return "I didn't catch that."
     return _strip_meta_commentary_from_sentence(text)
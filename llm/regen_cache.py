@@ -0,0 +1,52 @@
+"""
+LRU cache of regeneration replies so a repeated phrase skips the Ollama round-trip.
+Keyed by a hash of (model, system prompt, user prompt): any prompt or model change is a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_REGEN_CACHE_SIZE = 512
+
+
+def regeneration_cache_key(model_name: str, system: str, user: str) -> str:
+    """Return a stable key for one regeneration request."""
+    h = hashlib.sha1()
+    for part in (model_name, system, user):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class RegenerationCache:
+    """Thread-safe LRU mapping regeneration request keys to the raw model reply."""
+
+    def __init__(self, maxsize: int = DEFAULT_REGEN_CACHE_SIZE) -> None:
+        self._maxsize = max(1, maxsize)
+        self._data: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
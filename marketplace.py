@@ -14,6 +14,8 @@ from pathlib import Path
 from typing import Any
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,7 @@ REPO_NAME_RE = re.compile(r"^talkie-module-[a-zA-Z0-9_-]+$")
 CACHE_TTL_SEC = 600  # 10 minutes
 
 _cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+_session: requests.Session | None = None
 
 
 def _get_github_token() -> str | None:
@@ -32,6 +35,20 @@ def _get_github_token() -> str | None:
     )
 
 
+def _github_session() -> requests.Session:
+    """
+    Shared session for api.github.com: keeps the TLS connection between the list and install
+    calls and retries transient gateway errors (502/503/504).
+    """
+    global _session
+    if _session is None:
+        session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        session.mount("https://", HTTPAdapter(max_retries=retry))
+        _session = session
+    return _session
+
+
 def _invalidate_cache(org: str) -> None:
     _cache.pop(org, None)
 
@@ -47,7 +64,7 @@ def _list_org_repos(
     if token:
         headers["Authorization"] = f"Bearer {token}"
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _github_session().get(url, headers=headers, timeout=timeout)
         if resp.status_code == 403:
             logger.warning(
                 "GitHub API rate limit (403) for org %s; set GITHUB_TOKEN for higher limit",
@@ -78,7 +95,7 @@ def _repo_exists_in_org(
     if token:
         headers["Authorization"] = f"Bearer {token}"
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
+        resp = _github_session().get(url, headers=headers, timeout=timeout)
         if resp.status_code == 404:
             return False
         resp.raise_for_status()
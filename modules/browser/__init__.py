@@ -570,12 +570,17 @@ def create_web_handler(
                     build_web_mode_prompts,
                     parse_browse_intent,
                     parse_web_mode_command,
+                    try_local_browse_intent,
                 )
 
                 logger.debug(
                     "Web search (remote): utterance=%r", (utterance or "")[:120]
                 )
-                if web_mode_system_prompt:
+                # Fixed commands ("scroll down", "go back", "click the third link") skip the LLM.
+                intent = try_local_browse_intent(utterance)
+                if intent is not None:
+                    logger.debug("Web search (remote): matched locally, no LLM call")
+                elif web_mode_system_prompt:
                     browse_system, browse_user = build_web_mode_prompts(
                         utterance, system_prompt=web_mode_system_prompt
                     )
@@ -665,10 +670,15 @@ def create_web_handler(
                 build_web_mode_prompts,
                 parse_browse_intent,
                 parse_web_mode_command,
+                try_local_browse_intent,
             )
 
             logger.debug("Web search (local): utterance=%r", (utterance or "")[:120])
-            if web_mode_system_prompt:
+            # Fixed commands ("scroll down", "go back", "click the third link") skip the LLM.
+            intent = try_local_browse_intent(utterance)
+            if intent is not None:
+                logger.debug("Web search (local): matched locally, no LLM call")
+            elif web_mode_system_prompt:
                 browse_system, browse_user = build_web_mode_prompts(
                     utterance, system_prompt=web_mode_system_prompt
                 )
@@ -6,6 +6,7 @@ Exposes browser operations via REST API.
 from __future__ import annotations
 
 import argparse
+import asyncio
 from typing import Any, Callable
 
 from fastapi import Request, status
@@ -55,36 +56,40 @@ class BrowserModuleServer(BaseModuleServer):
 
                 # Support both "utterance" (for full processing) and "intent" (for pre-parsed)
                 if "utterance" in data:
-                    # Full utterance - parse intent first (requires LLM)
-                    if self._ollama_client is None:
-                        return self._error_response(
-                            status.HTTP_400_BAD_REQUEST,
-                            "invalid_request",
-                            "LLM client required for utterance parsing",
-                        )
                     from llm.prompts import (
                         build_browse_intent_prompts,
                         build_web_mode_prompts,
                         parse_browse_intent,
                         parse_web_mode_command,
+                        try_local_browse_intent,
                     )
 
                     utterance = data.get("utterance", "")
-                    web_mode_system_prompt = (self._config.get("llm") or {}).get(
-                        "web_mode_system_prompt"
-                    )
-                    if web_mode_system_prompt:
-                        browse_system, browse_user = build_web_mode_prompts(
-                            utterance, system_prompt=web_mode_system_prompt
-                        )
-                        raw = self._ollama_client.generate(browse_user, browse_system)
-                        intent = parse_web_mode_command(raw)
-                    else:
-                        browse_system, browse_user = build_browse_intent_prompts(
-                            utterance
+                    # Fixed commands ("scroll down", "go back", ...) need no LLM call.
+                    intent = try_local_browse_intent(utterance)
+                    if intent is None:
+                        # Full utterance - parse intent first (requires LLM)
+                        if self._ollama_client is None:
+                            return self._error_response(
+                                status.HTTP_400_BAD_REQUEST,
+                                "invalid_request",
+                                "LLM client required for utterance parsing",
+                            )
+                        web_mode_system_prompt = (self._config.get("llm") or {}).get(
+                            "web_mode_system_prompt"
                         )
-                        raw = self._ollama_client.generate(browse_user, browse_system)
-                        intent = parse_browse_intent(raw)
+                        if web_mode_system_prompt:
+                            browse_system, browse_user = build_web_mode_prompts(
+                                utterance, system_prompt=web_mode_system_prompt
+                            )
+                            raw = await self._generate(browse_user, browse_system)
+                            intent = parse_web_mode_command(raw)
+                        else:
+                            browse_system, browse_user = build_browse_intent_prompts(
+                                utterance
+                            )
+                            raw = await self._generate(browse_user, browse_system)
+                            intent = parse_browse_intent(raw)
                 elif "intent" in data:
                     # Pre-parsed intent
                     intent = data.get("intent", {})
@@ -110,6 +115,13 @@ class BrowserModuleServer(BaseModuleServer):
                     status.HTTP_500_INTERNAL_SERVER_ERROR, "internal_error", str(e)
                 )
 
+    async def _generate(self, prompt: str, system: str) -> str:
+        """Run the blocking LLM call in the default executor so other requests keep being served."""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None, self._ollama_client.generate, prompt, system
+        )
+
     async def startup(self) -> None:
         """Initialize browser service on startup."""
         await super().startup()
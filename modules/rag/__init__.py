@@ -4,6 +4,8 @@ RAG service: ingest documents (chunk, embed, store in Chroma), retrieve context
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from sdk import get_logger, get_rag_section
@@ -12,11 +14,15 @@ from modules.rag.store import RAGStore
 
 logger = get_logger("rag")
 
+# Retrieved-context strings kept per (query, top_k, min_query_length); cleared whenever the index changes.
+RETRIEVE_CACHE_SIZE = 256
+
 
 class RAGService:
     """
     Facade: ingest(paths), retrieve(query) -> str, list_indexed_sources(), remove_from_index(source), clear_index().
     Uses config for embedding model, Chroma path, top_k, chunk settings.
+    retrieve() results are cached (LRU) until the next ingest, remove, or clear.
     """
 
     def __init__(self, config: dict) -> None:
@@ -36,14 +42,29 @@ class RAGService:
         self._top_k = config["top_k"]
         self._document_qa_top_k = config.get("document_qa_top_k", config["top_k"])
         self._min_query_length = config.get("min_query_length", 3)
+        self._retrieve_cache: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._retrieve_cache_lock = threading.Lock()
+        # Bumped on every index change; a retrieve only caches if it is unchanged since it started.
+        self._index_generation = 0
+
+    def _clear_retrieve_cache(self) -> None:
+        with self._retrieve_cache_lock:
+            self._index_generation += 1
+            self._retrieve_cache.clear()
 
     def ingest(self, paths: list[Path]) -> None:
         """Read, chunk, embed, and store documents; replace existing chunks for same source."""
-        self._store.add_documents(paths)
+        try:
+            self._store.add_documents(paths)
+        finally:
+            self._clear_retrieve_cache()
 
     def ingest_text(self, source: str, text: str) -> None:
         """Chunk, embed, and store text under the given source (e.g. stored web page). Replaces existing chunks for that source."""
-        self._store.add_text(source, text)
+        try:
+            self._store.add_text(source, text)
+        finally:
+            self._clear_retrieve_cache()
 
     def retrieve(
         self, query: str, top_k: int | None = None, min_query_length: int | None = None
@@ -53,7 +74,25 @@ class RAGService:
         mql = (
             min_query_length if min_query_length is not None else self._min_query_length
         )
-        return self._store.retrieve(query, top_k=k, min_query_length=mql)
+        key = ((query or "").strip(), k, mql)
+        with self._retrieve_cache_lock:
+            cached = self._retrieve_cache.get(key)
+            if cached is not None:
+                self._retrieve_cache.move_to_end(key)
+                return cached
+            generation = self._index_generation
+        context = self._store.retrieve(query, top_k=k, min_query_length=mql)
+        # Empty result may be a transient embed/search failure: do not cache it.
+        if context:
+            with self._retrieve_cache_lock:
+                if generation != self._index_generation:
+                    # The index changed while we searched; this context may be stale.
+                    return context
+                self._retrieve_cache[key] = context
+                self._retrieve_cache.move_to_end(key)
+                while len(self._retrieve_cache) > RETRIEVE_CACHE_SIZE:
+                    self._retrieve_cache.popitem(last=False)
+        return context
 
     def get_document_qa_top_k(self) -> int:
         return self._document_qa_top_k
@@ -62,10 +101,16 @@ class RAGService:
         return self._store.list_indexed_sources()
 
     def remove_from_index(self, source: str) -> None:
-        self._store.remove_from_index(source)
+        try:
+            self._store.remove_from_index(source)
+        finally:
+            self._clear_retrieve_cache()
 
     def clear_index(self) -> None:
-        self._store.clear_index()
+        try:
+            self._store.clear_index()
+        finally:
+            self._clear_retrieve_cache()
 
     def has_documents(self) -> bool:
         """True if the collection has at least one chunk (for empty-state check)."""
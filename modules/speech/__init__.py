@@ -20,16 +20,20 @@ logger = get_logger("speech")
 
 
 # Re-export calibration overlay from app for backward compatibility
-def apply_calibration_overlay(audio_cfg: dict, settings_repo: Any) -> dict:
+def apply_calibration_overlay(
+    audio_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
     from app.config_overlay import apply_calibration_overlay as _apply
 
-    return _apply(audio_cfg, settings_repo)
+    return _apply(audio_cfg, settings_repo, values)
 
 
-def apply_llm_calibration_overlay(llm_cfg: dict, settings_repo: Any) -> dict:
+def apply_llm_calibration_overlay(
+    llm_cfg: dict, settings_repo: Any, values: dict[str, str | None] | None = None
+) -> dict:
     from app.config_overlay import apply_llm_calibration_overlay as _apply
 
-    return _apply(llm_cfg, settings_repo)
+    return _apply(llm_cfg, settings_repo, values)
 
 
 class SpeechComponents(NamedTuple):
@@ -49,6 +53,7 @@ def _default_auto_sensitivity() -> dict:
         "max_level": 0.08,
         "step": 0.25,
         "cooldown_chunks": 3,
+        "level_window": 4,
     }
 
 
@@ -118,6 +123,9 @@ def create_speech_components(
             auto_sensitivity["cooldown_chunks"] = max(
                 1, int(audio_cfg.get("auto_sensitivity_cooldown_chunks", 3))
             )
+            auto_sensitivity["level_window"] = max(
+                1, int(audio_cfg.get("auto_sensitivity_level_window", 4))
+            )
         return SpeechComponents(
             capture=RemoteAudioCapture(client),
             stt=RemoteSTTEngine(client),
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+import zlib
 from pathlib import Path
 from typing import Callable, TypeVar
 
@@ -44,6 +45,8 @@ def with_connection(
 
 
 _SCHEMA_PATH = Path(__file__).resolve().parent / "schema.sql"
+# Bump when _run_migrations changes; schema.sql edits change the stored version on their own.
+MIGRATIONS_VERSION = 1
 
 
 def _apply_pragmas(conn: sqlite3.Connection) -> None:
@@ -91,17 +94,28 @@ def _run_migrations(conn: sqlite3.Connection) -> None:
         logger.debug("Added browse_search_results table")
 
 
+def _schema_version(schema_sql: str) -> int:
+    """PRAGMA user_version for a DB initialized from schema_sql and the current migrations (never 0)."""
+    return zlib.crc32(f"{MIGRATIONS_VERSION}\n{schema_sql}".encode()) & 0x7FFFFFFF or 1
+
+
 def init_database(db_path: str) -> None:
     """
     Create the database file if needed and apply schema.
-    Idempotent; safe to call on every startup.
+    Idempotent; safe to call on every startup. A DB whose user_version matches the
+    current schema and migrations is left as is, without running any DDL.
     """
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
     schema_sql = _SCHEMA_PATH.read_text()
+    version = _schema_version(schema_sql)
     with sqlite3.connect(db_path) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0] == version:
+            logger.debug("Schema already current in %s", db_path)
+            return
         _apply_pragmas(conn)
         conn.executescript(schema_sql)
         _run_migrations(conn)
+        conn.execute(f"PRAGMA user_version = {version}")
     logger.info("Schema applied to %s", db_path)
 
 
@@ -113,3 +127,26 @@ def get_connection(db_path: str) -> sqlite3.Connection:
     conn = sqlite3.connect(db_path, check_same_thread=False)
     _apply_pragmas(conn)
     return conn
+
+
+class SharedConnection(sqlite3.Connection):
+    """
+    Connection reused across with_connection calls: close() is a no-op so the
+    sqlite3 statement cache survives between calls. close_shared() really closes it.
+    """
+
+    def close(self) -> None:
+        pass
+
+    def close_shared(self) -> None:
+        super().close()
+
+
+def get_shared_connector(db_path: str) -> Callable[[], sqlite3.Connection]:
+    """
+    Open one connection (WAL, busy_timeout) and return a connector that always hands it out.
+    For single-threaded, short-lived callers such as CLIs; use get_connection elsewhere.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False, factory=SharedConnection)
+    _apply_pragmas(conn)
+    return lambda: conn
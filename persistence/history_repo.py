@@ -5,8 +5,12 @@ Repository for interaction history and corrections.
 from __future__ import annotations
 
 import logging
+import queue
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timezone
-from typing import Callable, TypedDict
+from functools import partial
+from typing import Callable, Iterator, TypeVar, TypedDict
 
 import sqlite3
 
@@ -18,6 +22,34 @@ logger = logging.getLogger(__name__)
 MAX_TEXT_LENGTH = 65536
 TRUNCATED_SUFFIX = " [truncated]"
 
+# Write-behind queue for enqueue_interaction: commit at most this many queued rows per transaction.
+WRITE_BATCH_SIZE = 32
+# Ids per DELETE ... IN (...) statement (older SQLite builds allow 999 bound variables).
+DELETE_BATCH_SIZE = 500
+
+_T = TypeVar("_T")
+
+# Row queued for the background writer: ((created_at, transcription, response, speaker_id, session_id), id future).
+_PendingRow = tuple[tuple[str, str, str, str | None, str | None], "Future[int]"]
+
+_INSERT_INTERACTION = """
+    INSERT INTO interactions (created_at, original_transcription, llm_response, speaker_id, session_id)
+    VALUES (?, ?, ?, ?, ?)"""
+
+# Newest-first listing shared by list_recent and get_by_recent_index.
+_RECENT_SELECT = """
+    SELECT id, created_at, original_transcription, llm_response,
+           corrected_response, COALESCE(exclude_from_profile, 0), weight, speaker_id, session_id
+    FROM interactions
+    ORDER BY created_at DESC
+    LIMIT ?"""
+_RECENT_SELECT_LEGACY = """
+    SELECT id, created_at, original_transcription, llm_response,
+           corrected_response, speaker_id, session_id
+    FROM interactions
+    ORDER BY created_at DESC
+    LIMIT ?"""
+
 
 def _truncate_for_storage(text: str, max_len: int = MAX_TEXT_LENGTH) -> str:
     if len(text) <= max_len:
@@ -84,6 +116,20 @@ def _row_to_interaction_record(r: tuple) -> InteractionRecord:
     }
 
 
+def _preview_sql(column: str) -> str:
+    """SQL for column trimmed of whitespace and cut to :n chars, the last one an ellipsis if cut."""
+    trimmed = f"trim(COALESCE({column}, ''), ' ' || char(9, 10, 13))"
+    return (
+        f"CASE WHEN length({trimmed}) > :n"
+        f" THEN substr({trimmed}, 1, :n - 1) || '\u2026' ELSE {trimmed} END"
+    )
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: list[_PendingRow]) -> list[int]:
+    """Insert queued rows on conn and return the ids SQLite assigned, in order."""
+    return [conn.execute(_INSERT_INTERACTION, row).lastrowid or 0 for row, _ in rows]
+
+
 def _has_column(conn: sqlite3.Connection, column: str) -> bool:
     """Return True if interactions table has the given column."""
     cur = conn.execute("PRAGMA table_info(interactions)")
@@ -94,11 +140,122 @@ class HistoryRepo:
     """
     Insert and query interactions; update corrections.
     Connector is a callable that returns a new sqlite3.Connection (e.g. get_connection(path)).
+    enqueue_interaction() hands inserts to a background writer that commits whatever is queued
+    in one transaction; while rows are pending, every other method flushes that queue first,
+    so reads and updates always see queued rows.
     """
 
-    def __init__(self, connector: Callable[[], sqlite3.Connection]) -> None:
+    def __init__(
+        self,
+        connector: Callable[[], sqlite3.Connection],
+        write_batch_size: int = WRITE_BATCH_SIZE,
+    ) -> None:
         self._connector = connector
         self._has_exclude_from_profile: bool | None = None
+        self._write_batch_size = max(1, write_batch_size)
+        # Write-behind state; created on the first enqueue_interaction().
+        self._write_queue: queue.Queue[_PendingRow | None] | None = None
+        self._writer: threading.Thread | None = None
+        self._write_lock = threading.Lock()
+
+    def _with_connection(
+        self, fn: Callable[[sqlite3.Connection], _T], *, commit: bool = False
+    ) -> _T:
+        self.flush()
+        return with_connection(self._connector, fn, commit=commit)
+
+    def flush(self) -> None:
+        """Block until every interaction queued by enqueue_interaction() is committed."""
+        q = self._write_queue
+        if (
+            q is None
+            or q.unfinished_tasks == 0
+            or threading.current_thread() is self._writer
+        ):
+            return
+        # Sentinel makes the writer commit its current batch without waiting for more rows.
+        q.put(None)
+        q.join()
+
+    def enqueue_interaction(
+        self,
+        original_transcription: str,
+        llm_response: str,
+        *,
+        speaker_id: str | None = None,
+        session_id: str | None = None,
+    ) -> Future[int]:
+        """
+        Queue one interaction for the background writer. Returns a Future that resolves to
+        the row id SQLite assigned once the row is committed, or raises if it could not be stored.
+        """
+        pending: Future[int] = Future()
+        row = (
+            _now_iso(),
+            _truncate_for_storage(original_transcription),
+            _truncate_for_storage(llm_response),
+            speaker_id,
+            session_id,
+        )
+        with self._write_lock:
+            q = self._write_queue
+            if q is None:
+                q = queue.Queue()
+                self._write_queue = q
+                self._writer = threading.Thread(
+                    target=self._write_loop,
+                    args=(q,),
+                    name="talkie-core-history-writer",
+                    daemon=True,
+                )
+                self._writer.start()
+            q.put((row, pending))
+        return pending
+
+    def _write_loop(self, q: queue.Queue[_PendingRow | None]) -> None:
+        while True:
+            items = [q.get()]
+            # Group commit: take whatever else is already queued, without waiting for more.
+            while items[-1] is not None and len(items) < self._write_batch_size:
+                try:
+                    items.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            pending = [item for item in items if item is not None]
+            try:
+                if pending:
+                    self._commit_pending(pending)
+            finally:
+                for _ in items:
+                    q.task_done()
+
+    def _commit_pending(self, pending: list[_PendingRow]) -> None:
+        """Insert queued rows in one transaction; if that fails, retry each row on its own."""
+        try:
+            ids = with_connection(
+                self._connector, partial(_insert_rows, rows=pending), commit=True
+            )
+        except Exception:
+            logger.warning(
+                "HistoryRepo batch insert of %d interaction(s) failed; retrying one by one",
+                len(pending),
+                exc_info=True,
+            )
+        else:
+            for (_, fut), interaction_id in zip(pending, ids):
+                fut.set_result(interaction_id)
+            return
+        for item in pending:
+            fut = item[1]
+            try:
+                (interaction_id,) = with_connection(
+                    self._connector, partial(_insert_rows, rows=[item]), commit=True
+                )
+            except Exception as e:
+                logger.exception("HistoryRepo write-behind insert failed")
+                fut.set_exception(e)
+            else:
+                fut.set_result(interaction_id)
 
     def _schema_has_exclude_from_profile(self, conn: sqlite3.Connection) -> bool:
         if self._has_exclude_from_profile is None:
@@ -121,15 +278,11 @@ class HistoryRepo:
             orig = _truncate_for_storage(original_transcription)
             resp = _truncate_for_storage(llm_response)
             cur = conn.execute(
-                """
-                INSERT INTO interactions (created_at, original_transcription, llm_response, speaker_id, session_id)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (_now_iso(), orig, resp, speaker_id, session_id),
+                _INSERT_INTERACTION, (_now_iso(), orig, resp, speaker_id, session_id)
             )
             return cur.lastrowid or 0
 
-        return with_connection(self._connector, insert, commit=True)
+        return self._with_connection(insert, commit=True)
 
     def update_correction(self, interaction_id: int, corrected_response: str) -> None:
         """Update the corrected_response for an interaction (user/caregiver edit)."""
@@ -140,37 +293,62 @@ class HistoryRepo:
                 (corrected_response, interaction_id),
             )
 
-        with_connection(self._connector, update, commit=True)
+        self._with_connection(update, commit=True)
 
     def list_recent(self, limit: int = 100) -> list[InteractionRecord]:
         """Return most recent interactions (newest first)."""
 
         def query(conn: sqlite3.Connection) -> list[InteractionRecord]:
             if self._schema_has_exclude_from_profile(conn):
-                cur = conn.execute(
-                    """
-                    SELECT id, created_at, original_transcription, llm_response,
-                           corrected_response, COALESCE(exclude_from_profile, 0), weight, speaker_id, session_id
-                    FROM interactions
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (limit,),
-                )
+                cur = conn.execute(_RECENT_SELECT, (limit,))
             else:
-                cur = conn.execute(
-                    """
-                    SELECT id, created_at, original_transcription, llm_response,
-                           corrected_response, speaker_id, session_id
-                    FROM interactions
-                    ORDER BY created_at DESC
-                    LIMIT ?
-                    """,
-                    (limit,),
-                )
+                cur = conn.execute(_RECENT_SELECT_LEGACY, (limit,))
             return [_row_to_interaction_record(r) for r in cur.fetchall()]
 
-        return with_connection(self._connector, query)
+        return self._with_connection(query)
+
+    def iter_recent_previews(
+        self, limit: int = 100, preview_len: int = 60
+    ) -> Iterator[tuple[int, str, str, str]]:
+        """
+        Yield (id, created_at[:19], transcription preview, response preview), newest first.
+        Text is whitespace-trimmed and cut to preview_len chars (ending in an ellipsis) by SQLite,
+        so full transcriptions and responses never leave the database.
+        """
+        self.flush()
+        conn = self._connector()
+        try:
+            cur = conn.execute(
+                f"""
+                SELECT id, substr(created_at, 1, 19),
+                       {_preview_sql("original_transcription")},
+                       {_preview_sql("llm_response")}
+                FROM interactions
+                ORDER BY created_at DESC
+                LIMIT :limit
+                """,
+                {"limit": limit, "n": max(1, preview_len)},
+            )
+            for r in cur:
+                yield r
+        finally:
+            conn.close()
+
+    def get_by_recent_index(self, index: int) -> InteractionRecord | None:
+        """Return the interaction at 0-based position index in list_recent order, or None."""
+        if index < 0:
+            return None
+
+        def query(conn: sqlite3.Connection) -> InteractionRecord | None:
+            sql = (
+                _RECENT_SELECT
+                if self._schema_has_exclude_from_profile(conn)
+                else _RECENT_SELECT_LEGACY
+            )
+            row = conn.execute(sql + " OFFSET ?", (1, index)).fetchone()
+            return _row_to_interaction_record(row) if row is not None else None
+
+        return self._with_connection(query)
 
     def get_corrections_for_profile(self, limit: int = 200) -> list[tuple[str, str]]:
         """
@@ -204,7 +382,7 @@ class HistoryRepo:
                 )
             return [(r[0], r[1]) for r in cur.fetchall()]
 
-        return with_connection(self._connector, query)
+        return self._with_connection(query)
 
     def get_accepted_for_profile(self, limit: int = 50) -> list[tuple[str, str]]:
         """
@@ -238,7 +416,7 @@ class HistoryRepo:
                 )
             return [(r[0] or "", r[1] or "") for r in cur.fetchall()]
 
-        return with_connection(self._connector, query)
+        return self._with_connection(query)
 
     def update_exclude_from_profile(self, interaction_id: int, exclude: bool) -> None:
         """Set exclude_from_profile to 1 if exclude else 0 for the given interaction."""
@@ -250,7 +428,7 @@ class HistoryRepo:
             )
 
         try:
-            with_connection(self._connector, update, commit=True)
+            self._with_connection(update, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.update_exclude_from_profile failed: %s", e)
             raise
@@ -274,7 +452,48 @@ class HistoryRepo:
             )
             return [_row_to_interaction_record(r) for r in cur.fetchall()]
 
-        return with_connection(self._connector, query)
+        return self._with_connection(query)
+
+    def list_for_export(
+        self, limit: int = 5000, min_weight: float | None = None
+    ) -> list[InteractionRecord]:
+        """
+        Return the oldest `limit` interactions ordered best-first for fine-tuning export:
+        corrected before uncorrected, then higher weight, then older. With min_weight, rows
+        whose weight (NULL counts as 0) is below it are left out. Sorting and filtering run in SQL.
+        """
+
+        def query(conn: sqlite3.Connection) -> list[InteractionRecord]:
+            has_weight = _has_column(conn, "weight")
+            weight = "COALESCE(weight, 0)" if has_weight else "0"
+            sel = """
+                SELECT id, created_at, original_transcription, llm_response,
+                       corrected_response, COALESCE(exclude_from_profile, 0)
+            """
+            if has_weight:
+                sel += ", weight, speaker_id, session_id"
+            else:
+                sel += ", speaker_id, session_id"
+            sql = (
+                sel
+                + " FROM (SELECT * FROM interactions ORDER BY created_at ASC LIMIT ?)"
+            )
+            params: list[object] = [limit]
+            if min_weight is not None:
+                sql += f" WHERE {weight} >= ?"
+                params.append(min_weight)
+            sql += f"""
+                ORDER BY
+                    CASE WHEN TRIM(COALESCE(corrected_response, ''), ' \t\r\n') != ''
+                         THEN 0 ELSE 1 END,
+                    {weight} DESC,
+                    created_at ASC,
+                    id ASC
+            """
+            cur = conn.execute(sql, params)
+            return [_row_to_interaction_record(r) for r in cur.fetchall()]
+
+        return self._with_connection(query)
 
     def update_weight(self, interaction_id: int, weight: float | None) -> None:
         """Set weight for an interaction. None clears the weight."""
@@ -286,7 +505,7 @@ class HistoryRepo:
             )
 
         try:
-            with_connection(self._connector, update, commit=True)
+            self._with_connection(update, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.update_weight failed: %s", e)
             raise
@@ -297,13 +516,13 @@ class HistoryRepo:
             return
 
         def batch(conn: sqlite3.Connection) -> None:
-            for iid, w in updates:
-                conn.execute(
-                    "UPDATE interactions SET weight = ? WHERE id = ?", (w, iid)
-                )
+            conn.executemany(
+                "UPDATE interactions SET weight = ? WHERE id = ?",
+                [(w, iid) for iid, w in updates],
+            )
 
         try:
-            with_connection(self._connector, batch, commit=True)
+            self._with_connection(batch, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.update_weights_batch failed: %s", e)
             raise
@@ -315,14 +534,13 @@ class HistoryRepo:
         val = 1 if exclude else 0
 
         def batch(conn: sqlite3.Connection) -> None:
-            for iid in interaction_ids:
-                conn.execute(
-                    "UPDATE interactions SET exclude_from_profile = ? WHERE id = ?",
-                    (val, iid),
-                )
+            conn.executemany(
+                "UPDATE interactions SET exclude_from_profile = ? WHERE id = ?",
+                [(val, iid) for iid in interaction_ids],
+            )
 
         try:
-            with_connection(self._connector, batch, commit=True)
+            self._with_connection(batch, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.set_exclude_batch failed: %s", e)
             raise
@@ -337,7 +555,7 @@ class HistoryRepo:
             )
             return [row[0] for row in cur.fetchall()]
 
-        return with_connection(self._connector, query)
+        return self._with_connection(query)
 
     def delete_all(self) -> int:
         """Delete all interactions. Returns number deleted."""
@@ -347,7 +565,7 @@ class HistoryRepo:
             return cur.rowcount
 
         try:
-            return with_connection(self._connector, delete, commit=True)
+            return self._with_connection(delete, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.delete_all failed: %s", e)
             raise
@@ -358,15 +576,20 @@ class HistoryRepo:
             return 0
 
         def delete(conn: sqlite3.Connection) -> int:
-            placeholders = ",".join("?" * len(interaction_ids))
-            cur = conn.execute(
-                f"DELETE FROM interactions WHERE id IN ({placeholders})",
-                interaction_ids,
-            )
-            return cur.rowcount
+            # IN lists of at most DELETE_BATCH_SIZE ids stay under SQLite's bound-variable limit.
+            deleted = 0
+            for start in range(0, len(interaction_ids), DELETE_BATCH_SIZE):
+                ids = interaction_ids[start : start + DELETE_BATCH_SIZE]
+                placeholders = ",".join("?" * len(ids))
+                cur = conn.execute(
+                    f"DELETE FROM interactions WHERE id IN ({placeholders})",
+                    ids,
+                )
+                deleted += cur.rowcount
+            return deleted
 
         try:
-            return with_connection(self._connector, delete, commit=True)
+            return self._with_connection(delete, commit=True)
         except sqlite3.Error as e:
             logger.exception("HistoryRepo.delete_interactions failed: %s", e)
             raise
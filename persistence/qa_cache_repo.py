@@ -0,0 +1,94 @@
+"""
+Repository for qa_cache: document-QA answers keyed by llm.regen_cache.regeneration_cache_key(model, system, user).
+The system prompt carries the retrieved context, so a changed corpus yields a new key and never a stale answer.
+Entries expire after max_age_sec, and the oldest are dropped once the table holds more than max_rows.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from typing import Callable
+
+from persistence.database import with_connection
+
+logger = logging.getLogger(__name__)
+
+# Defaults for QACacheRepo: keep at most this many answers, none older than 30 days.
+DEFAULT_QA_CACHE_MAX_ROWS = 1000
+DEFAULT_QA_CACHE_MAX_AGE_SEC = 30 * 24 * 3600
+
+
+class QACacheRepo:
+    """
+    Read/write qa_cache table. On DB errors, logs and re-raises so the pipeline can fall back to the LLM.
+    Each put() prunes expired rows and trims the table to max_rows (oldest ts first).
+    """
+
+    def __init__(
+        self,
+        connector: Callable[[], sqlite3.Connection],
+        max_rows: int = DEFAULT_QA_CACHE_MAX_ROWS,
+        max_age_sec: float = DEFAULT_QA_CACHE_MAX_AGE_SEC,
+    ) -> None:
+        self._connector = connector
+        self._max_rows = max(1, max_rows)
+        self._max_age_sec = max(0.0, max_age_sec)
+
+    def _oldest_ts(self) -> int:
+        """Rows written before this Unix time are expired."""
+        return int(time.time() - self._max_age_sec)
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for key, or None if not cached or expired."""
+
+        def get_one(conn: sqlite3.Connection) -> str | None:
+            cur = conn.execute(
+                "SELECT response FROM qa_cache WHERE hash = ? AND ts >= ?",
+                (key, self._oldest_ts()),
+            )
+            row = cur.fetchone()
+            return row[0] if row else None
+
+        try:
+            return with_connection(self._connector, get_one)
+        except sqlite3.Error:
+            logger.exception("QACacheRepo.get failed")
+            raise
+
+    def put(self, key: str, response: str) -> None:
+        """Store (or replace) the response for key, then prune expired and excess rows."""
+
+        def upsert(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                "INSERT OR REPLACE INTO qa_cache (hash, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+            conn.execute("DELETE FROM qa_cache WHERE ts < ?", (self._oldest_ts(),))
+            conn.execute(
+                """
+                DELETE FROM qa_cache WHERE hash IN (
+                    SELECT hash FROM qa_cache ORDER BY ts DESC, rowid DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self._max_rows,),
+            )
+
+        try:
+            with_connection(self._connector, upsert, commit=True)
+        except sqlite3.Error:
+            logger.exception("QACacheRepo.put failed")
+            raise
+
+    def clear(self) -> None:
+        """Delete all cached answers."""
+
+        def delete_all(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM qa_cache")
+
+        try:
+            with_connection(self._connector, delete_all, commit=True)
+        except sqlite3.Error:
+            logger.exception("QACacheRepo.clear failed")
+            raise
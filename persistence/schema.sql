@@ -50,3 +50,11 @@ CREATE TABLE IF NOT EXISTS browse_search_results (
     created_at TEXT NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_browse_search_results_run_id ON browse_search_results(run_id);
+
+-- Document-QA answer cache: hash of (model, system prompt with retrieved context, question) -> answer.
+CREATE TABLE IF NOT EXISTS qa_cache (
+    hash TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_qa_cache_ts ON qa_cache(ts);
@@ -30,7 +30,8 @@ class LanguageProfile:
     """
     Provides context for the LLM from user context (settings), corrections, and accepted responses.
     get_context_for_llm() returns text to append to the system prompt. On error, returns empty string.
-    Caches the result for a short TTL; call invalidate_cache() when history changes.
+    Caches the result for a short TTL; call invalidate_cache() when history changes, or
+    invalidate_accepted() after saving a new interaction (only the accepted pairs are re-read).
     """
 
     def __init__(
@@ -60,9 +61,21 @@ class LanguageProfile:
         )
         self._context_cache: str | None = None
         self._context_cache_time: float = 0.0
+        # (settings, training_facts, corrections): unchanged by a newly saved interaction.
+        self._base_cache: (
+            tuple[dict[str, str | None], list[str], list[tuple[str, str]]] | None
+        ) = None
 
     def invalidate_cache(self) -> None:
-        """Invalidate cached profile context (e.g. after a new interaction is saved)."""
+        """Invalidate cached profile context (e.g. after a correction, setting or training change)."""
+        self._context_cache = None
+        self._base_cache = None
+
+    def invalidate_accepted(self) -> None:
+        """
+        Invalidate only the accepted pairs (a new interaction was saved). Settings, training facts
+        and corrections are reused on the next call; the TTL still bounds how stale they get.
+        """
         self._context_cache = None
 
     def get_context_for_llm(self) -> str:
@@ -72,36 +85,21 @@ class LanguageProfile:
         Uses a short TTL cache; call invalidate_cache() when history changes.
         """
         now = time.monotonic()
-        if (
-            self._context_cache is not None
-            and (now - self._context_cache_time) < PROFILE_CONTEXT_CACHE_TTL_SEC
-        ):
+        if (now - self._context_cache_time) >= PROFILE_CONTEXT_CACHE_TTL_SEC:
+            self._context_cache = None
+            self._base_cache = None
+        if self._context_cache is not None:
             return self._context_cache
         try:
-            settings: dict[str, str | None] = {}
-            if self._settings_repo is not None:
-                settings = self._settings_repo.get_many(
-                    [
-                        "user_context",
-                        "preferred_name",
-                        "pronouns",
-                        "response_style",
-                        "response_length",
-                        "topic_hints",
-                    ]
-                )
-            user_context = settings.get("user_context")
-            training_facts = []
-            if self._training_repo is not None:
-                training_facts = self._training_repo.get_for_profile()
-            corrections = self._history_repo.get_corrections_for_profile(
-                limit=self._correction_limit
-            )
+            if self._base_cache is None:
+                self._base_cache = self._load_base()
+                self._context_cache_time = now
+            settings, training_facts, corrections = self._base_cache
             accepted = self._history_repo.get_accepted_for_profile(
                 limit=self._accepted_limit
             )
             self._context_cache = build_profile_text(
-                user_context,
+                settings.get("user_context"),
                 corrections,
                 accepted,
                 training_facts=training_facts,
@@ -113,8 +111,31 @@ class LanguageProfile:
                 response_length=settings.get("response_length"),
                 topic_hints=settings.get("topic_hints"),
             )
-            self._context_cache_time = now
             return self._context_cache
         except Exception as e:
             logger.exception("LanguageProfile.get_context_for_llm failed: %s", e)
             return ""
+
+    def _load_base(
+        self,
+    ) -> tuple[dict[str, str | None], list[str], list[tuple[str, str]]]:
+        """Fetch settings, training facts and corrections (everything except accepted pairs)."""
+        settings: dict[str, str | None] = {}
+        if self._settings_repo is not None:
+            settings = self._settings_repo.get_many(
+                [
+                    "user_context",
+                    "preferred_name",
+                    "pronouns",
+                    "response_style",
+                    "response_length",
+                    "topic_hints",
+                ]
+            )
+        training_facts = []
+        if self._training_repo is not None:
+            training_facts = self._training_repo.get_for_profile()
+        corrections = self._history_repo.get_corrections_for_profile(
+            limit=self._correction_limit
+        )
+        return (settings, training_facts, corrections)
@@ -38,6 +38,7 @@ def _create_pipeline_and_app(
     """Build pipeline with web capture and UI callbacks that broadcast to WebSocket connections."""
     from persistence.database import get_connection
     from persistence.history_repo import HistoryRepo
+    from persistence.qa_cache_repo import QACacheRepo
     from persistence.settings_repo import SettingsRepo
     from persistence.training_repo import TrainingRepo
     from app.pipeline import create_pipeline
@@ -111,6 +112,7 @@ def _create_pipeline_and_app(
         tts=NoOpTTSEngine(),
         speaker_filter=speech_comps.speaker_filter if speech_comps else None,
         auto_sensitivity=speech_comps.auto_sensitivity if speech_comps else None,
+        qa_cache_repo=QACacheRepo(conn_factory),
     )
     context["pipeline"] = pipeline
 
@@ -129,15 +131,16 @@ def _create_pipeline_and_app(
         on_status=lambda s: broadcast(
             {"type": "status", "value": s, "web_mode": pipeline.get_web_mode()}
         ),
-        on_response=lambda text, iid: broadcast(
-            {"type": "response", "text": text, "interaction_id": iid}
-        ),
+        on_response=lambda text, _iid: broadcast({"type": "response", "text": text}),
         on_error=lambda m: broadcast({"type": "error", "message": m}),
         on_debug=lambda m: broadcast({"type": "debug", "message": m}),
         on_volume=lambda v: broadcast({"type": "volume", "value": v}),
         on_sensitivity_adjusted=lambda v: broadcast(
             {"type": "sensitivity", "value": v}
         ),
+        on_interaction_saved=lambda iid: broadcast(
+            {"type": "interaction_saved", "interaction_id": iid}
+        ),
     )
     # So browse (search) opens the table URL in the user's browser; never the raw search page.
     pipeline.set_on_open_url(lambda url: broadcast({"type": "open_url", "url": url}))
@@ -621,11 +624,13 @@ def create_app(
         if not text:
             return JSONResponse(status_code=400, content={"error": "text required"})
         training_repo.add(text)
+        deps["pipeline"].invalidate_profile_cache()
         return {"ok": True}
 
     @app.delete("/api/training/{fact_id:int}")
     async def api_training_delete(fact_id: int):
         training_repo.delete(fact_id)
+        deps["pipeline"].invalidate_profile_cache()
         return {"ok": True}
 
     @app.get("/api/modules")
@@ -843,8 +848,9 @@ def create_app(
                             web_capture.start()
                             pipeline.start()
                         elif action == "stop":
-                            pipeline.stop()
+                            # Capture first: wakes read_chunk() so pipeline.stop() does not hit its join timeout.
                             web_capture.stop()
+                            pipeline.stop()
                         elif action == "training_mode":
                             on = data.get("on", False)
                             pipeline.set_training_mode(on)
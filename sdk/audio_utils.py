@@ -5,9 +5,15 @@ Used by app pipeline, speech module server, and speech module internals.
 
 from __future__ import annotations
 
+import functools
 import logging
 import struct
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
 INT16_MAX = 32767
@@ -17,20 +23,35 @@ def chunk_rms_level(chunk: bytes | None) -> float:
     """
     Return RMS level of chunk (int16 little-endian) normalized to 0.0--1.0.
     Returns 0.0 for None, empty, or too short chunk; never raises.
+    Uses a vectorized numpy reduction when numpy is available (per-sample Python otherwise).
     """
     if chunk is None or len(chunk) < 2:
         return 0.0
+    n = len(chunk) // 2
     try:
-        n = len(chunk) // 2
-        samples = struct.unpack(f"<{n}h", chunk)
-        total = sum(s * s for s in samples)
+        if np is not None:
+            samples = np.frombuffer(chunk, dtype="<i2", count=n).astype(np.float64)
+            total = float(np.dot(samples, samples))
+        else:
+            samples = struct.unpack(f"<{n}h", chunk[: 2 * n])
+            total = sum(s * s for s in samples)
         rms = (total / n) ** 0.5 if n else 0.0
         return min(1.0, rms / INT16_MAX)
-    except (struct.error, ZeroDivisionError, ValueError) as e:
+    except (struct.error, ZeroDivisionError, ValueError, TypeError) as e:
         logger.debug("chunk_rms_level failed: %s", e)
         return 0.0
 
 
+@functools.lru_cache(maxsize=8)
+def _interp_grid(n: int, num_out: int):
+    """Sample positions (x_old, x_new) for resampling n samples to num_out; read-only, shared."""
+    x_old = np.arange(n, dtype=np.float64)
+    x_new = np.linspace(0, n - 1, num_out, dtype=np.float64)
+    x_old.flags.writeable = False
+    x_new.flags.writeable = False
+    return x_old, x_new
+
+
 def resample_int16(audio_bytes: bytes, rate_in: int, rate_out: int) -> bytes:
     """
     Resample int16 mono PCM from rate_in to rate_out.
@@ -43,17 +64,15 @@ def resample_int16(audio_bytes: bytes, rate_in: int, rate_out: int) -> bytes:
     n = len(audio_bytes) // 2
     if n == 0:
         return b""
-    try:
-        import numpy as np
-    except ImportError:
+    if np is None:
         logger.warning("resample_int16 requires numpy")
         return b""
     samples = np.frombuffer(audio_bytes, dtype=np.int16)
     num_out = int(round(n * rate_out / rate_in))
     if num_out == 0:
         return b""
-    x_old = np.arange(n, dtype=np.float64)
-    x_new = np.linspace(0, n - 1, num_out, dtype=np.float64)
+    # Browser frames have a fixed size, so the grids are computed once per frame length.
+    x_old, x_new = _interp_grid(n, num_out)
     resampled = np.interp(x_new, x_old, samples.astype(np.float64))
     out = np.clip(resampled, -32768, 32767).astype(np.int16)
     return out.tobytes()
@@ -14,8 +14,6 @@ import logging
 from pathlib import Path
 from typing import Any
 
-import yaml
-
 logger = logging.getLogger(__name__)
 
 MANIFEST_FILENAME = "MODULE.yaml"
@@ -30,8 +28,12 @@ def _load_yaml_file(path: Path) -> dict[str, Any]:
     if not path.exists():
         return {}
     try:
+        import yaml
+
+        # libyaml's C loader when PyYAML was built with it (several times faster).
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
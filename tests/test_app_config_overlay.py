@@ -8,8 +8,12 @@ from pathlib import Path
 from unittest.mock import MagicMock
 
 from app.config_overlay import (
+    AUDIO_CALIBRATION_KEYS,
+    CALIBRATION_KEYS,
+    LLM_CALIBRATION_KEYS,
     apply_calibration_overlay,
     apply_llm_calibration_overlay,
+    load_calibration_settings,
 )
 
 
@@ -85,10 +89,8 @@ def test_apply_llm_calibration_overlay_clamps_non_negative() -> None:
 
 def test_apply_llm_calibration_overlay_invalid_falls_back() -> None:
     repo = MagicMock()
-    repo.get = (
-        lambda k: "not_a_number"
-        if k == "calibration_min_transcription_length"
-        else None
+    repo.get = lambda k: (
+        "not_a_number" if k == "calibration_min_transcription_length" else None
     )
     llm_cfg = {"min_transcription_length": 3}
     out = apply_llm_calibration_overlay(llm_cfg, repo)
@@ -110,6 +112,32 @@ def test_apply_llm_calibration_overlay_empty_string_unchanged() -> None:
     assert out["min_transcription_length"] == 4
 
 
+def test_load_calibration_settings_single_get_many() -> None:
+    repo = MagicMock()
+    repo.get_many.return_value = {
+        "calibration_sensitivity": "4.0",
+        "calibration_chunk_duration_sec": None,
+        "calibration_min_transcription_length": "6",
+    }
+    values = load_calibration_settings(repo)
+    repo.get_many.assert_called_once_with(list(CALIBRATION_KEYS))
+    repo.get.assert_not_called()
+    audio = apply_calibration_overlay({"sensitivity": 2.5}, None, values)
+    llm = apply_llm_calibration_overlay({"min_transcription_length": 3}, None, values)
+    assert audio["sensitivity"] == 4.0
+    assert llm["min_transcription_length"] == 6
+
+
+def test_load_calibration_settings_falls_back_to_get() -> None:
+    class _GetOnlyRepo:
+        def get(self, key: str) -> str | None:
+            return "8.0" if key == "calibration_chunk_duration_sec" else None
+
+    values = load_calibration_settings(_GetOnlyRepo())
+    assert values["calibration_chunk_duration_sec"] == "8.0"
+    assert load_calibration_settings(None) == {}
+
+
 def test_create_pipeline_uses_calibration_min_transcription_length() -> None:
     """create_pipeline overlays calibration_min_transcription_length into llm_prompt_config."""
     from persistence.database import init_database
@@ -134,8 +162,15 @@ def test_create_pipeline_uses_calibration_min_transcription_length() -> None:
 
         config = {
             "modules": {"speech": {"prompt": {"system": "S", "user_template": "U"}}},
-            "audio": {"sensitivity": 2.5, "chunk_duration_sec": 7.0, "sample_rate": 16000},
-            "stt": {"engine": "vosk", "vosk": {"model_path": "models/vosk-model-small-en-us-0.15"}},
+            "audio": {
+                "sensitivity": 2.5,
+                "chunk_duration_sec": 7.0,
+                "sample_rate": 16000,
+            },
+            "stt": {
+                "engine": "vosk",
+                "vosk": {"model_path": "models/vosk-model-small-en-us-0.15"},
+            },
             "ollama": {"base_url": "http://localhost:11434", "model_name": "mistral"},
             "profile": {},
             "tts": {"enabled": False},
@@ -148,3 +183,16 @@ def test_create_pipeline_uses_calibration_min_transcription_length() -> None:
         assert pipeline._llm_prompt_config.get("min_transcription_length") == 7
     finally:
         db_path.unlink(missing_ok=True)
+
+
+def test_overlays_read_only_their_own_keys() -> None:
+    repo = MagicMock()
+    repo.get_many.return_value = {"calibration_min_transcription_length": "2"}
+    out = apply_llm_calibration_overlay({"min_transcription_length": 3}, repo)
+    repo.get_many.assert_called_once_with(list(LLM_CALIBRATION_KEYS))
+    assert out["min_transcription_length"] == 2
+    repo.get_many.reset_mock()
+    repo.get_many.return_value = {"calibration_sensitivity": "3.0"}
+    out = apply_calibration_overlay({"sensitivity": 2.5}, repo)
+    repo.get_many.assert_called_once_with(list(AUDIO_CALIBRATION_KEYS))
+    assert out["sensitivity"] == 3.0
@@ -227,3 +227,24 @@ def test_is_open_number_only_negative(
     matcher: BrowseCommandMatcher, utterance: str
 ) -> None:
     assert matcher.is_open_number_only(utterance) is False
+
+
+# ---- classify ----
+@pytest.mark.parametrize(
+    "candidate,expected",
+    [
+        ("search high speed rail", "search"),
+        ("store this page", "store"),
+        ("go back", "go_back"),
+        ("click the third link", "click"),
+        ("scroll down", "scroll"),
+        ("stop browsing", "mode_toggle"),
+        ("close tab", "close_tab"),
+        ("I want water", None),
+        ("", None),
+    ],
+)
+def test_classify_returns_category(
+    matcher: BrowseCommandMatcher, candidate: str, expected: str | None
+) -> None:
+    assert matcher.classify(candidate) == expected
@@ -402,3 +402,50 @@ def test_fetcher_timeout_returns_fetch_result() -> None:
     assert hasattr(result, "error")
     assert result.ok is False
     assert isinstance(result.text, str)
+
+
+# ---- module server ----
+def test_server_execute_runs_intent_llm_off_event_loop() -> None:
+    import threading
+
+    from fastapi.testclient import TestClient
+
+    from modules.browser.server import BrowserModuleServer
+
+    threads: list[str] = []
+
+    class FakeLLM:
+        def generate(self, prompt: str, system: str | None = None) -> str:
+            threads.append(threading.current_thread().name)
+            return '{"action": "search", "query": "cats"}'
+
+    class FakeService:
+        def execute(self, intent: dict, **kwargs) -> str:
+            return f"did {intent.get('action')}"
+
+    server = BrowserModuleServer(config={}, ollama_client=FakeLLM())
+    server._service = FakeService()
+    resp = TestClient(server._app).post("/execute", json={"utterance": "search cats"})
+    assert resp.status_code == 200
+    assert resp.json() == {"result": "did search"}
+    # Ran in the loop's default executor, not on the event loop thread.
+    assert len(threads) == 1 and threads[0].startswith("asyncio")
+
+
+def test_server_execute_fixed_command_skips_llm() -> None:
+    from fastapi.testclient import TestClient
+
+    from modules.browser.server import BrowserModuleServer
+
+    class FakeService:
+        def execute(self, intent: dict, **kwargs) -> str:
+            return f"did {intent.get('action')} {intent.get('link_index')}"
+
+    # No LLM client at all: fixed commands are resolved locally.
+    server = BrowserModuleServer(config={}, ollama_client=None)
+    server._service = FakeService()
+    client = TestClient(server._app)
+    resp = client.post("/execute", json={"utterance": "Click the third link."})
+    assert resp.json() == {"result": "did click_link 3"}
+    resp = client.post("/execute", json={"utterance": "search cats"})
+    assert resp.status_code == 400
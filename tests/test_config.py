@@ -46,6 +46,12 @@ def test_load_yaml_file_invalid_yaml_returns_empty(tmp_path: Path) -> None:
     assert isinstance(result, dict)
 
 
+def test_load_yaml_file_rejects_python_tags(tmp_path: Path) -> None:
+    p = tmp_path / "unsafe.yaml"
+    p.write_text("key: !!python/object/apply:os.getcwd []\n")
+    assert load_yaml_file(p) == {}
+
+
 def test_load_yaml_file_non_dict_returns_empty(tmp_path: Path) -> None:
     p = tmp_path / "list.yaml"
     p.write_text("[1, 2, 3]")
@@ -94,6 +100,28 @@ def test_deep_merge_override_replaces_non_dict() -> None:
     assert isinstance(out["a"], str)
 
 
+def test_deep_merge_several_levels_leaves_inputs_unchanged() -> None:
+    base = {
+        "m": {"speech": {"stt": {"engine": "vosk", "rate": 16000}}, "rag": {"k": 5}}
+    }
+    override = {"m": {"speech": {"stt": {"engine": "whisper"}, "tts": {"on": True}}}}
+    out = config._deep_merge(base, override)
+    assert out == {
+        "m": {
+            "speech": {
+                "stt": {"engine": "whisper", "rate": 16000},
+                "tts": {"on": True},
+            },
+            "rag": {"k": 5},
+        }
+    }
+    assert base["m"]["speech"]["stt"]["engine"] == "vosk"
+    assert "tts" not in base["m"]["speech"]
+    assert override == {
+        "m": {"speech": {"stt": {"engine": "whisper"}, "tts": {"on": True}}}
+    }
+
+
 # ---- load_config ----
 def test_load_config_missing_root_raises(tmp_path: Path) -> None:
     missing = tmp_path / "nonexistent.yaml"
@@ -335,3 +363,37 @@ def test_get_module_configs_by_id_exception_returns_empty_list() -> None:
     ):
         result = config._get_module_configs_by_id()
     assert result == []
+
+
+def test_load_config_cached_until_file_changes(tmp_path: Path) -> None:
+    root = tmp_path / "config.yaml"
+    root.write_text("ollama:\n  model_name: phi\n")
+    config.clear_config_cache()
+    with patch.dict(os.environ, {"TALKIE_CONFIG": str(root)}):
+        with patch.object(config, "_get_module_configs_by_id", return_value=[]):
+            first = load_config()
+            first["ollama"]["model_name"] = "mutated"
+            with patch.object(config, "_load_yaml", side_effect=AssertionError):
+                assert load_config()["ollama"]["model_name"] == "phi"
+            (tmp_path / "config.user.yaml").write_text(
+                "ollama:\n  model_name: mistral\n"
+            )
+            assert load_config()["ollama"]["model_name"] == "mistral"
+
+
+def test_load_config_reuses_json_sidecar(tmp_path: Path) -> None:
+    root = tmp_path / "config.yaml"
+    root.write_text("ollama:\n  model_name: phi\n")
+    with patch.dict(os.environ, {"TALKIE_CONFIG": str(root)}):
+        with patch.object(config, "_get_module_configs_by_id", return_value=[]):
+            config.clear_config_cache()
+            assert load_config()["ollama"]["model_name"] == "phi"
+            assert (tmp_path / ".config.merged.json").exists()
+            config.clear_config_cache()
+            with patch.object(config, "_load_yaml", side_effect=AssertionError):
+                assert load_config()["ollama"]["model_name"] == "phi"
+            (tmp_path / "config.user.yaml").write_text(
+                "ollama:\n  model_name: mistral\n"
+            )
+            config.clear_config_cache()
+            assert load_config()["ollama"]["model_name"] == "mistral"
@@ -8,7 +8,12 @@ from pathlib import Path
 
 import pytest
 
-from curation.curator import CuratorConfig, run_curation
+from curation.curator import (
+    CuratorConfig,
+    _normalize_for_pattern,
+    _normalize_phrase,
+    run_curation,
+)
 from persistence.database import init_database
 from persistence.history_repo import HistoryRepo
 
@@ -97,3 +102,28 @@ def test_run_curation_returns_counts_dict(history_repo: HistoryRepo) -> None:
     for k in counts:
         assert isinstance(counts[k], int)
         assert counts[k] >= 0
+
+
+def test_run_curation_weights_recurring_phrases(
+    history_repo: HistoryRepo, db_path: Path
+) -> None:
+    history_repo.insert_interaction("want water", "I want water.")
+    history_repo.insert_interaction("Want  water!", "i want water")
+    history_repo.insert_interaction("bye", "Goodbye.")
+    run_curation(history_repo, config=CuratorConfig())
+    with sqlite3.connect(str(db_path)) as conn:
+        weights = dict(
+            conn.execute("SELECT original_transcription, weight FROM interactions")
+        )
+    # Repeated response and transcription: 1.0 + 0.5 + 0.5
+    assert weights["want water"] == pytest.approx(2.0)
+    assert weights["Want  water!"] == pytest.approx(2.0)
+    assert weights["bye"] == pytest.approx(1.0)
+
+
+def test_normalizers_collapse_whitespace_and_trailing_punctuation() -> None:
+    assert _normalize_phrase("  I \t want\n  Water. ") == "i want water."
+    assert _normalize_for_pattern("  I \t want\n  Water?!. ") == "i want water"
+    assert _normalize_for_pattern("Wait, what .") == "wait, what "
+    assert _normalize_phrase(None) == ""
+    assert _normalize_for_pattern("") == ""
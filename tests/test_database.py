@@ -10,6 +10,7 @@ import pytest
 
 from persistence.database import (
     get_connection,
+    get_shared_connector,
     init_database,
     with_connection,
 )
@@ -121,6 +122,25 @@ def test_init_database_idempotent(db_path: Path) -> None:
     assert size2 >= size1
 
 
+def test_init_database_skips_ddl_when_user_version_current(db_path: Path) -> None:
+    db_path.unlink(missing_ok=True)
+    init_database(str(db_path))
+    conn = sqlite3.connect(str(db_path))
+    assert conn.execute("PRAGMA user_version").fetchone()[0] != 0
+    conn.execute("DROP TABLE qa_cache")
+    conn.commit()
+    init_database(str(db_path))
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    assert "qa_cache" not in tables
+    # Stale version (older schema or migrations): DDL runs again.
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    init_database(str(db_path))
+    tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    conn.close()
+    assert "qa_cache" in tables
+
+
 def test_init_database_applies_migrations(db_path: Path) -> None:
     db_path.unlink(missing_ok=True)
     init_database(str(db_path))
@@ -146,6 +166,18 @@ def test_get_connection_returns_connection(db_path: Path) -> None:
     conn.close()
 
 
+def test_get_shared_connector_reuses_one_connection(db_path: Path) -> None:
+    init_database(str(db_path))
+    connector = get_shared_connector(str(db_path))
+    conn = connector()
+    assert connector() is conn
+    with_connection(connector, lambda c: c.execute("SELECT 1").fetchone())
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0].upper() == "WAL"
+    conn.close_shared()
+    with pytest.raises(sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
 def test_get_connection_applies_pragmas(db_path: Path) -> None:
     init_database(str(db_path))
     conn = get_connection(str(db_path))
@@ -171,3 +171,12 @@ def test_export_for_finetuning_creates_parent_directory(
     assert nested.exists()
     lines = nested.read_text().strip().split("\n")
     assert len(lines) >= 1
+
+
+def test_encode_line_same_with_and_without_orjson(monkeypatch) -> None:
+    rec = {"instruction": "Base.", "input": "café", "output": 'Say "hi" ☺'}
+    line = export_module._encode_line(rec)
+    monkeypatch.setattr(export_module, "orjson", None)
+    assert export_module._encode_line(rec) == line
+    assert line.endswith(b"\n")
+    assert json.loads(line) == rec
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 import sqlite3
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch
@@ -73,6 +75,17 @@ def test_resolve_db_path_file_not_found_exits() -> None:
     assert exc_info.value.code == 1
 
 
+def test_repo_reuses_one_connection(tmp_path: Path) -> None:
+    repo = history_cmd._repo(tmp_path / "data" / "talkie.db")
+    conn = repo._connector()
+    assert repo._connector() is conn
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    uid = repo.insert_interaction("hello", "Hi.")
+    repo.update_correction(uid, "Hello!")
+    assert history_cmd._item_at_index(repo, 1)[0]["corrected_response"] == "Hello!"
+    conn.close_shared()
+
+
 def test_item_at_index_returns_record_and_id(repo: HistoryRepo) -> None:
     repo.insert_interaction("hello", "Hi there.")
     repo.insert_interaction("bye", "Goodbye.")
@@ -125,6 +138,33 @@ def test_cmd_list_prints_numbered_newest_first(
     assert "First response" in out
 
 
+def test_cmd_list_truncates_long_text(
+    repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repo.insert_interaction("a" * 100, "  b  ")
+    history_cmd.cmd_list(repo, limit=10)
+    out, _ = capsys.readouterr()
+    lines = out.splitlines()
+    assert lines[0].endswith("a" * (history_cmd.LIST_PREVIEW_LEN - 1) + "\u2026")
+    assert lines[1] == "       b"
+
+
+def test_cmd_list_writes_rows_in_blocks(
+    repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
+) -> None:
+    n = history_cmd.LIST_WRITE_ROWS + 5
+    for i in range(n):
+        repo.insert_interaction(f"t{i}", f"r{i}")
+    with patch.object(sys.stdout, "write", wraps=sys.stdout.write) as write_m:
+        history_cmd.cmd_list(repo, limit=1000)
+    assert write_m.call_count == 2
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2 * n
+    assert lines[0].startswith("    1  ") and lines[0].endswith(f"t{n - 1}")
+    assert lines[1] == f"       r{n - 1}"
+    assert lines[-2].startswith(f"{n:5}  ") and lines[-2].endswith("t0")
+
+
 def test_cmd_view_prints_full_record(
     repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -147,55 +187,48 @@ def test_cmd_view_out_of_range_exits(repo: HistoryRepo) -> None:
 
 
 def test_cmd_edit_calls_update_correction_with_edited_content(
-    repo: HistoryRepo, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
 ) -> None:
     repo.insert_interaction("orig", "LLM said this.")
-    rec = repo.list_recent(limit=1)[0]
-    interaction_id = rec["id"]
-    edit_file = tmp_path / "edit.txt"
     edited_content = "User corrected this."
+    seen: list[Path] = []
 
-    class MockTempFile:
-        def __enter__(self):
-            self.f = type(
-                "F",
-                (),
-                {
-                    "name": str(edit_file),
-                    "write": lambda self, s: edit_file.write_text(s),
-                },
-            )()
-            return self.f
-
-        def __exit__(self, *args):
-            pass
-
-    def open_mock(path, mode="r", encoding=None, **kwargs):
-        if path == str(edit_file) and "r" in mode:
-            return type(
-                "F",
-                (),
-                {
-                    "read": lambda self: edited_content,
-                    "__enter__": lambda self: self,
-                    "__exit__": lambda self, *a: None,
-                },
-            )()
-        return open(path, mode, encoding=encoding or "utf-8", **kwargs)
-
-    with patch("history_cmd._item_at_index", return_value=(rec, interaction_id)):
-        with patch("history_cmd.subprocess.run"):
-            with patch(
-                "history_cmd.tempfile.NamedTemporaryFile", return_value=MockTempFile()
-            ):
-                with patch("builtins.open", side_effect=open_mock):
-                    with patch("os.unlink"):
-                        history_cmd.cmd_edit(repo, 1)
+    def fake_editor(editor: str, path: str) -> None:
+        p = Path(path)
+        assert p.read_text(encoding="utf-8") == "LLM said this."
+        p.write_text(edited_content + "\n", encoding="utf-8")
+        seen.append(p)
+
+    with patch("history_cmd._run_editor", side_effect=fake_editor):
+        history_cmd.cmd_edit(repo, 1)
     rows = repo.list_recent(limit=1)
     assert len(rows) == 1
     assert rows[0].get("corrected_response") == edited_content
     out, _ = capsys.readouterr()
     assert "Updated correction" in out
+    # Temp file and its directory are gone.
+    assert len(seen) == 1 and not seen[0].parent.exists()
+
+
+def test_cmd_edit_without_changes_skips_update(
+    repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
+) -> None:
+    repo.insert_interaction("orig", "LLM said this.")
+    with patch("history_cmd._run_editor"):
+        with patch.object(repo, "update_correction") as update_m:
+            history_cmd.cmd_edit(repo, 1)
+    update_m.assert_not_called()
+    assert "No changes." in capsys.readouterr().out
+
+
+@pytest.mark.skipif(not hasattr(os, "posix_spawnp"), reason="POSIX only")
+def test_run_editor_waits_and_checks_exit_status(tmp_path: Path) -> None:
+    path = tmp_path / "edit.txt"
+    history_cmd._run_editor("touch", str(path))
+    assert path.exists()
+    with pytest.raises(subprocess.CalledProcessError) as exc_info:
+        history_cmd._run_editor("false", str(path))
+    assert exc_info.value.returncode == 1
 
 
 def test_main_no_args_exits_with_usage() -> None:
@@ -244,3 +277,47 @@ def test_main_view_invalid_n_exits() -> None:
                 with pytest.raises(SystemExit) as exc_info:
                     history_cmd.main()
     assert exc_info.value.code == 1
+
+
+class _BatchLLM:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, str | None]] = []
+
+    def generate(self, prompt: str, system: str | None = None) -> str:
+        self.calls.append((prompt, system))
+        n = prompt.count("\n") + 1
+        return "[" + ", ".join(f'"Sentence {i}."' for i in range(1, n + 1)) + "]"
+
+
+def test_cmd_replay_batches_transcriptions_per_request(
+    repo: HistoryRepo, capsys: pytest.CaptureFixture[str]
+) -> None:
+    for i in range(10):
+        repo.insert_interaction(f"raw {i}", f"Old {i}.")
+    llm = _BatchLLM()
+    history_cmd.cmd_replay(
+        repo,
+        llm,
+        {
+            "regeneration_request_certainty": False,
+            "regeneration_user_prompt_template": "Fix: {transcription}",
+        },
+        limit=10,
+    )
+    assert [p.count("\n") + 1 for p, _ in llm.calls] == [
+        history_cmd.REPLAY_BATCH_SIZE,
+        10 - history_cmd.REPLAY_BATCH_SIZE,
+    ]
+    assert llm.calls[0][0].startswith("[1] Fix: raw 9\n[2] Fix: raw 8")
+    out = capsys.readouterr().out
+    assert "    1  raw 9\n       was: Old 9.\n       now: Sentence 1.\n" in out
+    assert "   10  raw 0\n       was: Old 0.\n       now: Sentence 2.\n" in out
+
+
+def test_main_replay_invalid_n_exits() -> None:
+    with patch.object(sys, "argv", ["history_cmd.py", "replay", "x"]):
+        with patch("history_cmd._resolve_db_path"):
+            with patch("history_cmd._repo"):
+                with pytest.raises(SystemExit) as exc_info:
+                    history_cmd.main()
+    assert exc_info.value.code == 1
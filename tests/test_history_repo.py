@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
@@ -200,6 +201,30 @@ def test_list_recent_legacy_schema_7_columns(db_path: Path) -> None:
     assert recent[0]["weight"] is None
 
 
+def test_get_by_recent_index_matches_list_recent(repo: HistoryRepo) -> None:
+    for i in range(5):
+        repo.insert_interaction(f"t{i}", f"r{i}")
+    recent = repo.list_recent(limit=10)
+    for i, rec in enumerate(recent):
+        assert repo.get_by_recent_index(i) == rec
+    assert repo.get_by_recent_index(5) is None
+    assert repo.get_by_recent_index(-1) is None
+
+
+def test_iter_recent_previews_trims_and_truncates_in_sql(repo: HistoryRepo) -> None:
+    repo.insert_interaction("  short\n", "x" * 61)
+    uid = repo.insert_interaction("y" * 60, "\tcaf\u00e9 " * 20)
+    rows = list(repo.iter_recent_previews(limit=10, preview_len=60))
+    assert len(rows) == 2
+    rid, created, orig, resp = rows[0]
+    assert rid == uid
+    assert len(created) == 19
+    assert orig == "y" * 60
+    assert len(resp) == 60
+    assert resp.startswith("caf\u00e9") and resp.endswith("\u2026")
+    assert rows[1][2:] == ("short", "x" * 59 + "\u2026")
+
+
 # ---- list_for_curation ----
 def test_list_for_curation_returns_records_oldest_first(
     repo: HistoryRepo, db_path: Path
@@ -233,6 +258,23 @@ def test_list_for_curation_respects_limit(repo: HistoryRepo, db_path: Path) -> N
 def test_list_for_curation_empty_db(repo: HistoryRepo) -> None:
     rows = repo.list_for_curation(limit=100)
     assert rows == []
+
+
+# ---- list_for_export ----
+def test_list_for_export_orders_best_first_within_oldest_rows(
+    repo: HistoryRepo,
+) -> None:
+    plain = repo.insert_interaction("plain", "P")
+    heavy = repo.insert_interaction("heavy", "H")
+    corrected = repo.insert_interaction("corrected", "C")
+    light = repo.insert_interaction("light", "L")
+    newest = repo.insert_interaction("newest", "N")
+    repo.update_weights_batch([(heavy, 5.0), (light, 0.5), (newest, 9.0)])
+    repo.update_correction(corrected, "Fixed.")
+    rows = repo.list_for_export(limit=4)
+    assert [r["id"] for r in rows] == [corrected, heavy, light, plain]
+    rows = repo.list_for_export(limit=4, min_weight=0.5)
+    assert [r["id"] for r in rows] == [heavy, light]
     assert isinstance(rows, list)
 
 
@@ -402,3 +444,92 @@ def test_delete_interactions_removes_ids(repo: HistoryRepo, db_path: Path) -> No
     ids = [r["id"] for r in recent]
     assert u1 not in ids
     assert u2 in ids
+
+
+def test_delete_interactions_more_ids_than_one_statement(repo: HistoryRepo) -> None:
+    ids = [repo.insert_interaction(f"t{i}", f"R{i}") for i in range(1200)]
+    n = repo.delete_interactions(ids[:1100] + [999_999])
+    assert n == 1100
+    assert [r["id"] for r in repo.list_recent(limit=200)] == ids[:1099:-1]
+
+
+# ---- enqueue_interaction (write-behind) ----
+def test_enqueue_interaction_ids_follow_existing_rows(repo: HistoryRepo) -> None:
+    first = repo.insert_interaction("a", "A")
+    queued = [repo.enqueue_interaction(f"q{i}", f"Q{i}") for i in range(3)]
+    assert [f.result(timeout=5) for f in queued] == [first + 1, first + 2, first + 3]
+    by_id = {r["id"]: r for r in repo.list_recent(limit=10)}
+    assert by_id[first + 2]["llm_response"] == "Q1"
+
+
+def test_enqueue_interaction_visible_to_updates(repo: HistoryRepo) -> None:
+    pending = repo.enqueue_interaction("orig", "Said this.")
+    repo.flush()
+    repo.update_correction(pending.result(timeout=0), "Corrected.")
+    assert repo.get_corrections_for_profile() == [("Said this.", "Corrected.")]
+
+
+def test_enqueue_interaction_two_repos_same_file_do_not_collide(
+    repo: HistoryRepo, db_path: Path
+) -> None:
+    other = HistoryRepo(lambda: sqlite3.connect(str(db_path)))
+    futures = [
+        r.enqueue_interaction(f"q{i}", f"Q{i}") for i in range(5) for r in (repo, other)
+    ]
+    ids = [f.result(timeout=5) for f in futures]
+    assert len(set(ids)) == 10
+    assert len(repo.list_recent(limit=20)) == 10
+
+
+def test_enqueue_interaction_failed_batch_keeps_good_rows(db_path: Path) -> None:
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.executescript(_SCHEMA)
+        conn.execute(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON interactions"
+            " WHEN NEW.llm_response = 'bad' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+    gate = threading.Event()
+
+    def connector() -> sqlite3.Connection:
+        gate.wait(timeout=5)
+        return sqlite3.connect(str(db_path))
+
+    repo = HistoryRepo(connector)
+    # The writer holds the first row at the gate, so the next three share one batch.
+    held = repo.enqueue_interaction("x", "X")
+    futures = [
+        repo.enqueue_interaction(t, r)
+        for t, r in (("a", "A"), ("b", "bad"), ("c", "C"))
+    ]
+    gate.set()
+    repo.flush()
+    assert held.result(timeout=0) > 0
+    assert futures[0].result(timeout=0) > 0
+    assert futures[2].result(timeout=0) > 0
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[1].result(timeout=0)
+    stored = sorted(r["llm_response"] for r in repo.list_recent(limit=10))
+    assert stored == ["A", "C", "X"]
+
+
+def test_flush_without_pending_writes_skips_the_queue(
+    repo: HistoryRepo, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo.enqueue_interaction("q", "Q").result(timeout=5)
+    repo.flush()
+    q = repo._write_queue
+    assert q is not None
+
+    def no_put(_item: object) -> None:
+        raise AssertionError("flush queued a sentinel with nothing pending")
+
+    monkeypatch.setattr(q, "put", no_put)
+    assert [r["llm_response"] for r in repo.list_recent(limit=1)] == ["Q"]
+
+
+def test_insert_interaction_after_enqueue_does_not_collide(repo: HistoryRepo) -> None:
+    queued = repo.enqueue_interaction("q", "Q")
+    inserted = repo.insert_interaction("s", "S")
+    again = repo.enqueue_interaction("q2", "Q2")
+    assert len({queued.result(timeout=5), inserted, again.result(timeout=5)}) == 3
+    assert len(repo.list_recent(limit=10)) == 3
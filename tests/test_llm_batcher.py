@@ -0,0 +1,164 @@
+"""Tests for llm.batcher: RequestBatcher, get_shared_batcher, BatchedOllamaClient."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from llm.batcher import BatchedOllamaClient, RequestBatcher, get_shared_batcher
+from llm.client import FALLBACK_MESSAGE
+
+
+@pytest.fixture
+def make_batcher() -> Iterator:
+    """Build RequestBatchers that are closed when the test ends."""
+    made: list[RequestBatcher] = []
+
+    def make(**kwargs) -> RequestBatcher:
+        batcher = RequestBatcher(**kwargs)
+        made.append(batcher)
+        return batcher
+
+    yield make
+    for batcher in made:
+        batcher.close()
+
+
+def test_request_batcher_returns_results_in_order_of_submit(make_batcher) -> None:
+    batcher = make_batcher(batch_window_ms=5, max_batch=4)
+    futures = [batcher.submit(lambda i=i: f"reply {i}") for i in range(6)]
+    assert [f.result(timeout=5) for f in futures] == [f"reply {i}" for i in range(6)]
+
+
+def test_request_batcher_runs_batch_concurrently(make_batcher) -> None:
+    batcher = make_batcher(batch_window_ms=20, max_batch=3)
+    barrier = threading.Barrier(3, timeout=5)
+
+    def call() -> str:
+        barrier.wait()
+        return "ok"
+
+    futures = [batcher.submit(call) for _ in range(3)]
+    assert [f.result(timeout=5) for f in futures] == ["ok", "ok", "ok"]
+
+
+def test_request_batcher_limits_in_flight_requests(make_batcher) -> None:
+    batcher = make_batcher(batch_window_ms=0, max_batch=2)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def call() -> str:
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return "ok"
+
+    futures = [batcher.submit(call) for _ in range(6)]
+    for f in futures:
+        f.result(timeout=5)
+    assert in_flight[1] <= 2
+
+
+def test_request_batcher_propagates_exceptions(make_batcher) -> None:
+    batcher = make_batcher(batch_window_ms=0, max_batch=1)
+
+    def boom() -> str:
+        raise ValueError("boom")
+
+    future = batcher.submit(boom)
+    try:
+        future.result(timeout=5)
+    except ValueError as e:
+        assert str(e) == "boom"
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_get_shared_batcher_same_base_url_returns_same_instance() -> None:
+    a = get_shared_batcher("http://shared-test:11434/")
+    b = get_shared_batcher("http://shared-test:11434")
+    c = get_shared_batcher("http://other-test:11434")
+    assert a is b
+    assert a is not c
+    a.close()
+    c.close()
+
+
+def test_batched_client_generate_goes_through_batcher() -> None:
+    client = BatchedOllamaClient(
+        base_url="http://batched-test:11434", model_name="mistral", max_retries=0
+    )
+    with patch("llm.client.OllamaClient.generate", return_value="Hi.") as gen:
+        assert client.generate("hello", "sys") == "Hi."
+    gen.assert_called_once_with(client, "hello", "sys")
+    client._batcher.close()
+
+
+def test_batched_client_keeps_fallback_on_error() -> None:
+    import requests
+
+    client = BatchedOllamaClient(
+        base_url="http://batched-fail:11434", model_name="mistral", max_retries=0
+    )
+    client._resolved_model = "mistral:latest"
+    with patch(
+        "llm.client.requests.Session.post", side_effect=requests.ConnectionError("x")
+    ):
+        assert client.generate("hello") == FALLBACK_MESSAGE
+    client._batcher.close()
+
+
+def test_request_batcher_lone_request_skips_window(make_batcher) -> None:
+    batcher = make_batcher(batch_window_ms=2000, max_batch=4)
+    started = time.monotonic()
+    assert batcher.submit(lambda: "ok").result(timeout=5) == "ok"
+    assert time.monotonic() - started < 1.0
+
+
+def test_request_batcher_close_runs_queued_then_rejects() -> None:
+    batcher = RequestBatcher(batch_window_ms=0, max_batch=1)
+    futures = [batcher.submit(lambda i=i: str(i)) for i in range(3)]
+    batcher.close()
+    assert [f.result(timeout=0) for f in futures] == ["0", "1", "2"]
+    assert not batcher._thread.is_alive()
+    with pytest.raises(RuntimeError):
+        batcher.submit(lambda: "late")
+    batcher.close()
+
+
+def test_get_shared_batcher_conflicting_settings_raise() -> None:
+    a = get_shared_batcher("http://conflict-test:11434", batch_window_ms=5, max_batch=2)
+    try:
+        assert get_shared_batcher("http://conflict-test:11434", 5, 2) is a
+        with pytest.raises(ValueError):
+            get_shared_batcher("http://conflict-test:11434", 5, 3)
+    finally:
+        a.close()
+    b = get_shared_batcher("http://conflict-test:11434", batch_window_ms=5, max_batch=3)
+    assert b is not a
+    b.close()
+
+
+def test_batched_client_generate_stream_holds_a_slot() -> None:
+    client = BatchedOllamaClient(
+        base_url="http://batched-stream:11434", model_name="mistral", max_batch=1
+    )
+
+    def fake_stream(self, prompt, system=None, cancel=None):
+        assert not client._batcher._slots.acquire(blocking=False)
+        yield "Hi."
+
+    try:
+        with patch("llm.client.OllamaClient.generate_stream", fake_stream):
+            assert list(client.generate_stream("hello")) == ["Hi."]
+        assert client._batcher._slots.acquire(blocking=False)
+        client._batcher._slots.release()
+    finally:
+        client._batcher.close()
@@ -14,6 +14,13 @@ from llm.client import (
 )
 
 
+def _response(status_code: int, content: bytes) -> requests.Response:
+    r = requests.Response()
+    r.status_code = status_code
+    r._content = content
+    return r
+
+
 @pytest.fixture
 def client() -> OllamaClient:
     return OllamaClient(
@@ -49,6 +56,16 @@ def test_ollama_client_init_options_merge() -> None:
     assert "num_predict" in c._options
 
 
+def test_ollama_client_pools_connections_in_one_session(client: OllamaClient) -> None:
+    from llm.client import POOL_MAXSIZE
+
+    adapter = client._session.get_adapter(client.base_url)
+    assert adapter._pool_maxsize == POOL_MAXSIZE
+    with patch.object(client._session, "close") as close_m:
+        client.close()
+    close_m.assert_called_once()
+
+
 def test_set_debug_log_and_debug(client: OllamaClient) -> None:
     lines: list[str] = []
 
@@ -70,8 +87,20 @@ def test_debug_no_callback_no_op(client: OllamaClient) -> None:
     client._debug("ignored")
 
 
+def test_debug_formats_args_only_with_callback(client: OllamaClient) -> None:
+    class _Boom:
+        def __str__(self) -> str:
+            raise AssertionError("formatted without a debug callback")
+
+    client._debug("value %s", _Boom())
+    lines: list[str] = []
+    client.set_debug_log(lines.append)
+    client._debug("Ollama HTTP %s (%.2fs)", 200, 0.5)
+    assert lines == ["Ollama HTTP 200 (0.50s)"]
+
+
 def test_check_connection_200_returns_true(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 200
         result = client.check_connection(timeout_sec=1.0)
         assert result is True
@@ -81,21 +110,21 @@ def test_check_connection_200_returns_true(client: OllamaClient) -> None:
 
 
 def test_check_connection_non_200_returns_false(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 404
         result = client.check_connection(timeout_sec=1.0)
         assert result is False
 
 
 def test_check_connection_request_exception_returns_false(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.side_effect = requests.RequestException("network error")
         result = client.check_connection(timeout_sec=1.0)
         assert result is False
 
 
 def test_check_model_available_200_with_model(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 200
         m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
         result = client.check_model_available(timeout_sec=1.0)
@@ -103,7 +132,7 @@ def test_check_model_available_200_with_model(client: OllamaClient) -> None:
 
 
 def test_check_model_available_200_without_model(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 200
         m.return_value.json.return_value = {"models": [{"name": "phi:latest"}]}
         result = client.check_model_available(timeout_sec=1.0)
@@ -111,21 +140,33 @@ def test_check_model_available_200_without_model(client: OllamaClient) -> None:
 
 
 def test_check_model_available_non_200_returns_false(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 500
         result = client.check_model_available(timeout_sec=1.0)
         assert result is False
 
 
+def test_tagged_model_name_matches_on_base_name() -> None:
+    c = OllamaClient(base_url="http://test:11434", model_name="mistral:7b")
+    assert c._model_base == "mistral"
+    with patch("llm.client.requests.Session.get") as m:
+        m.return_value.status_code = 200
+        m.return_value.json.return_value = {
+            "models": [{"name": "mistralite:latest"}, {"name": "mistral:latest"}]
+        }
+        assert c.check_model_available() is True
+        assert c._get_model_for_api() == "mistral:latest"
+
+
 def test_get_model_for_api_resolved_cached(client: OllamaClient) -> None:
     client._resolved_model = "mistral:latest"
-    with patch("llm.client.requests.get"):
+    with patch("llm.client.requests.Session.get"):
         result = client._get_model_for_api()
         assert result == "mistral:latest"
 
 
 def test_get_model_for_api_resolves_from_tags(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 200
         m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
         result = client._get_model_for_api()
@@ -134,7 +175,7 @@ def test_get_model_for_api_resolves_from_tags(client: OllamaClient) -> None:
 
 
 def test_get_model_for_api_non_200_returns_config_name(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.return_value.status_code = 500
         result = client._get_model_for_api()
         assert result == "mistral"
@@ -143,19 +184,57 @@ def test_get_model_for_api_non_200_returns_config_name(client: OllamaClient) ->
 def test_get_model_for_api_request_exception_returns_config_name(
     client: OllamaClient,
 ) -> None:
-    with patch("llm.client.requests.get") as m:
+    with patch("llm.client.requests.Session.get") as m:
         m.side_effect = requests.RequestException()
         result = client._get_model_for_api()
         assert result == "mistral"
 
 
+def test_tags_fetched_once_for_checks_and_model_resolution(
+    client: OllamaClient,
+) -> None:
+    with patch("llm.client.requests.Session.get") as m:
+        m.return_value.status_code = 200
+        m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
+        assert client.check_connection() is True
+        assert client.check_model_available() is True
+        assert client._get_model_for_api() == "mistral:latest"
+        assert m.call_count == 1
+        # Stale listing is fetched again.
+        names, fetched_at = client._tags_cache
+        client._tags_cache = (names, fetched_at - 60.0)
+        assert client.check_model_available() is True
+        assert m.call_count == 2
+
+
+def test_tags_failure_is_not_cached(client: OllamaClient) -> None:
+    with patch("llm.client.requests.Session.get") as m:
+        m.return_value.status_code = 503
+        assert client.check_connection() is False
+        m.return_value.status_code = 200
+        m.return_value.json.return_value = {"models": []}
+        assert client.check_connection() is True
+        assert m.call_count == 2
+
+
+def test_check_model_available_miss_is_not_cached(client: OllamaClient) -> None:
+    with patch("llm.client.requests.Session.get") as m:
+        m.return_value.status_code = 200
+        m.return_value.json.return_value = {"models": [{"name": "phi:latest"}]}
+        assert client.check_model_available() is False
+        # The model is pulled: the next check fetches a fresh listing.
+        m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
+        assert client.check_model_available() is True
+        assert m.call_count == 2
+
+
 def test_generate_success_returns_reply(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as get_m:
+    with patch("llm.client.requests.Session.get") as get_m:
         get_m.return_value.status_code = 200
         get_m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
-        with patch("llm.client.requests.post") as post_m:
+        with patch("llm.client.requests.Session.post") as post_m:
             post_m.return_value.status_code = 200
-            post_m.return_value.json.return_value = {"response": "  Hello world.  "}
+            post_m.return_value.content = b'{"response": "  Hello world.  "}'
             post_m.return_value.raise_for_status = lambda: None
             result = client.generate("hi", system="You are helpful.")
             assert result == "Hello world."
@@ -166,54 +245,166 @@ def test_generate_success_returns_reply(client: OllamaClient) -> None:
             assert payload.get("system") == "You are helpful."
 
 
+def test_generate_parses_with_stdlib_json_without_orjson(
+    client: OllamaClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    monkeypatch.setattr("llm.client._loads", json.loads)
+    client._resolved_model = "mistral:latest"
+    with patch("llm.client.requests.Session.post") as post_m:
+        post_m.return_value.content = '{"response": "Caf\u00e9."}'.encode()
+        post_m.return_value.raise_for_status = lambda: None
+        assert client.generate("hi") == "Caf\u00e9."
+
+
+def test_generate_accepts_nan_in_reply_body(client: OllamaClient) -> None:
+    client._resolved_model = "mistral:latest"
+    with patch("llm.client.requests.Session.post") as post_m:
+        post_m.return_value.content = b'{"response": "Hello.", "eval_rate": NaN}'
+        post_m.return_value.raise_for_status = lambda: None
+        assert client.generate("hi") == "Hello."
+        assert post_m.call_count == 1
+
+
+def test_generate_invalid_json_is_retried(client: OllamaClient) -> None:
+    client._resolved_model = "mistral:latest"
+    with patch("llm.client.requests.Session.post") as post_m:
+        post_m.return_value.content = b"<html>proxy error</html>"
+        post_m.return_value.raise_for_status = lambda: None
+        assert client.generate("hi") == FALLBACK_MESSAGE
+        assert post_m.call_count == client.max_retries + 1
+
+
 def test_generate_empty_response_returns_fallback(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as get_m:
+    with patch("llm.client.requests.Session.get") as get_m:
         get_m.return_value.status_code = 200
         get_m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
-        with patch("llm.client.requests.post") as post_m:
+        with patch("llm.client.requests.Session.post") as post_m:
             post_m.return_value.status_code = 200
-            post_m.return_value.json.return_value = {"response": ""}
+            post_m.return_value.content = b'{"response": ""}'
             post_m.return_value.raise_for_status = lambda: None
             result = client.generate("hi")
             assert result == FALLBACK_MESSAGE
 
 
 def test_generate_500_memory_error_returns_memory_message(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as get_m:
+    with patch("llm.client.requests.Session.get") as get_m:
         get_m.return_value.status_code = 200
         get_m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
-        with patch("llm.client.requests.post") as post_m:
+        with patch("llm.client.requests.Session.post") as post_m:
             err = requests.HTTPError()
-            err.response = type(
-                "R", (), {"status_code": 500, "text": '{"error": "system memory"}'}
-            )()
+            err.response = _response(500, b'{"error": "system memory"}')
             post_m.side_effect = err
             result = client.generate("hi")
             assert result == MEMORY_ERROR_MESSAGE
 
 
 def test_generate_500_non_memory_returns_fallback(client: OllamaClient) -> None:
-    with patch("llm.client.requests.get") as get_m:
+    with patch("llm.client.requests.Session.get") as get_m:
         get_m.return_value.status_code = 200
         get_m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
-        with patch("llm.client.requests.post") as post_m:
+        with patch("llm.client.requests.Session.post") as post_m:
             err = requests.HTTPError()
-            err.response = type(
-                "R", (), {"status_code": 500, "text": "internal error"}
-            )()
+            err.response = _response(500, b"internal error")
             post_m.side_effect = err
             result = client.generate("hi")
             assert result == FALLBACK_MESSAGE
 
 
+@pytest.mark.parametrize("body", [b"out of memory (not json)", b'["memory"]'])
+def test_generate_500_memory_text_without_json_returns_fallback(
+    client: OllamaClient, body: bytes
+) -> None:
+    client._resolved_model = "mistral:latest"
+    with patch("llm.client.requests.Session.post") as post_m:
+        err = requests.HTTPError()
+        err.response = _response(500, body)
+        post_m.side_effect = err
+        assert client.generate("hi") == FALLBACK_MESSAGE
+
+
 def test_generate_request_exception_after_retries_returns_fallback(
     client: OllamaClient,
 ) -> None:
-    with patch("llm.client.requests.get") as get_m:
+    with patch("llm.client.requests.Session.get") as get_m:
         get_m.return_value.status_code = 200
         get_m.return_value.json.return_value = {"models": [{"name": "mistral:latest"}]}
-        with patch("llm.client.requests.post") as post_m:
+        with patch("llm.client.requests.Session.post") as post_m:
             post_m.side_effect = requests.RequestException("timeout")
             result = client.generate("hi")
             assert result == FALLBACK_MESSAGE
             assert post_m.call_count >= 1
+
+
+def test_generate_stream_yields_fragments_until_done(client: OllamaClient) -> None:
+    client._resolved_model = "mistral:latest"
+    lines = [
+        b'{"response": "Hello", "done": false}',
+        b"",
+        b'{"response": " world.", "done": false}',
+        b'{"response": "", "done": true}',
+    ]
+    with patch("llm.client.requests.Session.post") as post_m:
+        r = post_m.return_value.__enter__.return_value
+        r.status_code = 200
+        r.raise_for_status = lambda: None
+        r.iter_lines.return_value = iter(lines)
+        assert list(client.generate_stream("hi", system="sys")) == ["Hello", " world."]
+        payload = post_m.call_args[1]["json"]
+        assert payload.get("stream") is True
+        assert payload.get("system") == "sys"
+        assert post_m.call_args[1]["stream"] is True
+
+
+def test_generate_stream_request_exception_yields_nothing(client: OllamaClient) -> None:
+    client._resolved_model = "mistral:latest"
+    with patch("llm.client.requests.Session.post") as post_m:
+        post_m.side_effect = requests.RequestException("timeout")
+        assert list(client.generate_stream("hi")) == []
+
+
+def test_generate_stream_error_after_fragments_is_raised(client: OllamaClient) -> None:
+    client._resolved_model = "mistral:latest"
+
+    def lines():
+        yield b'{"response": "Half", "done": false}'
+        raise requests.ConnectionError("connection reset")
+
+    with patch("llm.client.requests.Session.post") as post_m:
+        r = post_m.return_value.__enter__.return_value
+        r.status_code = 200
+        r.raise_for_status = lambda: None
+        r.iter_lines.return_value = lines()
+        out = []
+        with pytest.raises(requests.ConnectionError):
+            for fragment in client.generate_stream("hi"):
+                out.append(fragment)
+        assert out == ["Half"]
+
+
+def test_generate_stream_stops_when_cancelled(client: OllamaClient) -> None:
+    import threading
+
+    client._resolved_model = "mistral:latest"
+    cancel = threading.Event()
+    lines = [
+        b'{"response": "One", "done": false}',
+        b'{"response": " two", "done": false}',
+        b'{"response": " three", "done": true}',
+    ]
+    with patch("llm.client.requests.Session.post") as post_m:
+        r = post_m.return_value.__enter__.return_value
+        r.status_code = 200
+        r.raise_for_status = lambda: None
+        r.iter_lines.return_value = iter(lines)
+        out = []
+        for fragment in client.generate_stream("hi", cancel=cancel):
+            out.append(fragment)
+            cancel.set()
+        assert out == ["One"]
+        assert post_m.return_value.__exit__.called
+    # Already cancelled: no request at all.
+    with patch("llm.client.requests.Session.post") as post_m:
+        assert list(client.generate_stream("hi", cancel=cancel)) == []
+        assert not post_m.called
@@ -5,18 +5,29 @@ from __future__ import annotations
 import pytest
 
 from llm.prompts import (
+    DEFAULT_SYSTEM_BASE,
+    REGENERATION_JSON_SUFFIX,
+    build_batched_regeneration_prompts,
     build_browse_intent_prompts,
     build_document_qa_system_prompt,
+    build_document_qa_system_prompt_parts,
     build_document_qa_user_prompt,
+    build_dynamic_system_suffix,
     build_regeneration_prompts,
+    build_static_system_prefix,
     build_system_prompt,
     build_user_prompt,
     build_web_mode_prompts,
+    clear_parse_caches,
+    fill_transcription_template,
     normalize_browse_utterance,
+    parse_batched_regeneration_response,
     parse_browse_intent,
     parse_regeneration_response,
     parse_web_mode_command,
+    regeneration_prompt_parts,
     strip_certainty_from_response,
+    try_local_browse_intent,
 )
 
 
@@ -28,6 +39,12 @@ def test_build_system_prompt_empty_profile_returns_base() -> None:
     assert "Base text" in out
 
 
+def test_build_system_prompt_without_config_or_context_is_default() -> None:
+    assert build_system_prompt(None) is DEFAULT_SYSTEM_BASE
+    assert build_system_prompt("", "", "", "") is DEFAULT_SYSTEM_BASE
+    assert build_system_prompt("  ") == DEFAULT_SYSTEM_BASE
+
+
 def test_build_system_prompt_with_profile_appends() -> None:
     out = build_system_prompt(
         profile_context="User prefers short sentences.",
@@ -61,6 +78,23 @@ def test_build_system_prompt_with_retrieved_context() -> None:
     assert "Doc excerpt here" in out
 
 
+def test_build_system_prompt_is_static_prefix_then_dynamic_suffix() -> None:
+    prefix = build_static_system_prefix(" Profile. ", system_base="Base.")
+    assert prefix == "Base.\n\nProfile."
+    assert build_dynamic_system_suffix() == ""
+    suffix = build_dynamic_system_suffix("User: hi", "Doc excerpt.")
+    # Conversation changes every turn: it comes after the retrieved background.
+    assert suffix.index("Doc excerpt.") < suffix.index("Recent conversation")
+    out = build_system_prompt(
+        " Profile. ",
+        system_base="Base.",
+        retrieved_context="Doc excerpt.",
+        conversation_context="User: hi",
+    )
+    assert out == prefix + "\n\n" + suffix
+    assert build_system_prompt(" Profile. ", system_base="Base.") == prefix
+
+
 def test_build_system_prompt_default_base_when_empty() -> None:
     out = build_system_prompt(profile_context=None, system_base="")
     assert len(out) > 0
@@ -97,6 +131,109 @@ def test_build_regeneration_prompts_request_certainty_appends_json() -> None:
     assert "sentence" in sys_p.lower()
 
 
+@pytest.mark.parametrize(
+    "template",
+    [
+        "Phrase: {transcription}",
+        "{transcription} <- fix this",
+        "No placeholder",
+        "No placeholder but {{braces}}",
+        "Say {{literally}}: {transcription}",
+        "{transcription} and again {transcription}",
+    ],
+)
+def test_fill_transcription_template_matches_format(template: str) -> None:
+    assert fill_transcription_template(template, "want water") == template.format(
+        transcription="want water"
+    )
+
+
+def test_fill_transcription_template_unknown_field_raises_like_format() -> None:
+    with pytest.raises(KeyError):
+        fill_transcription_template("{speaker}: {transcription}", "hi")
+
+
+def test_regeneration_prompt_parts_match_build_regeneration_prompts() -> None:
+    for certainty in (False, True):
+        system, template = regeneration_prompt_parts(
+            "Custom system.", "Fix: {transcription}", certainty
+        )
+        assert "{transcription}" in template
+        assert (system, template.format(transcription="want water")) == (
+            build_regeneration_prompts(
+                "  want water ",
+                system_prompt="Custom system.",
+                user_prompt_template="Fix: {transcription}",
+                request_certainty=certainty,
+            )
+        )
+
+
+def test_regeneration_prompt_parts_defaults() -> None:
+    system, template = regeneration_prompt_parts()
+    assert system == build_regeneration_prompts("x")[0]
+    assert template.format(transcription="x") == build_regeneration_prompts("x")[1]
+
+
+def test_regeneration_prompt_parts_custom_system_reused() -> None:
+    first = regeneration_prompt_parts(" Be brief. ", " Say: {transcription} ", True)
+    assert first[0].startswith("Be brief.\n\n")
+    assert first[1] == "Say: {transcription}"
+    assert first[0].endswith("No other text, no markdown.")
+    again = regeneration_prompt_parts(" Be brief. ", " Say: {transcription} ", True)
+    assert again[0] is first[0]
+
+
+def test_build_batched_regeneration_prompts_numbers_inputs() -> None:
+    system, user = build_batched_regeneration_prompts([" want water", "bathroom "])
+    assert system.startswith(build_regeneration_prompts("x")[0] + "\n\n")
+    assert "JSON array with one string per phrase" in system
+    assert user == "\n".join(
+        f"[{i}] " + build_regeneration_prompts(t)[1]
+        for i, t in ((1, "want water"), (2, "bathroom"))
+    )
+
+
+def test_build_batched_regeneration_prompts_keeps_single_prompt_options() -> None:
+    system, user = build_batched_regeneration_prompts(
+        ["want water", "cold"],
+        system_prompt="Be brief.",
+        user_prompt_template="Say:\n{transcription}",
+        request_certainty=True,
+    )
+    assert system.startswith("Be brief.\n\n")
+    assert '"certainty" (0-100)' in system
+    assert REGENERATION_JSON_SUFFIX.strip() not in system
+    assert user == "[1] Say: want water\n[2] Say: cold"
+
+
+def test_parse_batched_regeneration_response_json_array() -> None:
+    raw = '```json\n[{"sentence": "I want water.", "certainty": 90}, {"sentence": "I need the bathroom."}]\n```'
+    assert parse_batched_regeneration_response(raw, 3) == [
+        ("I want water.", 90),
+        ("I need the bathroom.", None),
+        ("", None),
+    ]
+
+
+def test_parse_batched_regeneration_response_numbered_lines_fallback() -> None:
+    raw = "[2] Sentence: I need the bathroom.\n[1] I want water.\n[7] out of range"
+    assert parse_batched_regeneration_response(raw, 2) == [
+        ("I want water.", None),
+        ("I need the bathroom.", None),
+    ]
+    assert parse_batched_regeneration_response("", 2) == [("", None), ("", None)]
+
+
+def test_regeneration_default_system_is_frozen_per_mode() -> None:
+    plain, _ = regeneration_prompt_parts(request_certainty=False)
+    with_json, _ = regeneration_prompt_parts(request_certainty=True)
+    assert regeneration_prompt_parts(request_certainty=False)[0] is plain
+    assert regeneration_prompt_parts(request_certainty=True)[0] is with_json
+    assert with_json.startswith(plain + "\n\n")
+    assert with_json.endswith("No other text, no markdown.")
+
+
 # ---- build_document_qa_* ----
 def test_build_document_qa_system_prompt_empty_context() -> None:
     out = build_document_qa_system_prompt("")
@@ -110,6 +247,14 @@ def test_build_document_qa_system_prompt_with_context() -> None:
     assert "Relevant context" in out or "context" in out.lower()
 
 
+def test_build_document_qa_system_prompt_parts() -> None:
+    static, dynamic = build_document_qa_system_prompt_parts(" Paragraph. ")
+    assert dynamic == "Relevant context:\nParagraph."
+    assert build_document_qa_system_prompt_parts("other")[0] is static
+    assert build_document_qa_system_prompt_parts("  ") == (static, "")
+    assert build_document_qa_system_prompt(" Paragraph. ") == static + "\n\n" + dynamic
+
+
 def test_build_document_qa_user_prompt() -> None:
     out = build_document_qa_user_prompt("What is X?")
     assert out == "What is X?"
@@ -150,6 +295,14 @@ def test_build_browse_intent_prompts_returns_tuple() -> None:
     assert "action" in sys_p or "search" in sys_p
 
 
+def test_browse_system_prompt_is_one_object_across_calls() -> None:
+    custom = "Custom system."
+    first = build_browse_intent_prompts("search trains")[0]
+    assert build_browse_intent_prompts("go back")[0] is first
+    assert build_web_mode_prompts("scroll down")[0] is first
+    assert build_web_mode_prompts("x", system_prompt=custom)[0] is custom
+
+
 # ---- build_web_mode_prompts ----
 def test_build_web_mode_prompts_returns_tuple() -> None:
     sys_p, user_p = build_web_mode_prompts("scroll down")
@@ -258,6 +411,25 @@ def test_strip_certainty_from_response_no_match_unchanged() -> None:
     assert strip_certainty_from_response(text) == text
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "I want water. 90% certainty",
+        "I want water (Certainty 90%)",
+        " I want water, CERTAINTY: 9 ",
+    ],
+)
+def test_strip_certainty_from_response_both_phrasings(text: str) -> None:
+    assert strip_certainty_from_response(text) == "I want water"
+
+
+def test_strip_certainty_from_response_doubled_suffix() -> None:
+    assert strip_certainty_from_response("X (85% certainty) Certainty: 85%") == "X"
+    assert strip_certainty_from_response("Certainty: 85% Certainty: 85%") == (
+        "Certainty: 85%"
+    )
+
+
 # ---- parse_regeneration_response ----
 def test_parse_regeneration_response_empty_returns_empty_tuple() -> None:
     sent, cert = parse_regeneration_response("")
@@ -286,6 +458,14 @@ def test_parse_regeneration_response_certainty_clamped() -> None:
     assert cert2 == 0
 
 
+@pytest.mark.parametrize("certainty", ["NaN", "Infinity", "-Infinity"])
+def test_parse_regeneration_response_non_finite_certainty_keeps_sentence(
+    certainty: str,
+) -> None:
+    raw = f'{{"sentence": "I want water.", "certainty": {certainty}}}'
+    assert parse_regeneration_response(raw) == ("I want water.", None)
+
+
 def test_parse_regeneration_response_no_certainty_returns_none() -> None:
     raw = '{"sentence": "Hello."}'
     sent, cert = parse_regeneration_response(raw)
@@ -405,3 +585,144 @@ def test_parse_regeneration_response_fallback_ididnt_catch_output_reply_as() ->
     sent, cert = parse_regeneration_response(raw)
     assert cert is None
     assert sent == "Test."
+
+
+def test_parse_regeneration_response_unclosed_fence_left_as_text() -> None:
+    raw = '```json {"sentence": "Hi.", "certainty": 80}'
+    sent, cert = parse_regeneration_response(raw)
+    assert cert is None
+    assert sent
+
+
+def test_parse_regeneration_response_bare_json_skips_fence_extraction() -> None:
+    raw = '{"sentence": "Type ```ls``` please.", "certainty": 70}'
+    assert parse_regeneration_response(raw) == ("Type ```ls``` please.", 70)
+
+
+def test_parse_results_are_memoized_for_short_replies() -> None:
+    import llm.prompts as prompts
+
+    raw = '{"sentence": "I need my glasses.", "certainty": 88}'
+    first = parse_regeneration_response(raw)
+    hits = prompts._parse_regeneration_response_cached.cache_info().hits
+    assert parse_regeneration_response(raw) is first
+    assert prompts._parse_regeneration_response_cached.cache_info().hits == hits + 1
+    long_raw = raw + " " * prompts.PARSE_CACHE_MAX_CHARS
+    assert parse_regeneration_response(long_raw) == first
+    assert prompts._parse_regeneration_response_cached.cache_info().hits == hits + 1
+
+
+def test_clear_parse_caches_empties_both_caches() -> None:
+    import llm.prompts as prompts
+
+    parse_browse_intent('{"action": "go_back"}')
+    parse_regeneration_response('{"sentence": "Hi.", "certainty": 50}')
+    clear_parse_caches()
+    assert prompts._parse_browse_intent_cached.cache_info().currsize == 0
+    assert prompts._parse_regeneration_response_cached.cache_info().currsize == 0
+
+
+def test_parse_browse_intent_cached_result_is_not_shared() -> None:
+    raw = '{"action": "search", "query": "trains"}'
+    intent = parse_browse_intent(raw)
+    intent["action"] = "unknown"
+    assert parse_browse_intent(raw) == {"action": "search", "query": "trains"}
+
+
+def test_strip_certainty_from_response_mention_not_at_end_unchanged() -> None:
+    text = "My certainty is low today."
+    assert strip_certainty_from_response(text) == text
+    assert strip_certainty_from_response(" Certainty 40 ") == "Certainty 40"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_parsers_same_with_and_without_orjson(
+    use_orjson: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import json
+
+    import llm.prompts as prompts
+
+    if use_orjson:
+        orjson = pytest.importorskip("orjson")
+        monkeypatch.setattr(prompts, "_loads", orjson.loads)
+    else:
+        monkeypatch.setattr(prompts, "_loads", json.loads)
+    clear_parse_caches()
+    try:
+        assert parse_regeneration_response(
+            '{"sentence": "Café please.", "certainty": 91}'
+        ) == ("Café please.", 91)
+        assert parse_browse_intent('```json\n{"action": "go_back"}\n```') == {
+            "action": "go_back"
+        }
+        assert parse_browse_intent("{not json") == {"action": "unknown"}
+    finally:
+        clear_parse_caches()
+
+
+@pytest.mark.parametrize(
+    "utterance,expected",
+    [
+        ("scroll down", {"action": "scroll_down"}),
+        ("Scroll the page up.", {"action": "scroll_up"}),
+        ("please go back", {"action": "go_back"}),
+        ("previous page", {"action": "go_back"}),
+        ("Stop browsing", {"action": "browse_off"}),
+        ("start browsing", {"action": "browse_on"}),
+        ("store this page", {"action": "store_page"}),
+        ("click", {"action": "click_link"}),
+        ("Click the third link.", {"action": "click_link", "link_index": 3}),
+        ("click 12th link", {"action": "click_link", "link_index": 12}),
+    ],
+)
+def test_try_local_browse_intent_fixed_commands(utterance: str, expected: dict) -> None:
+    assert try_local_browse_intent(utterance) == expected
+
+
+@pytest.mark.parametrize(
+    "utterance",
+    ["", "search scroll down", "click trump tariffs", "go back now", "click 0 link"],
+)
+def test_try_local_browse_intent_leaves_others_to_llm(utterance: str) -> None:
+    assert try_local_browse_intent(utterance) is None
+
+
+def test_browse_intent_system_examples_are_valid_intents() -> None:
+    import json
+
+    from llm.prompts import BROWSE_INTENT_SYSTEM, _BROWSE_ACTIONS
+
+    examples = [
+        line.split(" -> ", 1)
+        for line in BROWSE_INTENT_SYSTEM.splitlines()
+        if line.startswith("- User said: ")
+    ]
+    assert examples
+    for said, output in examples:
+        intent = json.loads(output)
+        assert intent["action"] in _BROWSE_ACTIONS, said
+        assert parse_browse_intent(output) == intent
+    # Every action the parser accepts is still described to the model.
+    for action in _BROWSE_ACTIONS:
+        assert action in BROWSE_INTENT_SYSTEM
+
+
+def test_parsers_skip_json_decode_for_plain_text(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import llm.prompts as prompts
+
+    def fail(_text: str) -> object:
+        raise AssertionError("decoded a reply that cannot be a JSON object")
+
+    monkeypatch.setattr(prompts, "_loads", fail)
+    clear_parse_caches()
+    try:
+        assert parse_regeneration_response("I didn't catch that.") == (
+            "I didn't catch that.",
+            None,
+        )
+        assert parse_browse_intent("[1, 2]") == {"action": "unknown"}
+    finally:
+        clear_parse_caches()
@@ -0,0 +1,44 @@
+"""Tests for llm.regen_cache: RegenerationCache LRU and regeneration_cache_key."""
+
+from __future__ import annotations
+
+from llm.regen_cache import RegenerationCache, regeneration_cache_key
+
+
+def test_cache_key_depends_on_model_system_and_user() -> None:
+    base = regeneration_cache_key("mistral", "sys", "user")
+    assert base == regeneration_cache_key("mistral", "sys", "user")
+    assert base != regeneration_cache_key("phi", "sys", "user")
+    assert base != regeneration_cache_key("mistral", "sys2", "user")
+    assert base != regeneration_cache_key("mistral", "sys", "user2")
+    # Separator prevents ambiguous concatenations.
+    assert regeneration_cache_key("a", "bc", "d") != regeneration_cache_key(
+        "a", "b", "cd"
+    )
+
+
+def test_cache_get_put_and_miss() -> None:
+    cache = RegenerationCache(maxsize=4)
+    assert cache.get("k") is None
+    cache.put("k", "I want water.")
+    assert cache.get("k") == "I want water."
+    assert len(cache) == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = RegenerationCache(maxsize=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    assert cache.get("a") == "1"  # a is now most recent
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_cache_clear() -> None:
+    cache = RegenerationCache()
+    cache.put("a", "1")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.get("a") is None
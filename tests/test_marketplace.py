@@ -322,3 +322,17 @@ def test_install_module_submodule_add_fails_returns_500(tmp_path: Path) -> None:
     assert ok is False
     assert code == 500
     assert "fatal" in msg or "submodule" in msg.lower() or msg
+
+
+def test_github_calls_share_one_session() -> None:
+    import marketplace
+    from unittest.mock import MagicMock
+
+    session = marketplace._github_session()
+    assert marketplace._github_session() is session
+    resp = MagicMock(status_code=200)
+    resp.json.return_value = [{"name": "talkie-module-foo"}]
+    with patch.object(session, "get", return_value=resp) as mock_get:
+        assert marketplace._list_org_repos("org") == [{"name": "talkie-module-foo"}]
+        assert marketplace._repo_exists_in_org("org", "talkie-module-foo") is True
+    assert mock_get.call_count == 2
@@ -4,9 +4,13 @@ from __future__ import annotations
 
 import sqlite3
 import tempfile
+import time
+from concurrent.futures import Future
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
+import requests
 
 from sdk import (
     NoOpCapture,
@@ -16,8 +20,14 @@ from sdk import (
 )
 from app.pipeline import (
     Pipeline,
+    _SentenceSpeaker,
+    _debug_timestamp,
     _looks_like_malformed_regeneration,
+    _looks_like_request,
+    _no_debug,
+    _normalize_for_repeat,
     _only_search_instruction_if_list,
+    _split_complete_sentences,
     create_pipeline,
 )
 from persistence.database import init_database
@@ -69,14 +79,22 @@ def test_looks_like_malformed_regeneration_empty_or_plain_false() -> None:
 
 
 def test_looks_like_malformed_regeneration_list_or_meta_true() -> None:
-    assert _looks_like_malformed_regeneration('1. "Feed the bathroom" (90%)\n2. "Ready" (10%)') is True
+    assert (
+        _looks_like_malformed_regeneration(
+            '1. "Feed the bathroom" (90%)\n2. "Ready" (10%)'
+        )
+        is True
+    )
     assert _looks_like_malformed_regeneration("1. First option") is True
     assert _looks_like_malformed_regeneration("Something (90%)") is True
 
 
 def test_looks_like_malformed_regeneration_multiple_sentences_true() -> None:
     # Model concatenated previous response with current phrase (irrelevant context).
-    assert _looks_like_malformed_regeneration("I want water. Ready! Lead bathroom.") is True
+    assert (
+        _looks_like_malformed_regeneration("I want water. Ready! Lead bathroom.")
+        is True
+    )
     assert _looks_like_malformed_regeneration("Hello. How are you?") is True
 
 
@@ -156,6 +174,29 @@ def test_create_pipeline_returns_pipeline(history_repo: HistoryRepo) -> None:
     assert p._profile is not None
 
 
+def test_create_pipeline_reads_calibration_in_one_query(
+    history_repo: HistoryRepo,
+) -> None:
+    from unittest.mock import MagicMock
+
+    from app.config_overlay import LLM_CALIBRATION_KEYS
+
+    settings = MagicMock()
+    settings.get_many.return_value = {"calibration_min_transcription_length": "5"}
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        settings_repo=settings,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+    )
+    settings.get_many.assert_called_once_with(list(LLM_CALIBRATION_KEYS))
+    settings.get.assert_not_called()
+    assert p._llm_prompt_config["min_transcription_length"] == 5
+
+
 def test_pipeline_set_ui_callbacks(pipeline: Pipeline) -> None:
     status_calls: list[str] = []
     response_calls: list[tuple] = []
@@ -337,6 +378,21 @@ def test_pipeline_push_spoken_updates_state(pipeline: Pipeline) -> None:
     assert "First." in pipeline._recent_spoken_responses
     pipeline._push_spoken("")
     assert pipeline._last_spoken_response == "Second."
+    assert pipeline._last_spoken_norm == "second."
+    pipeline._push_spoken("  I  Want Water. ")
+    assert pipeline._last_spoken_norm == "i want water."
+
+
+def test_pipeline_push_spoken_precomputes_echo_forms(pipeline: Pipeline) -> None:
+    pipeline._push_spoken("I want WATER, please.")
+    assert pipeline._recent_spoken_forms == [
+        ("i want water, please.", "i want water please")
+    ]
+    pipeline._push_spoken("Hello.")
+    assert [f[0] for f in pipeline._recent_spoken_forms] == [
+        "hello.",
+        "i want water, please.",
+    ]
 
 
 def test_pipeline_prefetch_profile_and_recent(pipeline: Pipeline) -> None:
@@ -465,3 +521,562 @@ def test_create_pipeline_stt_min_confidence_invalid_ignored(
         llm_prompt_config={},
     )
     assert p._stt_min_confidence is None
+
+
+# ---- _finalize_response ----
+class _RecordingTTS(NoOpTTSEngine):
+    def __init__(self) -> None:
+        self.spoken: list[str] = []
+
+    def speak(self, text: str) -> None:
+        self.spoken.append(text)
+
+
+def test_finalize_response_saves_speaks_and_resets_status(pipeline: Pipeline) -> None:
+    tts = _RecordingTTS()
+    pipeline._tts = tts
+    responses: list[tuple[str, int]] = []
+    statuses: list[str] = []
+    saved: list[int] = []
+    pipeline.set_ui_callbacks(
+        on_status=statuses.append,
+        on_response=lambda t, i: responses.append((t, i)),
+        on_error=lambda _: None,
+        on_interaction_saved=saved.append,
+    )
+    pipeline._finalize_response("want water", "I want water. (certainty 90%)")
+    # Shown before the row is committed; the id follows through on_interaction_saved.
+    assert responses[0] == ("I want water", 0)
+    assert tts.spoken == ["I want water"]
+    assert statuses[-1] == "Listening..."
+    # Same reply again: saved and shown, but not spoken twice.
+    pipeline._finalize_response("want water", "I want water")
+    assert tts.spoken == ["I want water"]
+    assert len(pipeline._history.list_recent(limit=5)) == 2
+    assert sorted(saved) == sorted(r["id"] for r in pipeline._history.list_recent(5))
+
+
+def test_finalize_response_does_not_wait_for_history_write(
+    pipeline: Pipeline,
+) -> None:
+    pipeline._tts = _RecordingTTS()
+    pending: Future[int] = Future()
+    errors: list[str] = []
+    responses: list[tuple[str, int]] = []
+    pipeline.set_ui_callbacks(
+        on_status=lambda _: None,
+        on_response=lambda t, i: responses.append((t, i)),
+        on_error=errors.append,
+    )
+    with (
+        patch.object(pipeline._history, "enqueue_interaction", return_value=pending),
+        patch.object(pipeline._profile, "invalidate_accepted") as invalidate,
+    ):
+        pipeline._finalize_response("hello", "Hello.")
+        assert responses == [("Hello.", 0)]
+        invalidate.assert_not_called()
+        pending.set_exception(sqlite3.OperationalError("disk I/O error"))
+    invalidate.assert_not_called()
+    assert errors == ["Could not save to history"]
+
+
+def test_finalize_response_from_browse_condenses_result_list(
+    pipeline: Pipeline,
+) -> None:
+    tts = _RecordingTTS()
+    pipeline._tts = tts
+    pipeline._finalize_response(
+        "search dogs",
+        "Say 'open 1' through 'open 3' to open a result. 1. Dogs 2. Puppies",
+        from_browse=True,
+    )
+    assert tts.spoken == ["Say 'open 1' through 'open 3' to open a result."]
+
+
+def test_finalize_response_error_fallback_not_spoken(pipeline: Pipeline) -> None:
+    from llm.client import FALLBACK_MESSAGE
+
+    tts = _RecordingTTS()
+    pipeline._tts = tts
+    pipeline._finalize_response("hello", FALLBACK_MESSAGE)
+    assert tts.spoken == []
+
+
+# ---- speculative completion ----
+class _FakeLLM:
+    def __init__(self, reply: str = "I want water.") -> None:
+        self.reply = reply
+        self.calls: list[tuple[str, str | None]] = []
+        self.timeout_sec = 5.0
+        self.model_name = "fake"
+        self.base_url = "http://fake"
+
+    def generate(self, prompt: str, system: str | None = None) -> str:
+        self.calls.append((prompt, system))
+        return self.reply
+
+    def check_connection(self) -> bool:
+        return True
+
+
+def test_speculative_completion_reused_when_prompts_match(pipeline: Pipeline) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    llm = _FakeLLM()
+    pipeline._llm = llm
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        future = ex.submit(pipeline._speculative_completion, "want water")
+        system, user_prompt = pipeline._completion_prompts("want water", "")
+        assert (
+            pipeline._take_speculative_completion(future, system, user_prompt)
+            == "I want water."
+        )
+    assert len(llm.calls) == 1
+
+
+def test_speculative_completion_ignored_when_prompts_differ(
+    pipeline: Pipeline,
+) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    pipeline._llm = _FakeLLM()
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        future = ex.submit(pipeline._speculative_completion, "want water")
+        system, user_prompt = pipeline._completion_prompts("I am cold", "")
+        assert (
+            pipeline._take_speculative_completion(future, system, user_prompt) is None
+        )
+
+
+def test_create_pipeline_batch_window_uses_batched_client(
+    history_repo: HistoryRepo,
+) -> None:
+    from llm.batcher import BatchedOllamaClient
+
+    class BatchConfig(_MockConfig):
+        def get(self, key: str, default=None):
+            if key == "ollama":
+                return {
+                    "base_url": "http://localhost:11434",
+                    "model_name": "mistral",
+                    "batch_window_ms": 5,
+                    "max_batch": 2,
+                }
+            return super().get(key, default)
+
+    p = create_pipeline(
+        BatchConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+    )
+    assert isinstance(p._llm, BatchedOllamaClient)
+    p._llm._batcher.close()
+    p2 = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+    )
+    assert not isinstance(p2._llm, BatchedOllamaClient)
+
+
+# ---- regeneration cache ----
+def test_regenerate_uses_cache_for_repeated_prompt(pipeline: Pipeline) -> None:
+    llm = _FakeLLM(reply='{"sentence": "I want water.", "certainty": 90}')
+    pipeline._llm = llm
+    first = pipeline._regenerate("want water", "sys")
+    second = pipeline._regenerate("want water", "sys")
+    assert first == second
+    assert len(llm.calls) == 1
+    pipeline._regenerate("want food", "sys")
+    assert len(llm.calls) == 2
+
+
+def test_regenerate_does_not_cache_fallback(pipeline: Pipeline) -> None:
+    from llm.client import FALLBACK_MESSAGE
+
+    llm = _FakeLLM(reply=FALLBACK_MESSAGE)
+    pipeline._llm = llm
+    pipeline._regenerate("want water", "sys")
+    pipeline._regenerate("want water", "sys")
+    assert len(llm.calls) == 2
+
+
+def test_regeneration_cache_cleared_on_document_qa_toggle(pipeline: Pipeline) -> None:
+    pipeline._llm = _FakeLLM()
+    pipeline._regenerate("want water", "sys")
+    assert len(pipeline._regen_cache) == 1
+    pipeline.set_document_qa_mode(True)
+    assert len(pipeline._regen_cache) == 0
+
+
+def test_regeneration_cache_disabled_by_config(history_repo: HistoryRepo) -> None:
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={"regeneration_cache_size": 0},
+    )
+    assert p._regen_cache is None
+    llm = _FakeLLM()
+    p._llm = llm
+    p._regenerate("want water", "sys")
+    p._regenerate("want water", "sys")
+    assert len(llm.calls) == 2
+
+
+# ---- document QA answer cache ----
+def test_document_qa_generate_uses_persistent_cache(
+    history_repo: HistoryRepo, db_path: Path
+) -> None:
+    from persistence.qa_cache_repo import QACacheRepo
+
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+        qa_cache_repo=QACacheRepo(lambda: sqlite3.connect(str(db_path))),
+    )
+    llm = _FakeLLM(reply="X is a thing.")
+    p._llm = llm
+    assert p._document_qa_generate("What is X?", "ctx A") == "X is a thing."
+    assert p._document_qa_generate("What is X?", "ctx A") == "X is a thing."
+    assert len(llm.calls) == 1
+    # Different retrieved context (system prompt) is a miss.
+    p._document_qa_generate("What is X?", "ctx B")
+    assert len(llm.calls) == 2
+
+
+def test_document_qa_generate_without_cache_calls_llm(pipeline: Pipeline) -> None:
+    llm = _FakeLLM(reply="Answer.")
+    pipeline._llm = llm
+    pipeline._document_qa_generate("Q?", "ctx")
+    pipeline._document_qa_generate("Q?", "ctx")
+    assert len(llm.calls) == 2
+
+
+def test_pipeline_precomputes_regeneration_prompts(history_repo: HistoryRepo) -> None:
+    from llm.prompts import build_regeneration_prompts
+
+    cfg = {
+        "regeneration_system_prompt": "Regen system.",
+        "regeneration_user_prompt_template": "Complete: {transcription}",
+        "regeneration_request_certainty": True,
+    }
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config=cfg,
+    )
+    expected = build_regeneration_prompts(
+        "want water",
+        system_prompt="Regen system.",
+        user_prompt_template="Complete: {transcription}",
+        request_certainty=True,
+    )
+    assert p._reg_system == expected[0]
+    assert p._reg_user_template.format(transcription="want water") == expected[1]
+
+
+class _StreamingLLM(_FakeLLM):
+    def __init__(self, fragments: list[str]) -> None:
+        super().__init__(reply="".join(fragments))
+        self.fragments = fragments
+
+    def generate_stream(self, prompt: str, system: str | None = None, cancel=None):
+        self.calls.append((prompt, system))
+        for fragment in self.fragments:
+            if cancel is not None and cancel.is_set():
+                return
+            yield fragment
+
+
+def test_split_complete_sentences_keeps_unfinished_tail() -> None:
+    assert _split_complete_sentences("One. Two! Thr") == (["One.", "Two!"], "Thr")
+    assert _split_complete_sentences("No boundary yet.") == ([], "No boundary yet.")
+
+
+def test_document_qa_generate_streams_sentences(pipeline: Pipeline) -> None:
+    llm = _StreamingLLM(["X is a ", "thing. It is ", "used for Y. Done"])
+    pipeline._llm = llm
+    sentences: list[str] = []
+    response = pipeline._document_qa_generate(
+        "What is X?", "ctx", on_sentence=sentences.append
+    )
+    assert response == "X is a thing. It is used for Y. Done"
+    assert sentences == ["X is a thing.", "It is used for Y.", "Done"]
+    assert len(llm.calls) == 1
+
+
+def test_document_qa_generate_empty_stream_returns_fallback(pipeline: Pipeline) -> None:
+    from llm.client import FALLBACK_MESSAGE
+
+    pipeline._llm = _StreamingLLM([])
+    sentences: list[str] = []
+    response = pipeline._document_qa_generate("Q?", "ctx", on_sentence=sentences.append)
+    assert response == FALLBACK_MESSAGE
+    assert sentences == []
+
+
+class _BrokenStreamLLM(_StreamingLLM):
+    def generate_stream(self, prompt: str, system: str | None = None, cancel=None):
+        yield from super().generate_stream(prompt, system, cancel)
+        raise requests.ConnectionError("connection reset")
+
+
+def test_document_qa_partial_stream_is_not_cached(
+    history_repo: HistoryRepo, db_path: Path
+) -> None:
+    from persistence.qa_cache_repo import QACacheRepo
+
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+        qa_cache_repo=QACacheRepo(lambda: sqlite3.connect(str(db_path))),
+    )
+    p._llm = _BrokenStreamLLM(["X is a ", "thing. It is "])
+    sentences: list[str] = []
+    response = p._document_qa_generate("Q?", "ctx", on_sentence=sentences.append)
+    assert response == "X is a thing. It is"
+    assert sentences == ["X is a thing.", "It is"]
+    llm = _StreamingLLM(["Full answer."])
+    p._llm = llm
+    assert p._document_qa_generate("Q?", "ctx", on_sentence=sentences.append) == (
+        "Full answer."
+    )
+    assert len(llm.calls) == 1
+
+
+class _WaitingTTS(_RecordingTTS):
+    def __init__(self) -> None:
+        super().__init__()
+        self.waits = 0
+
+    def speak(self, text: str) -> None:
+        time.sleep(0.02)
+        super().speak(text)
+
+    def wait_until_done(self) -> None:
+        self.waits += 1
+
+
+def test_sentence_speaker_close_waits_for_queued_sentences() -> None:
+    tts = _WaitingTTS()
+    speaker = _SentenceSpeaker(tts)
+    for sentence in ("One.", "Two.", "Three."):
+        speaker.put(sentence)
+    speaker.close()
+    assert tts.spoken == ["One.", "Two.", "Three."]
+    assert tts.waits == 3
+
+
+def test_sentence_speaker_needs_wait_until_done() -> None:
+    assert _SentenceSpeaker.supports(_WaitingTTS())
+    assert not _SentenceSpeaker.supports(_RecordingTTS())
+
+
+def test_finalize_response_already_spoken_skips_tts(pipeline: Pipeline) -> None:
+    tts = _RecordingTTS()
+    pipeline._tts = tts
+    pipeline._finalize_response("q", "Streamed answer.", already_spoken=True)
+    assert tts.spoken == []
+    assert pipeline._last_spoken_response == "Streamed answer."
+
+
+def test_normalize_for_repeat_and_looks_like_request() -> None:
+    assert _normalize_for_repeat("  I want   WATER!! ") == "i want water"
+    assert _normalize_for_repeat(None) == ""  # type: ignore[arg-type]
+    assert _looks_like_request("Take me to the kitchen")
+    assert _looks_like_request("please open the door") is False
+    assert _looks_like_request("Open the door")
+    assert _looks_like_request("I want water.") is False
+
+
+class _ChunkCapture(NoOpCapture):
+    """Returns the given chunks, then stops the pipeline."""
+
+    def __init__(self, pipeline: Pipeline, chunks: list[bytes]) -> None:
+        self._pipeline = pipeline
+        self._chunks = list(chunks)
+
+    def read_chunk(self, on_level=None):
+        if not self._chunks:
+            self._pipeline._running = False
+            return None
+        return self._chunks.pop(0)
+
+
+class _CountingSTT(NoOpSTTEngine):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def transcribe(self, audio_bytes: bytes) -> str:
+        self.calls += 1
+        return ""
+
+
+@pytest.mark.parametrize(
+    "auto_sensitivity,expected_floor",
+    [
+        (None, 0.001),
+        ({"enabled": True, "min_level": 0.004}, 0.002),
+    ],
+)
+def test_silent_chunks_skip_stt(
+    history_repo: HistoryRepo, auto_sensitivity, expected_floor
+) -> None:
+    import struct
+
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+        auto_sensitivity=auto_sensitivity,
+    )
+    assert p._silence_floor == pytest.approx(expected_floor)
+    stt = _CountingSTT()
+    silent = bytes(3200)
+    audible = struct.pack("<1600h", *([3000, -3000] * 800))
+    p._stt = stt
+    p._llm = _FakeLLM()
+    p._capture = _ChunkCapture(p, [silent, silent, audible])
+    p._running = True
+    p._run_loop()
+    assert stt.calls == 1
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_run_loop_warms_up_llm(history_repo: HistoryRepo, enabled: bool) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={"warmup_llm": enabled},
+    )
+    llm = _FakeLLM()
+    p._llm = llm
+    p._capture = _ChunkCapture(p, [])
+    p._executor = ThreadPoolExecutor(max_workers=1)
+    p._running = True
+    p._run_loop()
+    p._executor.shutdown(wait=True)
+    assert llm.calls == ([("hi", "Reply with one word.")] if enabled else [])
+
+
+def test_debug_formats_lazily_only_with_subscriber(pipeline: Pipeline) -> None:
+    class _Boom:
+        def __str__(self) -> str:
+            raise AssertionError("formatted without a debug subscriber")
+
+    pipeline._debug("value %s", _Boom())
+    # Without a subscriber the LLM client gets no hook either.
+    pipeline.set_ui_callbacks(
+        on_status=lambda _s: None,
+        on_response=lambda _t, _i: None,
+        on_error=lambda _e: None,
+        on_debug=_no_debug,
+    )
+    assert pipeline._llm._debug_log is None
+    lines: list[str] = []
+    pipeline.set_ui_callbacks(
+        on_status=lambda _s: None,
+        on_response=lambda _t, _i: None,
+        on_error=lambda _e: None,
+        on_debug=lines.append,
+    )
+    pipeline._debug("level %.2f (%s)", 0.5, "ok")
+    assert len(lines) == 1
+    assert lines[0].endswith("] level 0.50 (ok)")
+    pipeline._llm._debug("Ollama HTTP %s", 200)
+    assert lines[-1].endswith("] Ollama HTTP 200")
+
+
+def test_debug_timestamp_format() -> None:
+    import re
+
+    first = _debug_timestamp()
+    assert re.fullmatch(r"\d{2}:\d{2}:\d{2}\.\d{3}", first)
+
+
+def test_speculative_completion_streams_and_honours_cancel(pipeline: Pipeline) -> None:
+    import threading
+
+    llm = _StreamingLLM(["I want ", "water."])
+    pipeline._llm = llm
+    system, user_prompt, response = pipeline._speculative_completion(
+        "want water", threading.Event()
+    )
+    assert response == "I want water."
+    assert (system, user_prompt) == pipeline._completion_prompts("want water", "")
+    cancelled = threading.Event()
+    cancelled.set()
+    assert pipeline._speculative_completion("want water", cancelled)[2] is None
+
+
+def test_auto_sensitivity_uses_mean_of_recent_levels(history_repo: HistoryRepo) -> None:
+    import struct
+
+    def chunk(amplitude: int) -> bytes:
+        return struct.pack("<1600h", *([amplitude, -amplitude] * 800))
+
+    p = create_pipeline(
+        _MockConfig(),
+        history_repo,
+        capture=NoOpCapture(),
+        stt=NoOpSTTEngine(),
+        tts=NoOpTTSEngine(),
+        speaker_filter=NoOpSpeakerFilter(),
+        llm_prompt_config={},
+        auto_sensitivity={
+            "enabled": True,
+            "min_level": 0.002,
+            "max_level": 0.08,
+            "step": 0.5,
+            "cooldown_chunks": 1,
+            "level_window": 2,
+        },
+    )
+    bumps: list[float] = []
+    capture = _ChunkCapture(p, [chunk(6000), chunk(300), chunk(300)])
+    capture.set_sensitivity = bumps.append  # type: ignore[method-assign]
+    p._capture = capture
+    p._stt = _CountingSTT()
+    p._llm = _FakeLLM()
+    p._running = True
+    p._run_loop()
+    # Loud chunk (RMS ~0.18) keeps the mean of the first quiet chunk above the band;
+    # only the second quiet chunk brings the mean into the band.
+    assert bumps == [1.5]
+    assert list(p._recent_levels) == []
@@ -144,3 +144,19 @@ def test_get_context_for_llm_with_training(
 def test_profile_context_cache_ttl_constant() -> None:
     assert PROFILE_CONTEXT_CACHE_TTL_SEC == 30.0
     assert isinstance(PROFILE_CONTEXT_CACHE_TTL_SEC, float)
+
+
+def test_invalidate_accepted_rereads_only_accepted_pairs(
+    history_repo: HistoryRepo,
+    training_repo: TrainingRepo,
+) -> None:
+    p = LanguageProfile(history_repo, training_repo=training_repo)
+    p.get_context_for_llm()
+    training_repo.add("Star is my dog.")
+    history_repo.insert_interaction("want water", "I want water please.")
+    p.invalidate_accepted()
+    ctx = p.get_context_for_llm()
+    assert "I want water please." in ctx
+    assert "Star is my dog." not in ctx
+    p.invalidate_cache()
+    assert "Star is my dog." in p.get_context_for_llm()
@@ -0,0 +1,78 @@
+"""Tests for persistence.qa_cache_repo."""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from persistence.database import init_database
+from persistence.qa_cache_repo import QACacheRepo
+
+
+@pytest.fixture
+def db_path() -> Path:
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+        path = Path(f.name)
+    yield path
+    path.unlink(missing_ok=True)
+
+
+@pytest.fixture
+def repo(db_path: Path) -> QACacheRepo:
+    init_database(str(db_path))
+    return QACacheRepo(lambda: sqlite3.connect(str(db_path)))
+
+
+def test_get_missing_returns_none(repo: QACacheRepo) -> None:
+    assert repo.get("nope") is None
+
+
+def test_put_and_get(repo: QACacheRepo) -> None:
+    repo.put("k1", "X is a thing.")
+    assert repo.get("k1") == "X is a thing."
+
+
+def test_put_replaces_existing(repo: QACacheRepo) -> None:
+    repo.put("k1", "old")
+    repo.put("k1", "new")
+    assert repo.get("k1") == "new"
+
+
+def test_clear(repo: QACacheRepo) -> None:
+    repo.put("k1", "a")
+    repo.put("k2", "b")
+    repo.clear()
+    assert repo.get("k1") is None
+    assert repo.get("k2") is None
+
+
+def test_get_raises_on_missing_table(db_path: Path) -> None:
+    repo = QACacheRepo(lambda: sqlite3.connect(str(db_path)))
+    with pytest.raises(sqlite3.Error):
+        repo.get("k1")
+
+
+def test_get_ignores_expired_rows(db_path: Path) -> None:
+    init_database(str(db_path))
+    repo = QACacheRepo(lambda: sqlite3.connect(str(db_path)), max_age_sec=60)
+    repo.put("k1", "fresh")
+    with sqlite3.connect(str(db_path)) as conn:
+        conn.execute("UPDATE qa_cache SET ts = ts - 120 WHERE hash = 'k1'")
+    assert repo.get("k1") is None
+    repo.put("k2", "b")
+    with sqlite3.connect(str(db_path)) as conn:
+        hashes = [r[0] for r in conn.execute("SELECT hash FROM qa_cache")]
+    assert hashes == ["k2"]
+
+
+def test_put_trims_to_max_rows_oldest_first(db_path: Path) -> None:
+    init_database(str(db_path))
+    repo = QACacheRepo(lambda: sqlite3.connect(str(db_path)), max_rows=2)
+    for key in ("k1", "k2", "k3"):
+        repo.put(key, key.upper())
+    assert repo.get("k1") is None
+    assert repo.get("k2") == "K2"
+    assert repo.get("k3") == "K3"
@@ -0,0 +1,100 @@
+"""Tests for modules.rag.RAGService: retrieve cache and its invalidation on index changes."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+import modules.rag as rag  # noqa: E402
+
+
+class _FakeStore:
+    def __init__(self, **kwargs) -> None:
+        self.retrieve_calls: list[tuple[str, int, int]] = []
+        self.context = "Source: a.txt\nAlpha."
+
+    def retrieve(self, query: str, top_k: int, min_query_length: int = 3) -> str:
+        self.retrieve_calls.append((query, top_k, min_query_length))
+        return self.context
+
+    def add_documents(self, paths: list[Path]) -> None:
+        pass
+
+    def add_text(self, source: str, text: str) -> None:
+        pass
+
+    def remove_from_index(self, source: str) -> None:
+        pass
+
+    def clear_index(self) -> None:
+        pass
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> rag.RAGService:
+    monkeypatch.setattr(rag, "RAGStore", _FakeStore)
+    return rag.RAGService(
+        {
+            "base_url": "http://localhost:11434",
+            "embedding_model": "nomic-embed-text",
+            "vector_db_path": "unused",
+            "chunk_size": 500,
+            "chunk_overlap": 50,
+            "top_k": 5,
+        }
+    )
+
+
+def test_retrieve_cached_per_query_and_top_k(service: rag.RAGService) -> None:
+    store = service._store
+    assert service.retrieve("what is alpha", top_k=3) == store.context
+    assert service.retrieve(" what is alpha ", top_k=3) == store.context
+    assert len(store.retrieve_calls) == 1
+    service.retrieve("what is alpha", top_k=4)
+    assert len(store.retrieve_calls) == 2
+
+
+def test_retrieve_empty_result_not_cached(service: rag.RAGService) -> None:
+    store = service._store
+    store.context = ""
+    service.retrieve("what is alpha")
+    service.retrieve("what is alpha")
+    assert len(store.retrieve_calls) == 2
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda s: s.ingest([Path("a.txt")]),
+        lambda s: s.ingest_text("page", "text"),
+        lambda s: s.remove_from_index("a.txt"),
+        lambda s: s.clear_index(),
+    ],
+)
+def test_index_change_clears_retrieve_cache(service: rag.RAGService, change) -> None:
+    store = service._store
+    service.retrieve("what is alpha")
+    change(service)
+    service.retrieve("what is alpha")
+    assert len(store.retrieve_calls) == 2
+
+
+def test_retrieve_racing_an_ingest_is_not_cached(service: rag.RAGService) -> None:
+    store = service._store
+    stale = store.context
+    real_retrieve = store.retrieve
+
+    def retrieve_during_ingest(query: str, top_k: int, min_query_length: int = 3):
+        context = real_retrieve(query, top_k, min_query_length)
+        store.context = "Source: b.txt\nBeta."
+        service.ingest_text("b.txt", "Beta.")
+        return context
+
+    store.retrieve = retrieve_during_ingest
+    assert service.retrieve("what is alpha") == stale
+    store.retrieve = real_retrieve
+    assert service.retrieve("what is alpha") == "Source: b.txt\nBeta."
+    assert len(store.retrieve_calls) == 2
@@ -48,3 +48,24 @@ def test_chunk_rms_level_output_in_unit_interval() -> None:
         level = chunk_rms_level(chunk)
         assert 0.0 <= level <= 1.0
         assert isinstance(level, float)
+
+
+def test_chunk_rms_level_matches_exact_rms() -> None:
+    samples = [1000, -2000, 3000, -4000, 32767, -32768, 0, 7]
+    chunk = struct.pack(f"<{len(samples)}h", *samples)
+    expected = (sum(s * s for s in samples) / len(samples)) ** 0.5 / INT16_MAX
+    assert abs(chunk_rms_level(chunk) - expected) < 1e-12
+
+
+def test_chunk_rms_level_ignores_trailing_odd_byte() -> None:
+    chunk = struct.pack("<2h", 16384, 16384)
+    assert chunk_rms_level(chunk + b"\x7f") == chunk_rms_level(chunk)
+
+
+def test_chunk_rms_level_without_numpy_matches(monkeypatch) -> None:
+    import sdk.audio_utils as audio_utils
+
+    chunk = struct.pack("<6h", 100, -200, 300, -400, 500, -600)
+    with_numpy = chunk_rms_level(chunk)
+    monkeypatch.setattr(audio_utils, "np", None)
+    assert abs(chunk_rms_level(chunk) - with_numpy) < 1e-12
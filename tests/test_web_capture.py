@@ -20,19 +20,19 @@ def test_websocket_audio_capture_init() -> None:
     c = WebSocketAudioCapture(chunk_size_bytes=640, sample_rate=16000)
     assert c._chunk_size == 640
     assert c._sample_rate == 16000
-    assert c._buffer_len == 0
+    assert c._count == 0
     assert c._started is False
     assert c._sensitivity == 1.0
     assert c._client_sample_rate is None
 
 
 def test_start_sets_started_and_clears_buffer(capture: WebSocketAudioCapture) -> None:
-    capture._buffer.append(b"x")
-    capture._buffer_len = 1
+    capture._head = 5
+    capture._count = 1
     capture.start()
     assert capture._started is True
-    assert capture._buffer_len == 0
-    assert len(capture._buffer) == 0
+    assert capture._count == 0
+    assert capture._head == 0
 
 
 def test_stop_sets_started_false(capture: WebSocketAudioCapture) -> None:
@@ -45,14 +45,13 @@ def test_stop_sets_started_false(capture: WebSocketAudioCapture) -> None:
 def test_put_chunk_when_not_started_ignores(capture: WebSocketAudioCapture) -> None:
     data = struct.pack("<80h", *([0] * 80))
     capture.put_chunk(data)
-    assert capture._buffer_len == 0
-    assert len(capture._buffer) == 0
+    assert capture._count == 0
 
 
 def test_put_chunk_empty_ignores(capture: WebSocketAudioCapture) -> None:
     capture.start()
     capture.put_chunk(b"")
-    assert capture._buffer_len == 0
+    assert capture._count == 0
 
 
 def test_put_chunk_and_read_chunk_single_chunk(capture: WebSocketAudioCapture) -> None:
@@ -84,6 +83,23 @@ def test_put_chunk_multiple_small_chunks(capture: WebSocketAudioCapture) -> None
     assert isinstance(out, bytes)
 
 
+def test_read_chunk_splits_blocks_and_keeps_remainder(
+    capture: WebSocketAudioCapture,
+) -> None:
+    capture.start()
+    data = bytes(range(200)) * 4  # 800 bytes in two uneven blocks
+    capture.put_chunk(data[:500])
+    capture.put_chunk(data[500:])
+    first = capture.read_chunk()
+    second = capture.read_chunk()
+    assert isinstance(first, bytes) and isinstance(second, bytes)
+    assert first == data[:320]
+    assert second == data[320:640]
+    assert capture._count == 160
+    capture.put_chunk(bytes(160))
+    assert capture.read_chunk() == data[640:] + bytes(160)
+
+
 def test_set_client_sample_rate() -> None:
     c = WebSocketAudioCapture(chunk_size_bytes=320, sample_rate=16000)
     assert c._client_sample_rate is None
@@ -91,6 +107,19 @@ def test_set_client_sample_rate() -> None:
     assert c._client_sample_rate == 48000
     c.set_client_sample_rate(None)
     assert c._client_sample_rate is None
+    assert c._resample is None
+
+
+def test_put_chunk_resamples_client_rate(capture: WebSocketAudioCapture) -> None:
+    from app.audio_utils import resample_int16
+
+    capture.set_client_sample_rate(16000)
+    assert capture._resample is None
+    capture.set_client_sample_rate(32000)
+    capture.start()
+    data = struct.pack("<640h", *range(640))
+    capture.put_chunk(data)
+    assert capture.read_chunk() == resample_int16(data, 32000, 16000)[:320]
 
 
 def test_get_sensitivity_default() -> None:
@@ -123,3 +152,50 @@ def test_read_chunk_blocks_until_enough_data(capture: WebSocketAudioCapture) ->
     assert len(result) == 1
     assert result[0] is not None
     assert len(result[0]) == 320
+
+
+def test_read_chunk_wakes_when_fragments_complete_a_chunk(
+    capture: WebSocketAudioCapture,
+) -> None:
+    capture.start()
+    result: list[bytes | None] = []
+    t = threading.Thread(target=lambda: result.append(capture.read_chunk()))
+    t.start()
+    time.sleep(0.05)
+    for i in range(10):
+        capture.put_chunk(bytes([i]) * 32)
+    # Notified on the fragment that completes the chunk.
+    t.join(timeout=0.2)
+    assert not t.is_alive()
+    assert result == [b"".join(bytes([i]) * 32 for i in range(10))]
+
+
+def test_ring_wraps_and_grows_without_losing_audio() -> None:
+    c = WebSocketAudioCapture(chunk_size_bytes=320, sample_rate=16000)
+    c._ring = bytearray(1000)
+    c.start()
+    data = bytes(range(256)) * 20
+    c.put_chunk(data[:700])
+    assert c.read_chunk() == data[:320]
+    c.put_chunk(data[700:1200])  # wraps past the end of the ring
+    assert c.read_chunk() == data[320:640]
+    c.put_chunk(data[1200:])  # more than the ring holds: grows
+    assert len(c._ring) >= c._count
+    out = b""
+    while c._count >= 320:
+        out += c.read_chunk()
+    assert out == data[640 : 640 + len(out)]
+    assert len(out) + c._count == len(data) - 640
+
+
+def test_stop_wakes_blocked_reader(capture: WebSocketAudioCapture) -> None:
+    capture.start()
+    result: list[bytes | None] = []
+    t = threading.Thread(target=lambda: result.append(capture.read_chunk()))
+    t.start()
+    time.sleep(0.05)
+    capture.put_chunk(bytes(100))
+    capture.stop()
+    t.join(timeout=0.5)
+    assert not t.is_alive()
+    assert result == [None]